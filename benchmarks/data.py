@@ -0,0 +1,89 @@
+#!/usr/bin/python
+
+
+""" Synthetic data generators for benchmarks.
+
+Generated data is deterministic: the same size and shape always gives
+the same rows.
+"""
+
+
+import datetime
+import random
+
+from pysheets.sheet import Sheet
+from pysheets.spreadsheet import SpreadSheet
+
+
+SIZES = {
+        '1k': 1000,
+        '10k': 10000,
+        '100k': 100000,
+        '1m': 1000000,
+        '10m': 10000000,
+        }
+
+SHAPES = {
+        'narrow': 5,
+        'wide': 50,
+        }
+
+GROUPS_COUNT = 10
+
+
+def generate_captions(columns_count):
+    """ Returns list of captions. The first two columns are always
+    ``ID`` and ``Group``.
+    """
+
+    return [u'ID', u'Group'] + [
+            u'Column {0}'.format(i) for i in range(2, columns_count)]
+
+
+def generate_rows(rows_count, columns_count, seed=0):
+    """ Generates rows with integer, float, text and date fields.
+    """
+
+    generator = random.Random(seed)
+    start = datetime.date(2000, 1, 1)
+    for i in xrange(rows_count):
+        row = [i, u'Group {0}'.format(i % GROUPS_COUNT)]
+        for j in range(2, columns_count):
+            kind = j % 4
+            if kind == 0:
+                row.append(generator.randint(0, 1000000))
+            elif kind == 1:
+                row.append(generator.random() * 1000)
+            elif kind == 2:
+                row.append(u'Text {0}'.format(generator.randint(0, 1000)))
+            else:
+                row.append(start + datetime.timedelta(
+                    days=generator.randint(0, 5000)))
+        yield row
+
+
+def generate_sheet(rows_count, columns_count, **kwargs):
+    """ Returns sheet filled with generated rows.
+    """
+
+    sheet = Sheet(captions=generate_captions(columns_count), **kwargs)
+    sheet.extend(generate_rows(rows_count, columns_count))
+    return sheet
+
+
+def generate_spreadsheet(rows_count, columns_count, sheets_count=10):
+    """ Returns spreadsheet with ``sheets_count`` sheets, which
+    together have ``rows_count`` rows.
+    """
+
+    spreadsheet = SpreadSheet()
+    captions = generate_captions(columns_count)
+    rows = generate_rows(rows_count, columns_count)
+    for i in range(sheets_count):
+        sheet = spreadsheet.create_sheet(
+                u'Sheet {0}'.format(i), captions=captions)
+        count = rows_count // sheets_count
+        if i < rows_count % sheets_count:
+            count += 1
+        sheet.extend(row for row, j in zip(rows, xrange(count)))
+    return spreadsheet
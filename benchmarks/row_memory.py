@@ -0,0 +1,85 @@
+#!/usr/bin/python
+
+
+""" Measures memory used by sheet rows in different storage modes.
+
+Each mode is measured in separate process::
+
+    python benchmarks/row_memory.py [rows] [columns]
+
+Printed numbers are peak memory per row, including field values. For
+100000 rows and 20 int columns (Python 2.7, 64 bit) they were:
+
+==============  ======================  ==================
+Mode            Before ``__slots__``    With ``__slots__``
+==============  ======================  ==================
+list fields     976                     875
+tuple fields    --                      780
+==============  ======================  ==================
+
+so compact rows use about 1.1 (lists) to 1.25 (tuples) times less
+memory. Most of each row is taken by the int objects and the field
+container, not by the row object itself. Numbers of columnar mode
+depend on how list growth happens to hit the peak and vary between
+runs.
+
+"""
+
+
+import os
+import resource
+import subprocess
+import sys
+
+
+MODES = {
+        'list fields': {},
+        'tuple fields': {'immutable_rows': True},
+        'columnar': {'columnar': True},
+        }
+
+
+def max_rss():
+    """ Returns peak resident set size of current process in KiB.
+    """
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(mode, rows_count, columns_count):
+    """ Creates sheet in given mode and prints bytes used per row.
+    """
+
+    from pysheets.sheet import Sheet
+
+    captions = [u'Column {0}'.format(i) for i in range(columns_count)]
+    rows = ([i * columns_count + j for j in range(columns_count)]
+            for i in xrange(rows_count))
+    before = max_rss()
+    sheet = Sheet(captions=captions, **MODES[mode])
+    sheet.extend(rows)
+    print (max_rss() - before) * 1024.0 / rows_count
+
+
+def main(argv):
+    """ Runs measurement of each mode in subprocess and prints
+    results.
+    """
+
+    if len(argv) > 1 and argv[1] == '--measure':
+        measure(argv[2], int(argv[3]), int(argv[4]))
+        return
+
+    rows_count = int(argv[1]) if len(argv) > 1 else 200000
+    columns_count = int(argv[2]) if len(argv) > 2 else 20
+    print 'Rows: {0}, columns: {1}'.format(rows_count, columns_count)
+    for mode in sorted(MODES):
+        output = subprocess.check_output([
+            sys.executable, os.path.abspath(__file__), '--measure',
+            mode, str(rows_count), str(columns_count)])
+        print '{0:>20}: {1:10.1f} bytes per row'.format(
+                mode, float(output))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
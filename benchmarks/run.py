@@ -0,0 +1,155 @@
+#!/usr/bin/python
+
+
+""" Runs benchmarks and compares results.
+
+Each benchmark is run in separate process, so that peak memory usage
+of one benchmark does not affect others. Examples::
+
+    # Run all benchmarks on 1k and 10k rows narrow and wide sheets.
+    python benchmarks/run.py --sizes 1k,10k --output before.json
+    # Run only CSV benchmarks.
+    python benchmarks/run.py --benchmarks csv_read,csv_write
+    # Compare two runs.
+    python benchmarks/run.py --compare before.json after.json
+
+"""
+
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from data import SIZES, SHAPES
+from suite import BENCHMARKS
+
+
+def max_rss():
+    """ Returns peak resident set size of current process in KiB.
+    """
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(name, size, shape, repeat):
+    """ Runs single benchmark in current process and returns result
+    dict.
+    """
+
+    rows_count = SIZES[size]
+    operation = BENCHMARKS[name](rows_count, SHAPES[shape])
+    memory_before = max_rss()
+    times = []
+    for i in range(repeat):
+        start = time.time()
+        operation()
+        times.append(time.time() - start)
+    seconds = min(times)
+    return {
+            'benchmark': name,
+            'size': size,
+            'shape': shape,
+            'seconds': seconds,
+            'rows_per_second': rows_count / seconds if seconds else None,
+            'peak_memory_kib': max_rss(),
+            'operation_memory_kib': max_rss() - memory_before,
+            }
+
+
+def run(names, sizes, shapes, repeat):
+    """ Runs each benchmark in subprocess and yields results.
+    """
+
+    for name in names:
+        for size in sizes:
+            for shape in shapes:
+                output = subprocess.check_output([
+                    sys.executable, os.path.abspath(__file__),
+                    '--measure', name, size, shape, str(repeat)])
+                yield json.loads(output)
+
+
+def format_result(result):
+    """ Returns result formatted as table row.
+    """
+
+    return u'{0:<18} {1:>5} {2:<7} {3:>10.3f} s {4:>12.0f} rows/s ' \
+           u'{5:>10} KiB {6:>10} KiB'.format(
+                   result['benchmark'], result['size'], result['shape'],
+                   result['seconds'], result['rows_per_second'] or 0,
+                   result['operation_memory_kib'],
+                   result['peak_memory_kib'])
+
+
+def compare(old_results, new_results):
+    """ Prints time and peak memory ratios of two runs.
+    """
+
+    key = lambda result: (
+            result['benchmark'], result['size'], result['shape'])
+    old_results = dict((key(result), result) for result in old_results)
+    print u'{0:<18} {1:>5} {2:<7} {3:>10} {4:>10}'.format(
+            u'Benchmark', u'Size', u'Shape', u'Time', u'Memory')
+    for new in new_results:
+        old = old_results.get(key(new))
+        if old is None:
+            continue
+        print u'{0:<18} {1:>5} {2:<7} {3:>9.2f}x {4:>9.2f}x'.format(
+                new['benchmark'], new['size'], new['shape'],
+                new['seconds'] / old['seconds'] if old['seconds'] else 0,
+                float(new['peak_memory_kib']) / old['peak_memory_kib'])
+
+
+def main(argv):
+    """ Parses command line arguments and runs benchmarks.
+    """
+
+    parser = argparse.ArgumentParser(description=u'PySheets benchmarks.')
+    parser.add_argument(
+            '--benchmarks', default=u','.join(sorted(BENCHMARKS)),
+            help=u'Comma separated benchmark names.')
+    parser.add_argument(
+            '--sizes', default=u'1k,10k',
+            help=u'Comma separated sizes: {0}.'.format(
+                u', '.join(sorted(SIZES, key=SIZES.get))))
+    parser.add_argument(
+            '--shapes', default=u'narrow,wide',
+            help=u'Comma separated shapes: {0}.'.format(
+                u', '.join(sorted(SHAPES))))
+    parser.add_argument(
+            '--repeat', type=int, default=1,
+            help=u'How many times to run operation (the best is taken).')
+    parser.add_argument('--output', help=u'File to save results in JSON.')
+    parser.add_argument(
+            '--compare', nargs=2, metavar=('OLD', 'NEW'),
+            help=u'Compare results of two runs.')
+    parser.add_argument('--measure', nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv[1:])
+
+    if args.measure:
+        name, size, shape, repeat = args.measure
+        print json.dumps(measure(name, size, shape, int(repeat)))
+    elif args.compare:
+        with open(args.compare[0]) as fp:
+            old_results = json.load(fp)
+        with open(args.compare[1]) as fp:
+            new_results = json.load(fp)
+        compare(old_results, new_results)
+    else:
+        results = []
+        for result in run(
+                args.benchmarks.split(u','), args.sizes.split(u','),
+                args.shapes.split(u','), args.repeat):
+            print format_result(result)
+            results.append(result)
+        if args.output:
+            with open(args.output, 'w') as fp:
+                json.dump(results, fp, indent=2)
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,156 @@
+#!/usr/bin/python
+
+
+""" Benchmarks of readers, writers and sheet operations.
+
+Each benchmark is a function, which gets rows and columns count,
+prepares data and returns operation (callable without arguments)
+to measure. Operation can be called several times.
+"""
+
+
+import atexit
+import os
+import tempfile
+from cStringIO import StringIO
+
+from pysheets.readers.csv import CSVReader
+from pysheets.sheet import Sheet
+from pysheets.spreadsheet import SpreadSheet
+from pysheets.writers.csv import CSVWriter
+from pysheets.writers.xhtml import XHTMLWriter
+
+from data import generate_sheet, generate_spreadsheet
+
+
+BENCHMARKS = {}
+
+
+def benchmark(function):
+    """ Registers benchmark.
+    """
+
+    BENCHMARKS[function.__name__] = function
+    return function
+
+
+def temporary_path(suffix):
+    """ Returns path of new temporary file, which is removed on exit.
+    """
+
+    file_descriptor, path = tempfile.mkstemp(suffix=suffix)
+    os.close(file_descriptor)
+    atexit.register(os.remove, path)
+    return path.decode('utf-8')
+
+
+@benchmark
+def csv_read(rows_count, columns_count):
+    """ :py:meth:`pysheets.readers.csv.CSVReader.read`.
+    """
+
+    data = StringIO()
+    CSVWriter()(generate_sheet(rows_count, columns_count), data)
+    data = data.getvalue()
+
+    def operation():
+        CSVReader()(Sheet(), StringIO(data))
+    return operation
+
+
+@benchmark
+def csv_write(rows_count, columns_count):
+    """ :py:meth:`pysheets.writers.csv.CSVWriter.write`.
+    """
+
+    sheet = generate_sheet(rows_count, columns_count)
+
+    def operation():
+        with open(os.devnull, 'wb') as fp:
+            CSVWriter()(sheet, fp)
+    return operation
+
+
+@benchmark
+def xhtml_write(rows_count, columns_count):
+    """ :py:class:`pysheets.writers.xhtml.XHTMLWriter`.
+    """
+
+    sheet = generate_sheet(rows_count, columns_count)
+
+    def operation():
+        with open(os.devnull, 'wb') as fp:
+            XHTMLWriter()(sheet, fp)
+    return operation
+
+
+@benchmark
+def ods_read(rows_count, columns_count):
+    """ :py:class:`pysheets.readers.ods.ODFSpreadSheetReader`.
+    """
+
+    from pysheets.readers.ods import ODFSpreadSheetReader
+    from pysheets.writers.ods import ODFSpreadSheetWriter
+
+    path = temporary_path('.ods')
+    ODFSpreadSheetWriter(stream=True)(
+            generate_spreadsheet(rows_count, columns_count), path)
+
+    def operation():
+        ODFSpreadSheetReader()(SpreadSheet(), path)
+    return operation
+
+
+@benchmark
+def ods_write(rows_count, columns_count):
+    """ :py:class:`pysheets.writers.ods.ODFSpreadSheetWriter` in
+    streaming mode.
+    """
+
+    from pysheets.writers.ods import ODFSpreadSheetWriter
+
+    spreadsheet = generate_spreadsheet(rows_count, columns_count)
+    path = temporary_path('.ods')
+
+    def operation():
+        ODFSpreadSheetWriter(stream=True)(spreadsheet, path)
+    return operation
+
+
+@benchmark
+def sheet_sort(rows_count, columns_count):
+    """ :py:meth:`pysheets.sheet.Sheet.sort` by two columns.
+    """
+
+    sheet = generate_sheet(rows_count, columns_count)
+    rows = sheet.rows
+
+    def operation():
+        sheet.rows = list(rows)
+        sheet.sort(columns=[u'Group', sheet.captions[-1]])
+    return operation
+
+
+@benchmark
+def spreadsheet_load(rows_count, columns_count):
+    """ :py:meth:`pysheets.spreadsheet.SpreadSheet.load` splitting by
+    column.
+    """
+
+    sheet = generate_sheet(rows_count, columns_count)
+
+    def operation():
+        SpreadSheet().load(sheet, columns=u'Group')
+    return operation
+
+
+@benchmark
+def spreadsheet_join(rows_count, columns_count):
+    """ :py:meth:`pysheets.spreadsheet.SpreadSheet.join`.
+    """
+
+    spreadsheet = generate_spreadsheet(rows_count, columns_count)
+
+    def operation():
+        spreadsheet.join(u'Sheet')
+    return operation
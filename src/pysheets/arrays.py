@@ -0,0 +1,83 @@
+#!/usr/bin/python
+
+
+"""
+
+Conversion of sheet columns to and from `NumPy <http://numpy.scipy.org/>`_
+arrays.
+
+This module requires NumPy, so it is imported only by methods, which
+use it (:py:meth:`pysheets.sheet.Column.as_array`,
+:py:meth:`pysheets.sheet.Sheet.to_arrays`,
+:py:meth:`pysheets.sheet.Sheet.from_arrays`).
+
+"""
+
+
+import array
+
+import numpy
+
+from pysheets.sheet import TYPE_CODES
+
+
+def infer_dtype(values):
+    """ Returns dtype for given column values: integer, float or
+    boolean dtype if all values are of such type (integers and floats
+    are mixed to float), unicode string dtype if all values are
+    strings and ``object`` otherwise.
+    """
+
+    types = set(type(value) for value in values)
+    if not types:
+        return numpy.dtype(float)
+    elif types == set([bool]):
+        return numpy.dtype(bool)
+    elif types <= set([int, long]):
+        return numpy.dtype(int)
+    elif types <= set([int, long, float]):
+        return numpy.dtype(float)
+    elif types == set([unicode]):
+        return numpy.dtype(unicode)
+    else:
+        return numpy.dtype(object)
+
+
+def column_to_array(column, dtype=None, copy=True):
+    """ Converts :py:class:`pysheets.sheet.Column` to NumPy array.
+
+    If sheet is columnar and column is stored in typed array, then
+    array data is copied in bulk, or, if ``copy`` is ``False``, NumPy
+    array shares memory with column.
+
+    .. warning::
+        Not copied array is valid only until sheet is modified.
+    """
+
+    sheet = column.sheet
+    if sheet.columnar:
+        container = sheet.rows.columns[column.index]
+        if isinstance(container, array.array):
+            container_dtype = numpy.dtype(container.typecode)
+            if dtype is None or numpy.dtype(dtype) == container_dtype:
+                result = numpy.frombuffer(container, dtype=container_dtype)
+                return result.copy() if copy else result
+    values = list(column)
+    if dtype is None:
+        dtype = infer_dtype(values)
+    return numpy.array(values, dtype=dtype)
+
+
+def array_to_container(values):
+    """ Converts NumPy array to column container of
+    :py:class:`pysheets.sheet.ColumnStore`.
+    """
+
+    for value_type, typecode in TYPE_CODES.items():
+        if values.dtype.kind == numpy.dtype(value_type).kind:
+            container = array.array(typecode)
+            container.fromstring(
+                    numpy.ascontiguousarray(
+                        values, dtype=numpy.dtype(typecode)).tostring())
+            return container
+    return values.tolist()
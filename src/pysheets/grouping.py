@@ -0,0 +1,294 @@
+#!/usr/bin/python
+
+
+"""
+
+Grouping of sheet rows and aggregation of groups
+(:py:meth:`pysheets.sheet.Sheet.group_by`).
+
+Rows are assigned to groups in a single pass with hash table, then
+each aggregation is computed in one pass through its column. If sheet
+is columnar and aggregated column is stored in typed array, then
+aggregation is computed by `NumPy <http://numpy.scipy.org/>`_ (if it is
+available).
+
+Built-in aggregation functions: ``u'sum'``, ``u'count'``, ``u'min'``,
+``u'max'``, ``u'mean'``, ``u'first'`` and ``u'last'``. They skip
+missing (``None``) values; ``min``, ``max``, ``mean``, ``first`` and
+``last`` of group without values are ``None``. Any function, which
+gets list of group values and returns single value, can be used too.
+
+"""
+
+
+import array
+from itertools import izip
+
+
+def aggregate_sum(ids, values, count):
+    """ Returns sums of not ``None`` group values.
+    """
+
+    result = [0] * count
+    for group, value in izip(ids, values):
+        if value is not None:
+            result[group] += value
+    return result
+
+
+def aggregate_count(ids, values, count):
+    """ Returns numbers of not ``None`` group values.
+    """
+
+    result = [0] * count
+    for group, value in izip(ids, values):
+        if value is not None:
+            result[group] += 1
+    return result
+
+
+def aggregate_min(ids, values, count):
+    """ Returns minimal not ``None`` values of groups.
+    """
+
+    result = [None] * count
+    for group, value in izip(ids, values):
+        if value is not None and (
+                result[group] is None or value < result[group]):
+            result[group] = value
+    return result
+
+
+def aggregate_max(ids, values, count):
+    """ Returns maximal not ``None`` values of groups.
+    """
+
+    result = [None] * count
+    for group, value in izip(ids, values):
+        if value is not None and (
+                result[group] is None or value > result[group]):
+            result[group] = value
+    return result
+
+
+def aggregate_mean(ids, values, count):
+    """ Returns arithmetic means of not ``None`` group values.
+    """
+
+    values = list(values)
+    return [
+            float(total) / size if size else None
+            for total, size in izip(
+                aggregate_sum(ids, values, count),
+                aggregate_count(ids, values, count))]
+
+
+def aggregate_first(ids, values, count):
+    """ Returns the first not ``None`` values of groups.
+    """
+
+    result = [None] * count
+    for group, value in izip(reversed(ids), reversed(list(values))):
+        if value is not None:
+            result[group] = value
+    return result
+
+
+def aggregate_last(ids, values, count):
+    """ Returns the last not ``None`` values of groups.
+    """
+
+    result = [None] * count
+    for group, value in izip(ids, values):
+        if value is not None:
+            result[group] = value
+    return result
+
+
+AGGREGATES = {
+        u'sum': aggregate_sum,
+        u'count': aggregate_count,
+        u'min': aggregate_min,
+        u'max': aggregate_max,
+        u'mean': aggregate_mean,
+        u'first': aggregate_first,
+        u'last': aggregate_last,
+        }
+
+
+def sort_groups(ids):
+    """ Returns tuple ``(order, starts, sizes)`` of NumPy arrays:
+    ``order`` -- stable order of rows sorted by group, ``starts`` --
+    positions of the first rows of groups in sorted rows, ``sizes`` --
+    sizes of groups. Returns ``None``, if NumPy is not available.
+    """
+
+    try:
+        import numpy
+    except ImportError:
+        return None
+
+    ids = numpy.fromiter(ids, dtype=numpy.intp, count=len(ids))
+    order = numpy.argsort(ids, kind='mergesort')
+    starts = numpy.concatenate((
+        [0], numpy.flatnonzero(numpy.diff(ids[order])) + 1))
+    sizes = numpy.diff(numpy.append(starts, len(ids)))
+    return order, starts, sizes
+
+
+def aggregate_vectorized(function, container, sorting):
+    """ Computes built-in aggregation of typed array ``container`` by
+    NumPy.
+
+    Values are sorted by group (``sorting`` is created by
+    :py:func:`sort_groups`), so each group is a contiguous slice and
+    is reduced by :py:meth:`numpy.ufunc.reduceat`. (Typed arrays have
+    no ``None`` values.)
+
+    :returns: List of aggregated values, or ``None`` if integer sum
+        could overflow NumPy integer type (Python integers do not
+        overflow, so then aggregation has to be computed by Python).
+    """
+
+    import numpy
+
+    order, starts, sizes = sorting
+    values = numpy.frombuffer(container, dtype=container.typecode)[order]
+    if function in (u'sum', u'mean') and values.dtype.kind == 'i':
+        bound = max(abs(int(values.max())), abs(int(values.min())))
+        if bound * len(values) > numpy.iinfo(values.dtype).max:
+            return None
+
+    if function == u'sum':
+        result = numpy.add.reduceat(values, starts)
+    elif function == u'count':
+        result = sizes
+    elif function == u'min':
+        result = numpy.minimum.reduceat(values, starts)
+    elif function == u'max':
+        result = numpy.maximum.reduceat(values, starts)
+    elif function == u'mean':
+        result = numpy.add.reduceat(values, starts) / sizes.astype(float)
+    elif function == u'first':
+        result = values[starts]
+    else:
+        result = values[starts + sizes - 1]
+    return result.tolist()
+
+
+class GroupBy(object):
+    """ Rows of sheet grouped by values of columns with given captions.
+    Groups are ordered by the first appearance of their key.
+    """
+
+    def __init__(self, sheet, captions):
+
+        self.sheet = sheet
+        self.captions = list(captions)
+        self.keys = None
+        self.ids = None
+        self.sorting = None
+
+    def assign(self):
+        """ Computes group keys and assigns each row to a group.
+
+        :returns: Tuple ``(keys, ids)``, where ``keys`` is list of
+            group keys (tuples of field values) and ``ids`` is list of
+            group indexes of rows.
+        """
+
+        if self.ids is None:
+            groups = {}
+            keys = []
+            ids = []
+            for key in izip(*[
+                    self.sheet.get(caption) for caption in self.captions]):
+                group = groups.get(key)
+                if group is None:
+                    group = groups[key] = len(keys)
+                    keys.append(key)
+                ids.append(group)
+            self.keys = keys
+            self.ids = ids
+        return self.keys, self.ids
+
+    def get_sorting(self):
+        """ Returns cached result of :py:func:`sort_groups`.
+        """
+
+        if self.sorting is None:
+            self.sorting = sort_groups(self.assign()[1])
+        return self.sorting
+
+    def __len__(self):
+        return len(self.assign()[0])
+
+    def aggregate_column(self, function, caption):
+        """ Returns list of aggregated values of column (one for each
+        group).
+
+        :param function: Name of built-in aggregation function or
+            function, which gets list of group values.
+        :param caption: Caption of aggregated column. Can be ``None``
+            for ``u'count'``; then rows are counted.
+        """
+
+        keys, ids = self.assign()
+        count = len(keys)
+
+        if caption is None:
+            if function != u'count':
+                raise ValueError(
+                        u'Column is required for {0}.'.format(function))
+            return aggregate_count(ids, ids, count)
+
+        values = self.sheet.get(caption)
+        if callable(function):
+            groups = [[] for key in keys]
+            for group, value in izip(ids, values):
+                groups[group].append(value)
+            return [function(group) for group in groups]
+        elif function not in AGGREGATES:
+            raise ValueError(
+                    u'Unknown aggregation function: {0}.'.format(function))
+
+        if self.sheet.columnar and ids:
+            container = self.sheet.rows.columns[
+                    self.sheet.captions_index[caption]]
+            if isinstance(container, array.array):
+                sorting = self.get_sorting()
+                if sorting is not None:
+                    result = aggregate_vectorized(
+                            function, container, sorting)
+                    if result is not None:
+                        return result
+
+        return AGGREGATES[function](ids, values, count)
+
+    def aggregate(self, *aggregations):
+        """ Returns new sheet with one row for each group: columns of
+        group key followed by aggregated columns.
+
+        :param aggregations: Tuples ``(caption, function,
+            column_caption)``, where ``caption`` is caption of created
+            column and ``function`` -- aggregation function, which is
+            applied to column with ``column_caption``.
+
+        >>> sheet.group_by(u'Customer').aggregate(
+        ...         (u'Total', u'sum', u'Amount'),
+        ...         (u'Orders', u'count', None))
+        """
+
+        keys, ids = self.assign()
+        columns = zip(*keys) or [[] for caption in self.captions]
+        columns.extend([
+                self.aggregate_column(function, column_caption)
+                for caption, function, column_caption in aggregations])
+
+        result = type(self.sheet)(
+                captions=self.captions + [
+                    caption for caption, function, column_caption
+                    in aggregations],
+                columnar=self.sheet.columnar)
+        result.extend(izip(*columns))
+        return result
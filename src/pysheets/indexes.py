@@ -0,0 +1,256 @@
+#!/usr/bin/python
+
+
+"""
+
+Column indexes, which are used by :py:class:`pysheets.sheet.Sheet` for
+fast lookups.
+
+Index is updated incrementally when rows are appended to the end of
+the sheet or replaced. Sorting just invalidates index and it is rebuilt
+on the next lookup.
+
++   :py:class:`HashIndex` -- for lookups by value. Deletion not from
+    the end of sheet invalidates it.
++   :py:class:`SortedIndex` -- for lookups by value, range queries,
+    minimum, maximum and top-k queries.
+
+"""
+
+
+import bisect
+import sys
+
+
+class HashIndex(object):
+    """ Hash index of single sheet column. Maps field value to the
+    list of positions of rows, which have it.
+
+    .. note::
+        Values of indexed column have to be hashable.
+
+    """
+
+    def __init__(self, sheet, caption):
+
+        self.sheet = sheet
+        self.caption = caption
+        self.positions = {}
+        self.valid = False
+
+    def build(self):
+        """ Builds index from sheet data.
+        """
+
+        positions = {}
+        for position, value in enumerate(self.sheet.get(self.caption)):
+            positions.setdefault(value, []).append(position)
+        self.positions = positions
+        self.valid = True
+
+    def invalidate(self):
+        """ Marks index as outdated. It will be rebuilt on the next
+        lookup.
+        """
+
+        self.positions = {}
+        self.valid = False
+
+    def insert(self, position, value):
+        """ Registers value of row appended at ``position``.
+        """
+
+        if self.valid:
+            self.positions.setdefault(value, []).append(position)
+
+    def replace(self, position, old_value, new_value):
+        """ Registers replacement of row at ``position``.
+        """
+
+        if self.valid and old_value != new_value:
+            self.discard(position, old_value)
+            bisect.insort(self.positions.setdefault(new_value, []), position)
+
+    def delete(self, position, value, last):
+        """ Registers deletion of row at ``position``. If ``last`` is
+        ``False`` (other rows are shifted), then index is invalidated.
+        """
+
+        if last:
+            if self.valid:
+                self.discard(position, value)
+        else:
+            self.invalidate()
+
+    def discard(self, position, value):
+        """ Removes ``position`` from positions list of ``value``.
+        """
+
+        positions = self.positions[value]
+        positions.remove(position)
+        if not positions:
+            del self.positions[value]
+
+    def lookup(self, value):
+        """ Returns sorted list of positions of rows, which have given
+        value.
+        """
+
+        if not self.valid:
+            self.build()
+        return self.positions.get(value, [])
+
+
+class SortedIndex(object):
+    """ Sorted index of single sheet column. Keeps list of ``(value,
+    position)`` pairs sorted, without changing order of rows in sheet.
+
+    .. note::
+        Values of indexed column have to be comparable.
+
+    """
+
+    def __init__(self, sheet, caption):
+
+        self.sheet = sheet
+        self.caption = caption
+        self.entries = []
+        self.valid = False
+
+    def build(self):
+        """ Builds index from sheet data.
+        """
+
+        self.entries = sorted(
+                (value, position) for position, value in enumerate(
+                    self.sheet.get(self.caption)))
+        self.valid = True
+
+    def invalidate(self):
+        """ Marks index as outdated. It will be rebuilt on the next
+        query.
+        """
+
+        self.entries = []
+        self.valid = False
+
+    def insert(self, position, value):
+        """ Registers value of row appended at ``position``.
+        """
+
+        if self.valid:
+            bisect.insort(self.entries, (value, position))
+
+    def replace(self, position, old_value, new_value):
+        """ Registers replacement of row at ``position``.
+        """
+
+        if self.valid and old_value != new_value:
+            self.discard(position, old_value)
+            bisect.insort(self.entries, (new_value, position))
+
+    def delete(self, position, value, last):
+        """ Registers deletion of row at ``position``. If ``last`` is
+        ``False``, then positions of following rows are shifted.
+        """
+
+        if self.valid:
+            self.discard(position, value)
+            if not last:
+                self.entries = [
+                        (entry_value, entry_position - 1)
+                        if entry_position > position else
+                        (entry_value, entry_position)
+                        for entry_value, entry_position in self.entries]
+
+    def discard(self, position, value):
+        """ Removes ``(value, position)`` pair from index. If index does
+        not contain such pair (it is out of sync with sheet), then it
+        is invalidated.
+        """
+
+        entry = (value, position)
+        index = bisect.bisect_left(self.entries, entry)
+        if index < len(self.entries) and self.entries[index] == entry:
+            del self.entries[index]
+        else:
+            self.invalidate()
+
+    def get_entries(self):
+        """ Returns sorted list of ``(value, position)`` pairs.
+        """
+
+        if not self.valid:
+            self.build()
+        return self.entries
+
+    def bounds(self, low=None, high=None, include_high=True):
+        """ Returns ``(start, end)`` slice of entries with values
+        between ``low`` and ``high``. ``None`` means unbounded.
+        """
+
+        entries = self.get_entries()
+        if low is None:
+            start = 0
+        else:
+            start = bisect.bisect_left(entries, (low,))
+        if high is None:
+            end = len(entries)
+        elif include_high:
+            end = bisect.bisect_right(entries, (high, sys.maxint))
+        else:
+            end = bisect.bisect_left(entries, (high,))
+        return start, end
+
+    def lookup(self, value):
+        """ Returns sorted list of positions of rows, which have given
+        value.
+        """
+
+        entries = self.get_entries()
+        start = bisect.bisect_left(entries, (value,))
+        end = bisect.bisect_right(entries, (value, sys.maxint))
+        return [position for value, position in entries[start:end]]
+
+    def range(self, low=None, high=None, include_high=True):
+        """ Returns positions of rows, which values are between ``low``
+        (inclusive) and ``high``, ordered by value.
+        """
+
+        start, end = self.bounds(low, high, include_high)
+        return [position for value, position in self.entries[start:end]]
+
+    def first(self, count):
+        """ Returns positions of ``count`` rows with the smallest
+        values.
+        """
+
+        return [position for value, position in self.get_entries()[:count]]
+
+    def last(self, count):
+        """ Returns positions of ``count`` rows with the largest values
+        (the largest first). Rows with equal values are returned in
+        sheet order.
+        """
+
+        entries = self.get_entries()
+        positions = []
+        end = len(entries)
+        while end > 0 and len(positions) < count:
+            start = bisect.bisect_left(entries, (entries[end - 1][0],), 0, end)
+            positions.extend(
+                    position for value, position in entries[start:end])
+            end = start
+        return positions[:count]
+
+    def min(self):
+        """ Returns the smallest value of column.
+        """
+
+        return self.get_entries()[0][0]
+
+    def max(self):
+        """ Returns the largest value of column.
+        """
+
+        return self.get_entries()[-1][0]
@@ -0,0 +1,164 @@
+#!/usr/bin/python
+
+
+"""
+
+Relational join of two sheets (:py:meth:`pysheets.sheet.Sheet.join`).
+
+Join is implemented as hash join: hash table, which maps key to
+positions of rows, is built for the right sheet (or its
+:py:class:`pysheets.indexes.HashIndex` is reused) and probed with each
+row of the left sheet.
+
+"""
+
+
+import operator
+from itertools import imap, izip
+
+from pysheets.indexes import HashIndex
+
+
+JOIN_TYPES = (u'inner', u'left', u'outer')
+
+
+def create_getter(positions):
+    """ Returns function, which gets fields sequence and returns tuple
+    of fields at given positions.
+    """
+
+    if not positions:
+        return lambda fields: ()
+    elif len(positions) == 1:
+        position = positions[0]
+        return lambda fields: (fields[position],)
+    else:
+        return operator.itemgetter(*positions)
+
+
+def iterate_fields(sheet):
+    """ Returns iterator through field sequences of sheet rows.
+    """
+
+    if sheet.columnar:
+        return izip(*sheet.rows.columns)
+    else:
+        return (row.fields for row in sheet.rows)
+
+
+def disambiguate(on, left_captions, right_captions, suffixes):
+    """ Returns captions of joined sheet: key captions, left sheet
+    captions and right sheet captions. Captions, which are in both
+    sheets, get suffixes.
+    """
+
+    common = set(left_captions) & set(right_captions)
+    return list(on) + [
+            caption + suffixes[0] if caption in common else caption
+            for caption in left_captions] + [
+            caption + suffixes[1] if caption in common else caption
+            for caption in right_captions]
+
+
+def build_table(sheet, on, rows):
+    """ Returns dict, which maps key to list of positions of rows in
+    ``sheet``. Keys are field values if joining on single column and
+    tuples of field values otherwise.
+    """
+
+    if len(on) == 1:
+        index = sheet.indexes.get(on[0])
+        if isinstance(index, HashIndex):
+            if not index.valid:
+                index.build()
+            return index.positions
+        get_key = operator.itemgetter(sheet.captions_index[on[0]])
+    else:
+        get_key = operator.itemgetter(*[
+            sheet.captions_index[caption] for caption in on])
+
+    table = {}
+    for position, key in enumerate(imap(get_key, rows)):
+        table.setdefault(key, []).append(position)
+    return table
+
+
+def join_rows(left, right, on, how):
+    """ Generates rows (tuples of fields) of joined sheet.
+    """
+
+    def positions(sheet, captions):
+        """ Returns positions of columns with given captions.
+        """
+        return [sheet.captions_index[caption] for caption in captions]
+
+    right_rows = list(iterate_fields(right))
+    table = build_table(right, on, right_rows)
+
+    left_key = create_getter(positions(left, on))
+    right_key = create_getter(positions(right, on))
+    left_rest = create_getter(positions(left, [
+        caption for caption in left.captions if caption not in on]))
+    right_rest = create_getter(positions(right, [
+        caption for caption in right.captions if caption not in on]))
+    if len(on) == 1:
+        get_key = lambda fields: left_key(fields)[0]
+    else:
+        get_key = left_key
+    empty_left = (None,) * (len(left.captions) - len(on))
+    empty_right = (None,) * (len(right.captions) - len(on))
+    matched = bytearray(len(right_rows)) if how == u'outer' else None
+
+    for fields in iterate_fields(left):
+        head = left_key(fields) + left_rest(fields)
+        matches = table.get(get_key(fields))
+        if matches:
+            for position in matches:
+                yield head + right_rest(right_rows[position])
+            if matched is not None:
+                for position in matches:
+                    matched[position] = 1
+        elif how != u'inner':
+            yield head + empty_right
+
+    if matched is not None:
+        for fields, is_matched in izip(right_rows, matched):
+            if not is_matched:
+                yield right_key(fields) + empty_left + right_rest(fields)
+
+
+def join_sheets(left, right, on, how=u'inner', suffixes=None):
+    """ Returns new sheet, which is hash join of ``left`` and
+    ``right`` sheets.
+
+    :param on: Caption or list of captions of key columns, which both
+        sheets have.
+    :param how: ``u'inner'`` -- only matching rows, ``u'left'`` -- also
+        rows of left sheet without match, ``u'outer'`` -- also rows of
+        both sheets without match. Missing fields are ``None``.
+    :param suffixes: Pair of suffixes, which are appended to captions
+        of not key columns, which are in both sheets. Default is
+        ``(u' (left)', u' (right)')``.
+    """
+
+    if isinstance(on, basestring):
+        on = [on]
+    else:
+        on = list(on)
+    if how not in JOIN_TYPES:
+        raise ValueError(u'Unknown join type: {0}.'.format(how))
+    for sheet in (left, right):
+        for caption in on:
+            if caption not in sheet.captions_index:
+                raise ValueError(u'No column "{0}".'.format(caption))
+    suffixes = suffixes or (u' (left)', u' (right)')
+
+    result = type(left)(
+            captions=disambiguate(
+                on,
+                [caption for caption in left.captions if caption not in on],
+                [caption for caption in right.captions if caption not in on],
+                suffixes),
+            columnar=left.columnar)
+    result.extend(join_rows(left, right, on, how))
+    return result
@@ -8,9 +8,35 @@
 
 import os
 
+from pysheets.sniffing import PeekedFile, ZIP_MAGIC, peek, sniff, spool
+
+
+class LazyPlugin(object):
+    """ Placeholder of plugin, which is registered by name, but its
+    module is not imported yet.
+    """
+
+    def __init__(self, short_name, module, file_extensions, mime_type):
+
+        self.short_name = short_name
+        self.module = module
+        self.file_extensions = file_extensions
+        self.mime_type = mime_type
+
+    def load(self):
+        """ Imports plugin module. Plugin class registers itself, when
+        module is imported.
+        """
+
+        __import__(self.module, level=0)
+
 
 class PluginManager(object):
     """ Takes care of all plugins.
+
+    Plugins can be registered lazily (:py:meth:`add_lazy`): then
+    module, which implements plugin, is imported only when plugin is
+    requested for the first time.
     """
 
     def __init__(self):
@@ -19,7 +45,7 @@ class PluginManager(object):
         self.mime_types = {}
 
     def __getitem__(self, short_name):
-        return self.plugins[short_name]
+        return self.resolve(self.plugins[short_name])
 
     def __len__(self):
         return len(self.plugins)
@@ -34,17 +60,78 @@ class PluginManager(object):
         +   ``mime_type``.
         """
 
+        placeholder = self.plugins.get(cls.short_name)
+        if isinstance(placeholder, LazyPlugin):
+            # Plugin module was imported: replace placeholder keeping
+            # its registration order.
+            self.discard(placeholder, cls)
         self.plugins[cls.short_name] = cls
         for file_extension in cls.file_extensions:
-            self.file_extensions.setdefault(file_extension, []).append(cls)
-        self.mime_types.setdefault(cls.mime_type, []).append(cls)
+            plugins = self.file_extensions.setdefault(file_extension, [])
+            if cls not in plugins:
+                plugins.append(cls)
+        plugins = self.mime_types.setdefault(cls.mime_type, [])
+        if cls not in plugins:
+            plugins.append(cls)
+
+    def add_lazy(self, short_name, module, file_extensions, mime_type):
+        """ Registers plugin, which is implemented in ``module``,
+        without importing it.
+
+        :param module: Full name of module, which defines plugin class.
+        """
+
+        if short_name in self.plugins:
+            return
+        self.add(LazyPlugin(short_name, module, file_extensions, mime_type))
+
+    def discard(self, placeholder, replacement=None):
+        """ Removes (or replaces with ``replacement``, if it is not
+        ``None``) lazy plugin placeholder.
+        """
+
+        del self.plugins[placeholder.short_name]
+        for registry, key in (
+                [(self.file_extensions, extension)
+                 for extension in placeholder.file_extensions] +
+                [(self.mime_types, placeholder.mime_type)]):
+            plugins = registry[key]
+            index = plugins.index(placeholder)
+            if replacement is not None:
+                plugins[index] = replacement
+            else:
+                del plugins[index]
+                if not plugins:
+                    del registry[key]
+
+    def resolve(self, plugin):
+        """ Returns plugin class. If ``plugin`` is lazy plugin
+        placeholder, then imports its module.
+
+        If module import fails, then placeholder is removed and
+        :py:exc:`ImportError` is raised.
+        """
+
+        if isinstance(plugin, LazyPlugin):
+            try:
+                plugin.load()
+            except ImportError:
+                self.discard(plugin)
+                raise
+            if self.plugins.get(plugin.short_name) is plugin:
+                self.discard(plugin)
+                raise ImportError(
+                        u'Module {0} does not define plugin {1}.'.format(
+                            plugin.module, plugin.short_name))
+            return self.plugins[plugin.short_name]
+        return plugin
 
     def get_by_extension(self, extension):
         """ Returns last registered plugin, which can handle file with
         given extension.
         """
 
-        return self.file_extensions[extension][-1]
+        return self.resolve(self.file_extensions[extension][-1])
 
     def get_by_file(self, filename):
         """ Returns plugin, which can handle file with given filename.
@@ -60,7 +147,26 @@ class PluginManager(object):
         given mime type.
         """
 
-        return self.mime_types[mime_type][-1]
+        return self.resolve(self.mime_types[mime_type][-1])
+
+    def get_by_content(self, file):
+        """ Returns plugin, which can handle given file like object.
+        (Guessing based on the content of file prefix, which is
+        peeked without consuming stream.)
+
+        :returns: Tuple ``(plugin, file, options)``, where ``file``
+            should be used for reading instead of given one and
+            ``options`` is dict of detected reader arguments. Not
+            seekable zip stream is copied to seekable temporary file.
+        """
+
+        prefix, file = peek(file)
+        mime_type, options = sniff(prefix)
+        if mime_type is None:
+            raise KeyError(u'Failed to detect file type.')
+        if prefix.startswith(ZIP_MAGIC) and isinstance(file, PeekedFile):
+            file = spool(file)
+        return self.get_by_mime(mime_type), file, options
 
 
 class MountPoint(type):
@@ -0,0 +1,127 @@
+#!/usr/bin/python
+
+
+"""
+
+Queries, which select subset of columns and rows.
+
+Query can be passed to readers (``query`` argument of
+:py:meth:`pysheets.sheet.Sheet.read`), which then decode only fields
+of selected columns and columns used in conditions, and append to
+sheet only matching rows:
+
+>>> from pysheets.query import Query
+>>> query = Query(
+...         select=[u'Name', u'Total'],
+...         where={u'Status': u'paid', u'Total': lambda x: x != u'0'},
+...         limit=100)
+
+"""
+
+
+import operator
+
+
+def create_predicate(condition):
+    """ Returns function, which checks if value matches condition.
+    Condition is either such function, or value, which have to be
+    equal.
+    """
+
+    if callable(condition):
+        return condition
+    else:
+        return lambda value: value == condition
+
+
+class Query(object):
+    """ Selection of columns and rows.
+
+    :param select: Captions of columns to select. ``None`` means all.
+    :param where: Dict of caption and condition pairs. Condition is
+        either a function, which gets field value and returns ``True``,
+        if it matches, or value, which field have to be equal to. Row
+        matches if all conditions are met.
+    :param limit: Maximum number of rows. ``None`` means unlimited.
+    """
+
+    def __init__(self, select=None, where=None, limit=None):
+
+        self.select = select
+        self.where = where or {}
+        self.limit = limit
+
+    def get_captions(self, captions):
+        """ Returns captions of columns, which are selected from
+        columns with ``captions``.
+        """
+
+        if self.select is None:
+            return list(captions)
+        else:
+            return list(self.select)
+
+    def compile(self, captions):
+        """ Returns tuple ``(columns, conditions)``, where ``columns``
+        is list of ``(caption, position)`` pairs of selected columns and
+        ``conditions`` is list of ``(position, predicate)`` pairs.
+
+        :param captions: Captions of columns in the order, in which
+            fields are stored in rows.
+        """
+
+        positions = dict(
+                (caption, position)
+                for position, caption in enumerate(captions))
+
+        def get_position(caption):
+            """ Returns position of column with given caption.
+            """
+            try:
+                return positions[caption]
+            except KeyError:
+                raise ValueError(u'No column "{0}".'.format(caption))
+
+        columns = [
+                (caption, get_position(caption))
+                for caption in self.get_captions(captions)]
+        conditions = [
+                (get_position(caption), create_predicate(condition))
+                for caption, condition in self.where.items()]
+        return columns, conditions
+
+    def get_positions(self, captions):
+        """ Returns set of positions of columns, which fields are
+        needed for executing query.
+        """
+
+        columns, conditions = self.compile(captions)
+        return set(
+                [position for caption, position in columns] +
+                [position for position, predicate in conditions])
+
+    def execute(self, rows, captions, get_field=operator.getitem):
+        """ Generates dicts of selected fields of matching rows.
+
+        :param rows: Iterable of rows.
+        :param captions: Captions of columns in the order, in which
+            fields are stored in rows.
+        :param get_field: Function, which gets row and position and
+            returns field value. Only needed fields are requested.
+        """
+
+        columns, conditions = self.compile(captions)
+        if self.limit is not None and self.limit <= 0:
+            return
+        matched = 0
+        for row in rows:
+            for position, predicate in conditions:
+                if not predicate(get_field(row, position)):
+                    break
+            else:
+                yield dict([
+                    (caption, get_field(row, position))
+                    for caption, position in columns])
+                matched += 1
+                if matched == self.limit:
+                    return
@@ -29,6 +29,11 @@ class SheetReader(object):
         from file.
     +   ``kwargs`` -- other options passed to :py:meth:`Sheet.read`.
 
+    Reader can also have method ``iterate``, which gets the same
+    arguments and returns iterator through validated (by
+    :py:meth:`Sheet.validate_row`), but not appended to sheet rows.
+    It is used by :py:meth:`Sheet.read` in streaming mode.
+
     """
 
     __metaclass__ = MountPoint
@@ -62,9 +67,12 @@ class SpreadSheetReader(object):
 __all__ = ['csv', 'ods']
 
 
-# Init built-in readers. (Silently.)
-for reader_module in __all__:
-    try:
-        __import__('pysheets.readers', fromlist=[reader_module], level=0)
-    except ImportError:
-        pass
+# Register built-in readers. Their modules are imported on first use.
+SheetReader.plugins.add_lazy(
+        u'CSV', 'pysheets.readers.csv', [u'csv'], 'text/csv')
+SheetReader.plugins.add_lazy(
+        u'ODSS', 'pysheets.readers.ods', [u'ods'],
+        'application/vnd.oasis.opendocument.spreadsheet')
+SpreadSheetReader.plugins.add_lazy(
+        u'ODS', 'pysheets.readers.ods', [u'ods'],
+        'application/vnd.oasis.opendocument.spreadsheet')
@@ -2,15 +2,232 @@
 
 
 """ Reader for CSV files.
+
+Large files can be read in parallel
+(:py:meth:`CSVReader.read_parallel`): file is split into byte ranges
+on record boundaries, ranges are parsed in worker processes and parsed
+rows are appended to sheet in file order. File is memory mapped and
+ranges are split into lines block by block (:py:func:`iterate_lines`),
+so workers read them straight from the page cache without copying them
+whole. Sequential reading iterates file object: mapping gave no gain
+there.
+
+Fields are decoded record by record: all fields of a record are joined
+and decoded by a single call, and records are appended to sheet by
+position (header is mapped to sheet columns once). Fields of columns,
+which are in sheet :py:attr:`schema <pysheets.sheet.Sheet.schema>`,
+are converted to declared types in chunks of records.
 """
 
 
 from __future__ import absolute_import
-from csv import DictReader
+from collections import deque
+from contextlib import contextmanager
+from cStringIO import StringIO
+from csv import Error as CSVError, reader as create_reader
+from itertools import izip
+import codecs
 import functools
+import marshal
+import mmap
+import multiprocessing
 
 from pysheets.exceptions import InvalidFileError
+from pysheets.joining import create_getter
 from pysheets.readers import SheetReader
+from pysheets.schema import convert_dicts, convert_records
+
+
+CHUNK_SIZE = 1 << 24
+"""Default size (in bytes) of file ranges parsed by worker processes."""
+
+BLOCK_SIZE = 1 << 20
+
+FIELD_SEPARATOR = '\x00'
+"""Separator of joined record fields. :py:mod:`csv` does not accept NUL
+bytes, so it is never in field."""
+
+SPECIAL_CHARACTERS = u'\r\n\t ,;|"\''
+
+
+def is_ascii_compatible(encoding):
+    """ Checks if characters, which have special meaning in CSV, are
+    encoded by ``encoding`` in the same way as by ASCII. Then file can
+    be parsed before decoding.
+    """
+
+    return (SPECIAL_CHARACTERS.encode(encoding) ==
+            SPECIAL_CHARACTERS.encode('ascii'))
+
+
+def create_decoder(encoding):
+    """ Returns function, which decodes list of byte string fields of
+    record to list of unicode fields. If ``encoding`` is ``None``, then
+    fields are not decoded (nor validated).
+    """
+
+    if encoding is None:
+        return list
+    separator = FIELD_SEPARATOR.decode(encoding)
+    return lambda fields: unicode(
+            FIELD_SEPARATOR.join(fields), encoding).split(separator)
+
+
+def decode_records(reader, decode, width):
+    """ Generates decoded records. Empty records are skipped and short
+    records are padded with ``None`` to ``width`` fields.
+    """
+
+    for record in reader:
+        if not record:
+            continue
+        fields = decode(record)
+        if len(fields) < width:
+            fields.extend([None] * (width - len(fields)))
+        yield fields
+
+
+def pad_records(reader, width):
+    """ Generates not decoded records. Empty records are skipped and
+    short records are padded with ``None`` to ``width`` fields, as by
+    :py:func:`decode_records`.
+    """
+
+    for record in reader:
+        if not record:
+            continue
+        if len(record) < width:
+            record.extend([None] * (width - len(record)))
+        yield record
+
+
+@contextmanager
+def map_file(filename):
+    """ Context manager, which maps file with given name into memory
+    (read only) and returns :py:class:`mmap.mmap`. Empty file can not
+    be mapped, so empty string is returned instead.
+    """
+
+    with open(filename, 'rb') as fp:
+        try:
+            mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file.
+            yield ''
+            return
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+def iterate_lines(data, start=0, end=None, block_size=BLOCK_SIZE):
+    """ Generates lines of ``data[start:end]`` (``data`` is string or
+    :py:class:`mmap.mmap`). Data is sliced into blocks of about
+    ``block_size`` bytes, which end at line break, so only one block
+    is copied at a time.
+    """
+
+    if end is None:
+        end = len(data)
+    while start < end:
+        stop = start + block_size
+        if stop < end:
+            newline = data.rfind('\n', start, stop)
+            if newline < 0:
+                # Line is longer than block.
+                newline = data.find('\n', stop, end)
+            stop = end if newline < 0 else newline + 1
+        else:
+            stop = end
+        for line in StringIO(data[start:stop]):
+            yield line
+        start = stop
+
+
+def split_records(data, chunk_size=CHUNK_SIZE, quotechar='"'):
+    """ Returns list of offsets of record boundaries, which split
+    ``data`` (string or :py:class:`mmap.mmap`) into ranges of at least
+    ``chunk_size`` bytes. The first offset is 0, the second -- the end
+    of header record and the last -- the end of data.
+
+    Line breaks inside quoted fields are not boundaries: quote
+    characters are counted and line break is a boundary only if even
+    number of them is before it (escaped quote is doubled, so it does
+    not change parity). Quote inside not quoted field is not escaped,
+    so after it boundaries can be wrong; they have to be checked by
+    parsing (look at :py:func:`parse_range`).
+    """
+
+    boundaries = [0]
+    target = 0
+    quoted = False
+    size = len(data)
+    for base in xrange(0, size, BLOCK_SIZE):
+        block = data[base:base + BLOCK_SIZE]
+        position = 0
+        while position < len(block):
+            start = max(target - base, position)
+            if start >= len(block):
+                quoted ^= block.count(quotechar, position) & 1
+                break
+            quoted ^= block.count(quotechar, position, start) & 1
+            position = start
+            while position < len(block):
+                end = block.find('\n', position)
+                if end < 0:
+                    quoted ^= block.count(quotechar, position) & 1
+                    position = len(block)
+                    break
+                quoted ^= block.count(quotechar, position, end) & 1
+                position = end + 1
+                if not quoted:
+                    boundaries.append(base + position)
+                    target = base + position + chunk_size
+                    break
+    if boundaries[-1] != size:
+        boundaries.append(size)
+    return boundaries
+
+
+def parse_records(
+        data, width, dialect, delimiter, quotechar, encoding='utf-8',
+        strict=False, start=0, end=None):
+    """ Returns list of records (lists of unicode fields) parsed from
+    ``data[start:end]`` (string or :py:class:`mmap.mmap` in ASCII
+    compatible ``encoding``). Empty records are skipped and short
+    records are padded with ``None`` to ``width`` fields.
+
+    :param strict: If ``True``, then :py:class:`csv.Error` is raised,
+        if ``data`` ends inside quoted field (or quote is misplaced).
+    """
+
+    return list(decode_records(
+        create_reader(
+            iterate_lines(data, start, end), dialect=dialect,
+            delimiter=delimiter, quotechar=quotechar, strict=strict),
+        create_decoder(encoding), width))
+
+
+def parse_range(task):
+    """ Parses byte range of CSV file. Used as :py:mod:`multiprocessing`
+    worker function.
+
+    :param task: Tuple ``(filename, start, end, width, dialect,
+        delimiter, quotechar, encoding)``.
+    :returns: Records serialized by :py:mod:`marshal` (which is much
+        faster than pickling of lists of unicode strings), or ``None``
+        if range does not end at record boundary.
+    """
+
+    filename, start, end = task[:3]
+    with map_file(filename) as mapped:
+        try:
+            records = parse_records(
+                    mapped, *task[3:], strict=True, start=start, end=end)
+        except CSVError:
+            return None
+    return marshal.dumps(records)
 
 
 class CSVReader(SheetReader):
@@ -22,41 +239,276 @@ class CSVReader(SheetReader):
     file_extensions = [u'csv',]
     mime_type = 'text/csv'
 
-    def read(
+    def create_columns(self, sheet, captions):
+        """ Appends columns, which sheet does not have yet.
+        """
+
+        captions_set = set(sheet.captions)
+        for caption in captions:
+            if caption not in captions_set:
+                sheet.add_column(caption)
+
+    def parse(self, file, dialect, delimiter, quotechar, encoding):
+        """ Reads header of CSV file.
+
+        :returns: Tuple ``(captions, reader, decode)``, where ``reader``
+            is :py:func:`csv.reader`, positioned after the header, and
+            ``decode`` is function created by :py:func:`create_decoder`
+            for its records. If ``encoding`` is not ASCII compatible
+            (for example, UTF-16), then file is re-encoded to UTF-8.
+        """
+
+        if encoding is not None and not is_ascii_compatible(encoding):
+            file = (
+                    line.encode('utf-8')
+                    for line in codecs.getreader(encoding)(file))
+            encoding = 'utf-8'
+        reader = create_reader(
+                file, dialect=dialect, delimiter=delimiter,
+                quotechar=quotechar)
+        header = next(reader, None)
+        if not header:
+            raise InvalidFileError(
+                    u'Trying to read empty or badly formated sheet.')
+        decode = create_decoder(encoding)
+        return decode(header), reader, decode
+
+    def arrange(self, sheet, captions, records):
+        """ Returns iterable of rows, which can be passed to
+        :py:meth:`pysheets.sheet.Sheet.extend`. If file columns are
+        sheet columns in the same order, then ``records`` are returned
+        as they are; if they are in different order, then fields are
+        rearranged by positions, which are mapped once; otherwise
+        records are converted to dicts.
+        """
+
+        if captions == sheet.captions:
+            return records
+        positions = dict(
+                (caption, position)
+                for position, caption in enumerate(captions))
+        if all(caption in positions for caption in sheet.captions):
+            get_fields = create_getter([
+                positions[caption] for caption in sheet.captions])
+            return (get_fields(record) for record in records)
+        return (dict(izip(captions, record)) for record in records)
+
+    def records(
             self, sheet, file, create_columns=True,
-            dialect='excel', delimiter=';', quotechar='\"'):
-        """ Reads data from given file into sheet.
+            dialect='excel', delimiter=';', quotechar='\"', query=None,
+            encoding='utf-8'):
+        """ Returns iterator through records of given file decoded into
+        dicts.
 
         Arguments ``dialect``, ``delimiter`` and ``quotechar`` are
         passed to CSV reader. For documentation look
-        `here <http://docs.python.org/library/csv.html#csv.DictReader>`_
+        `here <http://docs.python.org/library/csv.html#csv.reader>`_
+
+        :param query: :py:class:`pysheets.query.Query`. If given, then
+            only selected columns are created, only fields needed for
+            query are decoded and only matching records are returned.
+        :param encoding: Encoding of file. If ``None``, then fields are
+            not decoded (nor validated) and are byte strings, which is
+            the fastest option for trusted ASCII input.
         """
 
-        reader = DictReader(
-                file, dialect=dialect, delimiter=delimiter,
-                quotechar=quotechar)
-        if not reader.fieldnames:
+        captions, reader, decode = self.parse(
+                file, dialect, delimiter, quotechar, encoding)
+
+        if query is not None:
+            selected = query.get_captions(captions)
+            if create_columns:
+                self.create_columns(sheet, selected)
+            if encoding is None:
+                get_field = lambda row, position: row[position]
+            else:
+                get_field = lambda row, position: (
+                        None if row[position] is None else
+                        decode([row[position]])[0])
+            records = query.execute(
+                    pad_records(reader, len(captions)), captions,
+                    get_field)
+            if sheet.schema:
+                records = convert_dicts(records, selected, sheet.schema)
+            for record in records:
+                yield record
+            return
+
+        if create_columns:
+            self.create_columns(sheet, captions)
+
+        records = decode_records(reader, decode, len(captions))
+        if sheet.schema:
+            records = convert_records(records, captions, sheet.schema)
+        for fields in records:
+            yield dict(izip(captions, fields))
+
+    def read(
+            self, sheet, file, create_columns=True,
+            dialect='excel', delimiter=';', quotechar='\"', query=None,
+            encoding='utf-8'):
+        """ Reads data from given file into sheet.
+
+        Arguments are the same as of :py:meth:`records`.
+        """
+
+        if query is not None:
+            for row in self.records(
+                    sheet, file, create_columns, dialect, delimiter,
+                    quotechar, query, encoding):
+                sheet.append_dict(row)
+            return
+
+        captions, reader, decode = self.parse(
+                file, dialect, delimiter, quotechar, encoding)
+        if create_columns:
+            self.create_columns(sheet, captions)
+        self.insert_records(
+                sheet, captions,
+                decode_records(reader, decode, len(captions)))
+
+    def insert_records(self, sheet, captions, records):
+        """ Converts decoded ``records`` by sheet :py:attr:`schema
+        <pysheets.sheet.Sheet.schema>` and appends them to sheet.
+        """
+
+        if sheet.schema:
+            records = convert_records(records, captions, sheet.schema)
+        sheet.extend(self.arrange(sheet, captions, records))
+
+    def iterate(self, sheet, file, *args, **kwargs):
+        """ Returns iterator through validated rows of given file.
+        Rows are not appended to sheet, so file is read in constant
+        memory. (Columns are created, when iteration starts.)
+
+        Arguments are the same as of :py:meth:`records`.
+        """
+
+        if isinstance(file, unicode):
+            with open(file, 'rb') as fp:
+                for row in self.iterate(sheet, fp, *args, **kwargs):
+                    yield row
+        else:
+            for row in self.records(sheet, file, *args, **kwargs):
+                yield sheet.validate_row(row)
+
+    def read_parallel(
+            self, sheet, filename, create_columns=True,
+            dialect='excel', delimiter=';', quotechar='\"', query=None,
+            encoding='utf-8', processes=None, chunk_size=CHUNK_SIZE):
+        """ Reads data from file with given name into sheet. File is
+        split into ranges of about ``chunk_size`` bytes, which are
+        parsed by ``processes`` worker processes (``None`` means the
+        number of CPUs). Rows are appended (and validated) in file
+        order in current process.
+
+        Other arguments are the same as of :py:meth:`records`. If
+        ``query`` is given or ``encoding`` is not ASCII compatible, then
+        file is read sequentially.
+
+        .. note::
+            :py:func:`split_records` treats every quote character as
+            significant, so quote inside not quoted field (``55"
+            screen``) makes it to split file inside quoted field.
+            Workers parse ranges in strict mode, so such range fails to
+            parse (it ends inside quoted field) and file is read
+            sequentially from the start of that range.
+        """
+
+        read_sequentially = lambda fp: self.read(
+                sheet, fp, create_columns, dialect, delimiter,
+                quotechar, query, encoding)
+        if query is not None or (
+                encoding is not None and not is_ascii_compatible(encoding)):
+            with open(filename, 'rb') as fp:
+                read_sequentially(fp)
+            return
+
+        with map_file(filename) as mapped:
+            boundaries = split_records(mapped, chunk_size, quotechar)
+            header = mapped[:boundaries[1]] if len(boundaries) > 1 else ''
+
+        try:
+            captions = next(iter(parse_records(
+                header, 0, dialect, delimiter, quotechar, encoding,
+                strict=True)), None)
+        except CSVError:
+            # Header does not end at record boundary.
+            with open(filename, 'rb') as fp:
+                read_sequentially(fp)
+            return
+        if not captions:
             raise InvalidFileError(
                     u'Trying to read empty or badly formated sheet.')
 
         if create_columns:
-            captions_set = set(sheet.captions)
-            for caption in reader.fieldnames:
-                caption = caption.decode('utf-8')
-                if caption not in captions_set:
-                    sheet.add_column(caption)
+            self.create_columns(sheet, captions)
+
+        def insert(start, result):
+            """ Inserts records parsed by worker. Returns ``start``
+            offset of range, if it failed to parse.
+            """
+            data = result.get()
+            if data is None:
+                return start
+            self.insert_records(sheet, captions, marshal.loads(data))
+            return None
 
-        for row in reader:
-            sheet.append_dict(dict([
-                (key.decode('utf-8'), value.decode('utf-8'))
-                for key, value in row.items()]))
+        tasks = [
+                (filename, start, end, len(captions),
+                 dialect, delimiter, quotechar, encoding)
+                for start, end in zip(boundaries[1:-1], boundaries[2:])]
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        resume = None
+        pool = multiprocessing.Pool(processes)
+        try:
+            # Only a few ranges are parsed ahead, so that memory usage
+            # does not depend on the size of file.
+            pending = deque()
+            for task in tasks:
+                pending.append(
+                        (task[1], pool.apply_async(parse_range, (task,))))
+                if len(pending) > 2 * processes:
+                    resume = insert(*pending.popleft())
+                    if resume is not None:
+                        break
+            while resume is None and pending:
+                resume = insert(*pending.popleft())
+        except:
+            pool.terminate()
+            raise
+        else:
+            if resume is None:
+                pool.close()
+            else:
+                pool.terminate()
+        finally:
+            pool.join()
+
+        if resume is not None:
+            with open(filename, 'rb') as fp:
+                fp.seek(resume)
+                reader = create_reader(
+                        fp, dialect=dialect, delimiter=delimiter,
+                        quotechar=quotechar)
+                self.insert_records(sheet, captions, decode_records(
+                    reader, create_decoder(encoding), len(captions)))
 
     @functools.wraps(read)
     def __call__(self, sheet, file, *args, **kwargs):
         """ Wrapper function, which ensures that file is file like
         object.
+
+        If ``file`` is file name and ``processes`` argument is given
+        (and is not 1), then file is read by :py:meth:`read_parallel`.
         """
 
+        if isinstance(file, unicode) and kwargs.get('processes', 1) != 1:
+            self.read_parallel(sheet, file, *args, **kwargs)
+            return
+        kwargs.pop('processes', None)
+        kwargs.pop('chunk_size', None)
         if isinstance(file, unicode):
             with open(file, 'rb') as fp:
                 self.read(sheet, fp, *args, **kwargs)
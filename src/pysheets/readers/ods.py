@@ -5,51 +5,331 @@
 
 Readers for ODF Spreadsheet files.
 
->>> from odf.opendocument import load
->>> from odf.table import Table, TableRow, TableCell
->>> doc = load('src/pysheets/test/files/sheet.ods')
->>>
->>> # Reading.
->>> table, = doc.getElementsByType(Table)
->>> print table.getAttribute('name')
->>> for row in table.getElementsByType(TableRow):
-...     for cell in row.childNodes:
-...         print cell.childNodes[0].childNodes[0].data,
-...     print
->>>
->>> # Writing.
->>> table2 = Table(name=u'bla')
->>> doc.spreadsheet.addElement(table2)
->>> doc.write('src/pysheets/test/files/sheet2.ods')
+``content.xml`` is parsed incrementally straight from the zip archive
+(:py:func:`xml.etree.cElementTree.iterparse`), so rows are inserted
+into sheet one by one and processed rows are dropped from the tree.
+Memory usage does not depend on the size of document.
+
+Cells are read as text of their first paragraph, except cells of
+columns, which are in sheet :py:attr:`schema
+<pysheets.sheet.Sheet.schema>`: their values are taken from typed
+attributes (``office:value``, ``office:date-value``, ...) selected by
+``office:value-type`` and converted to declared types.
 
 """
 
 
-from odf.opendocument import load
-from odf.table import Table, TableRow
+import cPickle
+import multiprocessing
+import re
+import zipfile
+from collections import deque
+from cStringIO import StringIO
+from itertools import groupby, islice, izip
+from operator import itemgetter
+from xml.etree.cElementTree import iterparse, fromstring
 
 from pysheets.exceptions import InvalidFileError
 from pysheets.readers import SheetReader, SpreadSheetReader
+from pysheets.schema import convert_records
+
+
+OFFICE_NS = u'urn:oasis:names:tc:opendocument:xmlns:office:1.0'
+TABLE_NS = u'urn:oasis:names:tc:opendocument:xmlns:table:1.0'
+TEXT_NS = u'urn:oasis:names:tc:opendocument:xmlns:text:1.0'
+
+TABLE_TAG = u'{{{0}}}table'.format(TABLE_NS)
+TABLE_ROW_TAG = u'{{{0}}}table-row'.format(TABLE_NS)
+P_TAG = u'{{{0}}}p'.format(TEXT_NS)
+NAME_ATTR = u'{{{0}}}name'.format(TABLE_NS)
+COLUMNS_REPEATED_ATTR = u'{{{0}}}number-columns-repeated'.format(TABLE_NS)
+ROWS_REPEATED_ATTR = u'{{{0}}}number-rows-repeated'.format(TABLE_NS)
+VALUE_TYPE_ATTR = u'{{{0}}}value-type'.format(OFFICE_NS)
+VALUE_ATTR = u'{{{0}}}value'.format(OFFICE_NS)
+
+# Mapping from ``office:value-type`` to attribute, which holds value.
+VALUE_ATTRS = {
+        u'float': VALUE_ATTR,
+        u'percentage': VALUE_ATTR,
+        u'currency': VALUE_ATTR,
+        u'date': u'{{{0}}}date-value'.format(OFFICE_NS),
+        u'time': u'{{{0}}}time-value'.format(OFFICE_NS),
+        u'boolean': u'{{{0}}}boolean-value'.format(OFFICE_NS),
+        u'string': u'{{{0}}}string-value'.format(OFFICE_NS),
+        }
+
+ROOT_RE = re.compile(r'<(?:([\w.-]+):)?document-content(?=[\s>])[^>]*>')
+TABLE_PREFIX_RE = re.compile(
+        r'xmlns:([\w.-]+)=["\']{0}["\']'.format(re.escape(TABLE_NS)))
+SCAN_CHUNK_SIZE = 1 << 20
+
+
+def parse_rows(file):
+    """ Parses ``content.xml`` of ODF document incrementally and
+    generates ``(table_index, table_name, row)`` triples. At the
+    start of each table triple with ``row`` equal to ``None`` is
+    generated.
+
+    Row element is removed from the tree after it is processed.
+    """
+
+    archive = zipfile.ZipFile(file)
+    try:
+        for item in parse_content_rows(archive.open('content.xml')):
+            yield item
+    finally:
+        archive.close()
 
 
-def row_values_generator(row, default_value):
-    """ Generates infinitive sequence of row cells values.
+def parse_content_rows(content):
+    """ Does the same as :py:func:`parse_rows`, but gets ``content``
+    -- file like object with XML.
     """
-    for cell in row.childNodes:
-        for i in range(int(cell.attributes.get(
-            (u'urn:oasis:names:tc:opendocument:xmlns:table:1.0',
-                u'number-columns-repeated'), 1))):
-            try:
-                for node in cell.childNodes:
-                    if node.qname == (
-                            u'urn:oasis:names:tc:opendocument:'
-                            u'xmlns:text:1.0', u'p'):
-                        yield node.firstChild.data
-                        break
+
+    parents = []
+    table_index = -1
+    table_name = None
+    for event, element in iterparse(content, events=('start', 'end')):
+        if event == 'start':
+            parents.append(element)
+            if element.tag == TABLE_TAG:
+                table_index += 1
+                table_name = unicode(element.get(NAME_ATTR))
+                yield table_index, table_name, None
+        else:
+            parents.pop()
+            if element.tag == TABLE_ROW_TAG:
+                yield table_index, table_name, element
+                # Row element is the last child of its parent.
+                del parents[-1][-1]
+
+
+def iterate_tables(file, parse=parse_rows):
+    """ Generates ``(table_name, rows)`` pairs, where ``rows`` is
+    iterator through row elements of the table.
+
+    .. note::
+        ``rows`` have to be used before advancing to the next table.
+    """
+
+    for (index, name), items in groupby(parse(file), itemgetter(0, 1)):
+        yield name, (row for _, _, row in items if row is not None)
+
+
+def scan_tables(file):
+    """ Scans ``content.xml`` of ODF document for byte ranges of
+    ``table:table`` elements without parsing it.
+
+    :returns: Tuple ``(root_start, root_end, tables)``, where
+        ``root_start`` and ``root_end`` are start and end tags of
+        document root element (with namespace declarations) and
+        ``tables`` is list of ``(name, start, end)`` triples. ``None``
+        is returned, if table namespace prefix is not declared in root
+        element.
+    """
+
+    archive = zipfile.ZipFile(file)
+    try:
+        content = archive.open('content.xml')
+        buffer = content.read(SCAN_CHUNK_SIZE)
+        root = ROOT_RE.search(buffer)
+        prefix = root and TABLE_PREFIX_RE.search(root.group(0))
+        if prefix is None:
+            return None
+        root_start = root.group(0)
+        root_end = '</{0}document-content>'.format(
+                root.group(1) + ':' if root.group(1) else '')
+        tag_re = re.compile(r'<(/?){0}:table(?=[\s/>])[^>]*>'.format(
+            re.escape(prefix.group(1))))
+
+        tables = []
+        depth = 0
+        offset = 0
+        while buffer:
+            chunk = content.read(SCAN_CHUNK_SIZE)
+            # Tag can be split between chunks; it is left for the next
+            # round.
+            cut = buffer.rfind('<') if chunk else -1
+            if cut < 0:
+                cut = len(buffer)
+            for match in tag_re.finditer(buffer, 0, cut):
+                tag = match.group(0)
+                if match.group(1):
+                    depth -= 1
+                    if depth == 0:
+                        tables[-1][2] = offset + match.end()
+                elif tag.endswith('/>'):
+                    if depth == 0:
+                        tables.append([tag, offset + match.start(),
+                                       offset + match.end()])
                 else:
-                    yield default_value
-            except AttributeError:
-                yield default_value
+                    if depth == 0:
+                        tables.append([tag, offset + match.start(), None])
+                    depth += 1
+            offset += cut
+            buffer = buffer[cut:] + chunk
+    finally:
+        archive.close()
+
+    result = []
+    for tag, start, end in tables:
+        if not tag.endswith('/>'):
+            tag = tag[:-1] + '/>'
+        element = fromstring(root_start + tag + root_end)[0]
+        result.append((unicode(element.get(NAME_ATTR)), start, end))
+    return root_start, root_end, result
+
+
+def extract_tables(file, tables):
+    """ Generates data (byte strings) of ``tables`` -- ``(name, start,
+    end)`` triples returned by :py:func:`scan_tables`, ordered by
+    ``start``. ``content.xml`` is decompressed once, as data is
+    generated.
+    """
+
+    archive = zipfile.ZipFile(file)
+    try:
+        content = archive.open('content.xml')
+        offset = 0
+        for name, start, end in tables:
+            skip = start - offset
+            while skip > 0:
+                skip -= len(content.read(min(skip, SCAN_CHUNK_SIZE)))
+            yield content.read(end - start)
+            offset = end
+    finally:
+        archive.close()
+
+
+def read_captions(iterator, name):
+    """ Reads captions (until the first empty cell) from the first row
+    of the table.
+    """
+
+    try:
+        captions = []
+        for cell in iterator.next():
+            caption = cell_text(cell)
+            if caption is None:
+                break
+            captions.append(caption)
+    except StopIteration:
+        raise InvalidFileError(
+                u'Trying to read empty sheet ({0}).'.format(name))
+    if not captions:
+        raise InvalidFileError((
+            u'Trying to read empty sheet ({0}).').format(name))
+    return captions
+
+
+def typed_columns(captions, schema):
+    """ Returns list of booleans, which tell if values of columns have
+    to be read from typed attributes, or ``None`` if no column has.
+    """
+
+    if not schema:
+        return None
+    return [caption in schema for caption in captions]
+
+
+def table_rows(
+        iterator, captions, default_value, query=None, typed=None):
+    """ Generates lists of row values (of columns selected by
+    ``query``, if it is given).
+
+    :param typed: Result of :py:func:`typed_columns`.
+    """
+
+    if query is not None:
+        selected = query.get_captions(captions)
+        for record in query.execute(
+                query_rows(iterator, captions, query, default_value, typed),
+                captions):
+            yield [record[caption] for caption in selected]
+        return
+
+    width = len(captions)
+    for row in iterator:
+        rows_count = int(row.get(ROWS_REPEATED_ATTR, 1))
+        if rows_count > 1000:
+            # Reached last row.
+            break
+        values = list(islice(
+            row_values_generator(row, default_value, typed), width))
+        values.extend([default_value] * (width - len(values)))
+        for i in xrange(rows_count):
+            yield list(values)
+
+
+def read_table(task):
+    """ Reads table from its part of ``content.xml``. Used as
+    :py:mod:`multiprocessing` worker function.
+
+    :param task: Tuple ``(root_start, root_end, data, default_value,
+        query, schema)``, where ``data`` is generated by
+        :py:func:`extract_tables`.
+    :returns: Tuple ``(captions, rows)``, where ``rows`` is list of
+        sequences of values.
+    """
+
+    root_start, root_end, data, default_value, query, schema = task
+
+    for name, iterator in iterate_tables(
+            StringIO(root_start + data + root_end), parse_content_rows):
+        captions = read_captions(iterator, name)
+        rows = table_rows(
+                iterator, captions, default_value, query,
+                typed_columns(captions, schema))
+        if query is not None:
+            captions = query.get_captions(captions)
+        if schema:
+            rows = convert_records(rows, captions, schema)
+        return captions, list(rows)
+
+
+def cell_text(cell):
+    """ Returns text of the first paragraph of the cell, or ``None``
+    if cell is empty.
+    """
+
+    for node in cell:
+        if node.tag == P_TAG:
+            if node.text is None:
+                return None
+            return unicode(node.text)
+    return None
+
+
+def cell_value(cell):
+    """ Returns value of typed attribute of the cell (as text), or
+    text of the first paragraph if cell has no such attribute.
+    """
+
+    attr = VALUE_ATTRS.get(cell.get(VALUE_TYPE_ATTR))
+    if attr is not None:
+        value = cell.get(attr)
+        if value is not None:
+            return unicode(value)
+    return cell_text(cell)
+
+
+def row_values_generator(row, default_value, typed=None):
+    """ Generates sequence of row cells values.
+
+    :param typed: Result of :py:func:`typed_columns`.
+    """
+    position = 0
+    for cell in row:
+        if typed is not None and position < len(typed) and typed[position]:
+            value = cell_value(cell)
+        else:
+            value = cell_text(cell)
+        if value is None:
+            value = default_value
+        repeated = int(cell.get(COLUMNS_REPEATED_ATTR, 1))
+        for i in xrange(repeated):
+            yield value
+        position += repeated
 
 
 def generate_row_dict(row, captions, default_value):
@@ -63,14 +343,73 @@ def generate_row_dict(row, captions, default_value):
         ])
 
 
-def insert_to_sheet(iterator, sheet, captions, default_value):
+def select_row_values(row, wanted, default_value, typed=None):
+    """ Returns list of row cells values. Only cells at positions, for
+    which ``wanted`` (list of booleans) is ``True``, are decoded, other
+    values are ``None``.
+
+    :param typed: Result of :py:func:`typed_columns`.
+    """
+
+    count = len(wanted)
+    values = []
+    for cell in row:
+        position = len(values)
+        repeated = int(cell.get(COLUMNS_REPEATED_ATTR, 1))
+        if any(wanted[position:position + repeated]):
+            if typed is not None and typed[position]:
+                value = cell_value(cell)
+            else:
+                value = cell_text(cell)
+            if value is None:
+                value = default_value
+        else:
+            value = None
+        values.extend([value] * min(repeated, count - position))
+        if len(values) >= count:
+            break
+    values.extend([default_value] * (count - len(values)))
+    return values
+
+
+def query_rows(iterator, captions, query, default_value, typed=None):
+    """ Generates lists of row values, in which only fields needed for
+    ``query`` are decoded.
+
+    :param typed: Result of :py:func:`typed_columns`.
+    """
+
+    positions = query.get_positions(captions)
+    wanted = [position in positions for position in range(len(captions))]
+    for row in iterator:
+        rows_count = int(row.get(ROWS_REPEATED_ATTR, 1))
+        if rows_count > 1000:
+            # Reached last row.
+            break
+        values = select_row_values(row, wanted, default_value, typed)
+        for i in xrange(rows_count):
+            yield values
+
+
+def insert_to_sheet(iterator, sheet, captions, default_value, query=None):
     """ Inserts data from ods row iterator into sheet.
+
+    :param query: :py:class:`pysheets.query.Query`, which selects
+        inserted columns and rows.
     """
 
+    typed = typed_columns(captions, sheet.schema)
+    if query is not None or typed is not None:
+        selected = captions if query is None else query.get_captions(captions)
+        records = table_rows(iterator, captions, default_value, query, typed)
+        if typed is not None:
+            records = convert_records(records, selected, sheet.schema)
+        for fields in records:
+            sheet.append_dict(dict(izip(selected, fields)))
+        return
+
     for row in iterator:
-        rows_count = int(row.attributes.get(
-            (u'urn:oasis:names:tc:opendocument:xmlns:table:1.0',
-                u'number-rows-repeated'), 1))
+        rows_count = int(row.get(ROWS_REPEATED_ATTR, 1))
         if rows_count > 1000:
             # Reached last row.
             break
@@ -92,45 +431,61 @@ class ODFSheetReader(SheetReader):
 
     def __call__(
             self, sheet, filename, create_columns=True, sheet_name=None,
-            default_value=None):
+            default_value=None, query=None):
         """ Reads data from given file into sheet.
 
         :param sheet_name: Name of the sheet to read from document.
         :type sheet_name: unicode.
         :param default_value: Value of nonexistent cells.
+        :param query: :py:class:`pysheets.query.Query`. If given, then
+            only selected columns are created, only cells needed for
+            query are decoded and only matching rows are inserted.
 
         .. note::
             If ``sheet_name`` is None and document has more than one
-            sheet, then :py:exec:`ValueError` is raised.
+            sheet, then :py:exec:`ValueError` is raised before any rows
+            are inserted. (Tables are counted by
+            :py:func:`scan_tables`.)
         """
 
-        doc = load(filename)
-        tables = doc.getElementsByType(Table)
-        if sheet_name:
-            for table in tables:
-                if table.getAttribute('name') == sheet_name:
-                    break
+        if sheet_name is None:
+            scan = scan_tables(filename)
+            if scan is None:
+                tables_count = sum(1 for table in iterate_tables(filename))
             else:
-                raise ValueError(
-                        u'No sheet with name "{0}".'.format(sheet_name))
+                tables_count = len(scan[2])
+            if tables_count > 1:
+                raise ValueError(u'Document has more than one sheet.')
+
+        tables = iterate_tables(filename)
+        for name, iterator in tables:
+            if sheet_name is None or name == sheet_name:
+                break
         else:
-            table, = tables
+            if sheet_name is None:
+                raise InvalidFileError(u'Document has no sheets.')
+            raise ValueError(
+                    u'No sheet with name "{0}".'.format(sheet_name))
 
-        iterator = iter(table.getElementsByType(TableRow))
         try:
-            captions = [
-                    unicode(caption_node.firstChild.firstChild.data)
-                    for caption_node in iterator.next().childNodes]
-        except (StopIteration, AttributeError):
+            captions = []
+            for cell in iterator.next():
+                caption = cell_text(cell)
+                if caption is None:
+                    raise InvalidFileError(u'Trying to read empty sheet.')
+                captions.append(caption)
+        except StopIteration:
             raise InvalidFileError(u'Trying to read empty sheet.')
 
         if create_columns:
             captions_set = set(sheet.captions)
-            for caption in captions:
+            for caption in (
+                    captions if query is None else
+                    query.get_captions(captions)):
                 if caption not in captions_set:
                     sheet.add_column(caption)
 
-        insert_to_sheet(iterator, sheet, captions, default_value)
+        insert_to_sheet(iterator, sheet, captions, default_value, query)
 
 
 class ODFSpreadSheetReader(SpreadSheetReader):
@@ -144,7 +499,8 @@ class ODFSpreadSheetReader(SpreadSheetReader):
 
     def __call__(
             self, spreadsheet, filename, default_value=None,
-            read_sheets=None, ignore_sheets=()):
+            read_sheets=None, ignore_sheets=(), query=None, processes=1,
+            schemas=None):
         """ Reads data from given file into sheet.
 
         :param sheet_name: Name of the sheet to read from document.
@@ -153,6 +509,17 @@ class ODFSpreadSheetReader(SpreadSheetReader):
         :param read_sheets: Iterable of sheets to read in. ``None``
             means all.
         :param ignore_sheets: Iterable of sheets to not read in.
+        :param query: :py:class:`pysheets.query.Query`, which is
+            applied to each read sheet.
+        :param processes: Number of worker processes, which read
+            sheets in parallel (``None`` means the number of CPUs).
+            Sheets are still created (and rows validated) in document
+            order in current process. Parallel reading is used only if
+            ``filename`` is a path and ``query`` can be pickled.
+        :param schemas: Dict of sheet name and :py:attr:`schema
+            <pysheets.sheet.Sheet.schema>` pairs. Schema is given to
+            created sheet and fields are converted to declared types
+            while reading.
 
         .. todo::
 
@@ -160,31 +527,85 @@ class ODFSpreadSheetReader(SpreadSheetReader):
 
         """
 
-        doc = load(filename)
+        is_selected = lambda name: (
+                (read_sheets is None or name in read_sheets) and
+                name not in ignore_sheets)
+        schemas = schemas or {}
+
+        if processes != 1 and isinstance(filename, basestring):
+            try:
+                cPickle.dumps(query, cPickle.HIGHEST_PROTOCOL)
+            except (cPickle.PicklingError, TypeError):
+                pass
+            else:
+                scan = scan_tables(filename)
+                if scan is not None:
+                    self.read_parallel(
+                            spreadsheet, filename, scan, is_selected,
+                            default_value, query, processes, schemas)
+                    return
 
-        for table in doc.getElementsByType(Table):
+        for name, iterator in iterate_tables(filename):
 
-            name = unicode(table.getAttribute('name'))
-            if read_sheets is not None:
-                if name not in read_sheets:
-                    continue
-            if name in ignore_sheets:
+            if not is_selected(name):
                 continue
 
-            iterator = iter(table.getElementsByType(TableRow))
-            try:
-                captions = []
-                for caption_node in iterator.next().childNodes:
-                    captions.append(
-                        unicode(caption_node.firstChild.firstChild.data))
-            except StopIteration:
-                raise InvalidFileError(
-                        u'Trying to read empty sheet ({0}).'.format(name))
-            except AttributeError:
-                if not captions:
-                    raise InvalidFileError((
-                        u'Trying to read empty sheet ({0}).').format(name))
-
-            sheet = spreadsheet.create_sheet(name, captions=captions)
-
-            insert_to_sheet(iterator, sheet, captions, default_value)
+            captions = read_captions(iterator, name)
+
+            sheet = spreadsheet.create_sheet(
+                    name, captions=(
+                        captions if query is None else
+                        query.get_captions(captions)),
+                    schema=schemas.get(name))
+
+            insert_to_sheet(
+                    iterator, sheet, captions, default_value, query)
+
+    def read_parallel(
+            self, spreadsheet, filename, scan, is_selected, default_value,
+            query, processes, schemas=None):
+        """ Reads selected sheets in worker processes. Data of tables
+        is extracted from ``content.xml`` in current process (it is
+        decompressed once) and sent to workers. Sheets are created in
+        document order. Fields are converted to types declared in
+        ``schemas`` by workers.
+
+        :param scan: Result of :py:func:`scan_tables`.
+        """
+
+        root_start, root_end, tables = scan
+        tables = [table for table in tables if is_selected(table[0])]
+        schemas = schemas or {}
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+
+        def insert(name, result):
+            """ Creates sheet from table read by worker.
+            """
+            captions, rows = result.get()
+            sheet = spreadsheet.create_sheet(
+                    name, captions=captions, schema=schemas.get(name))
+            sheet.extend(rows)
+
+        pool = multiprocessing.Pool(processes)
+        try:
+            # Only a few tables are extracted ahead, so that not all
+            # document data is kept in memory.
+            pending = deque()
+            for (name, start, end), data in izip(
+                    tables, extract_tables(filename, tables)):
+                task = (root_start, root_end, data, default_value, query,
+                        schemas.get(name))
+                pending.append(
+                        (name, pool.apply_async(read_table, (task,))))
+                if len(pending) > processes:
+                    insert(*pending.popleft())
+            while pending:
+                insert(*pending.popleft())
+        except:
+            pool.terminate()
+            raise
+        else:
+            pool.close()
+        finally:
+            pool.join()
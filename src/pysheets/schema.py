@@ -0,0 +1,210 @@
+#!/usr/bin/python
+
+
+"""
+
+Typed column schema (:py:attr:`pysheets.sheet.Sheet.schema`).
+
+Schema is a dict of column caption and value type pairs. Supported
+types: :py:class:`int`, :py:class:`float`, :py:class:`decimal.Decimal`,
+:py:class:`datetime.date`, :py:class:`datetime.datetime`,
+:py:class:`bool` and :py:class:`unicode`. Readers read fields as text
+and convert them in chunks of records, column by column: if all
+values of column are strings, single :py:func:`map` call is tried
+first and values are checked one by one only if it fails (for example,
+column has empty fields, which are converted to ``None``).
+
+>>> sheet = Sheet(schema={u'Amount': decimal.Decimal, u'Paid': bool})
+
+"""
+
+
+import datetime
+import decimal
+import functools
+import re
+from itertools import chain, imap, islice, izip, izip_longest
+
+
+DATE_RE = re.compile(
+        r'(\d{4})-(\d\d)-(\d\d)(?:[T ]\d\d:\d\d(?::\d\d(?:\.\d+)?)?)?$')
+DATETIME_RE = re.compile(
+        r'(\d{4})-(\d\d)-(\d\d)(?:[T ](\d\d):(\d\d)(?::(\d\d)'
+        r'(?:\.(\d{1,6})\d*)?)?)?$')
+
+BOOL_VALUES = {
+        u'true': True,
+        u'yes': True,
+        u'1': True,
+        u'false': False,
+        u'no': False,
+        u'0': False,
+        }
+
+
+def parse_integer(value, value_type=int):
+    """ Parses integer of ``value_type`` (:py:class:`int` or
+    :py:class:`long`). Unlike :py:func:`int`, rejects numbers with
+    fractional part instead of truncating them.
+    """
+
+    result = value_type(value)
+    if result != value and not isinstance(value, basestring):
+        raise ValueError(u'Invalid integer: {0}.'.format(value))
+    return result
+
+
+def parse_date(value):
+    """ Parses ISO 8601 date (``YYYY-MM-DD``). Time part, if it is
+    present, is ignored.
+    """
+
+    match = DATE_RE.match(value)
+    if match is None:
+        raise ValueError(u'Invalid date: {0}.'.format(value))
+    return datetime.date(*[int(part) for part in match.groups()])
+
+
+def parse_datetime(value):
+    """ Parses ISO 8601 date and time (``YYYY-MM-DD HH:MM:SS`` or
+    ``YYYY-MM-DDTHH:MM:SS.ffffff``; seconds and time are optional).
+    """
+
+    match = DATETIME_RE.match(value)
+    if match is None:
+        raise ValueError(u'Invalid date and time: {0}.'.format(value))
+    year, month, day, hour, minute, second, fraction = match.groups()
+    return datetime.datetime(
+            int(year), int(month), int(day), int(hour or 0),
+            int(minute or 0), int(second or 0),
+            int((fraction or u'0').ljust(6, u'0')))
+
+
+def parse_bool(value):
+    """ Parses boolean value (``true``, ``yes``, ``1``, ``false``,
+    ``no`` or ``0``; case insensitive).
+    """
+
+    try:
+        return BOOL_VALUES[value.lower()]
+    except KeyError:
+        raise ValueError(u'Invalid boolean: {0}.'.format(value))
+
+
+PARSERS = {
+        int: parse_integer,
+        long: functools.partial(parse_integer, value_type=long),
+        float: float,
+        decimal.Decimal: decimal.Decimal,
+        datetime.date: parse_date,
+        datetime.datetime: parse_datetime,
+        bool: parse_bool,
+        unicode: None,
+        }
+"""Mapping from column type to function, which parses text field.
+``None`` means, that field is not converted."""
+
+TEXT_PARSERS = {
+        int: int,
+        long: long,
+        }
+"""Faster parsers, which are used instead of :py:data:`PARSERS`, if
+all values are strings (then they give the same results)."""
+
+TEXT_TYPES = frozenset([str, unicode])
+
+
+def get_parser(value_type):
+    """ Returns parser of fields of ``value_type`` (``None`` for
+    strings).
+    """
+
+    try:
+        return PARSERS[value_type]
+    except KeyError:
+        raise ValueError(u'Unsupported column type: {0}.'.format(
+            getattr(value_type, '__name__', value_type)))
+
+
+def convert_column(values, value_type, caption=None):
+    """ Returns list of ``values`` converted to ``value_type``. Empty
+    fields (``None`` and empty strings) are converted to ``None`` and
+    values, which already are of ``value_type``, are kept.
+
+    :raises ValueError: If value cannot be converted.
+    """
+
+    parse = get_parser(value_type)
+    if parse is None:
+        return values
+    if TEXT_TYPES.issuperset(imap(type, values)):
+        try:
+            return map(TEXT_PARSERS.get(value_type, parse), values)
+        except (TypeError, ValueError, AttributeError, ArithmeticError):
+            pass
+
+    result = []
+    for value in values:
+        if value is None or value == u'':
+            result.append(None)
+        elif isinstance(value, value_type) and (
+                value_type is not datetime.date or
+                not isinstance(value, datetime.datetime)):
+            result.append(value)
+        else:
+            try:
+                result.append(parse(value))
+            except (TypeError, ValueError, AttributeError, ArithmeticError):
+                raise ValueError((
+                    u'Value "{0}" of column "{1}" is not {2}.'
+                    ).format(value, caption, value_type.__name__))
+    return result
+
+
+def convert_chunk(chunk, columns, width):
+    """ Converts list of records column by column and returns iterator
+    through converted records (tuples).
+
+    :param columns: List of ``(position, caption, value_type)``
+        triples of converted columns.
+    """
+
+    fields = map(list, izip_longest(*chunk))
+    fields.extend([[None] * len(chunk) for i in xrange(width - len(fields))])
+    for position, caption, value_type in columns:
+        fields[position] = convert_column(
+                fields[position], value_type, caption)
+    return izip(*fields)
+
+
+def convert_records(records, captions, schema, chunk_size=1000):
+    """ Returns iterator through records (sequences of fields in the
+    same order as ``captions``) with fields converted to types declared
+    in ``schema``. Records are converted in chunks of ``chunk_size``
+    records, column by column.
+    """
+
+    columns = [
+            (position, caption, schema[caption])
+            for position, caption in enumerate(captions)
+            if get_parser(schema.get(caption, unicode)) is not None]
+    if not columns:
+        return iter(records)
+
+    records = iter(records)
+    chunks = iter(lambda: list(islice(records, chunk_size)), [])
+    return chain.from_iterable(
+            convert_chunk(chunk, columns, len(captions))
+            for chunk in chunks)
+
+
+def convert_dicts(records, captions, schema, chunk_size=1000):
+    """ Does the same as :py:func:`convert_records`, but for records
+    stored in dicts, which have keys ``captions``.
+    """
+
+    for fields in convert_records(
+            ([record[caption] for caption in captions]
+             for record in records),
+            captions, schema, chunk_size):
+        yield dict(izip(captions, fields))
@@ -11,12 +11,24 @@
 
 :py:class:`Column` is just a view object.
 
+If sheet is created with ``columnar=True``, then data is stored in
+:py:class:`ColumnStore` -- one container per column (homogeneous
+integer and float columns are kept in :py:mod:`array` arrays). In
+this case rows are just views (:py:class:`ColumnarRow`).
+
 >>> from pysheets.sheet import Sheet, Row, Column
 
 """
 
 
+import array
+import heapq
+from itertools import izip
+
 from pysheets.exceptions import IntegrityError
+from pysheets.grouping import GroupBy
+from pysheets.indexes import HashIndex, SortedIndex
+from pysheets.joining import join_sheets
 import pysheets.readers
 from pysheets.readers import SheetReader
 from pysheets.writers import SheetWriter
@@ -24,13 +36,27 @@ from pysheets.writers import SheetWriter
 
 class Row(object):
     """ Class representing sheet row.
+
+    Row has no ``__dict__``: it stores only references to sheet (which
+    holds captions shared by all rows) and to fields list (or tuple,
+    if sheet has immutable rows).
     """
 
+    __slots__ = ('sheet', 'fields')
+
     def __init__(self, sheet, fields):
 
         self.sheet = sheet
         self.fields = fields
 
+    def __getstate__(self):
+        # Classes with __slots__ cannot be pickled by protocols 0 and
+        # 1 without it.
+        return self.sheet, self.fields
+
+    def __setstate__(self, state):
+        self.sheet, self.fields = state
+
     def __getitem__(self, caption):
         return self.fields[self.sheet.captions_index[caption]]
 
@@ -53,6 +79,207 @@ class Row(object):
         return self.sheet.captions
 
 
+class ColumnarRow(Row):
+    """ Class representing row of sheet, which data is stored in
+    :py:class:`ColumnStore`.
+
+    .. note::
+        Columnar row is just a view. It doesn't contain any data, only
+        index of the row, so after deleting or sorting rows it points
+        to other data.
+
+    """
+
+    __slots__ = ('index',)
+
+    def __init__(self, sheet, index):
+        # Base class constructor is not called on purpose: there is
+        # no fields list.
+
+        self.sheet = sheet
+        self.index = index
+
+    def __getstate__(self):
+        return self.sheet, self.index
+
+    def __setstate__(self, state):
+        self.sheet, self.index = state
+
+    @property
+    def fields(self):
+        """ Returns copy of row fields.
+        """
+
+        return [column[self.index] for column in self.sheet.rows.columns]
+
+    def __getitem__(self, caption):
+        return self.sheet.rows.columns[
+                self.sheet.captions_index[caption]][self.index]
+
+    def __setitem__(self, caption, value):
+        self.sheet.rows.set_field(
+                self.index, self.sheet.captions_index[caption], value)
+
+    def __iter__(self):
+        index = self.index
+        for column in self.sheet.rows.columns:
+            yield column[index]
+
+    def append(self, field):
+        """ Columnar rows cannot be extended. Use
+        :py:meth:`Sheet.add_column` instead.
+        """
+
+        raise TypeError(u'Cannot append field to columnar row.')
+
+
+# Mapping from value type to :py:mod:`array` type code, which is used
+# for storing homogeneous columns.
+TYPE_CODES = {
+        int: 'l',
+        float: 'd',
+        }
+
+
+def create_column_container(values):
+    """ Returns container for column values: typed array if all values
+    are of the same type, which has entry in :py:data:`TYPE_CODES`,
+    list otherwise.
+    """
+
+    values = list(values)
+    if values:
+        value_type = type(values[0])
+        if value_type in TYPE_CODES and all(
+                type(value) is value_type for value in values):
+            return array.array(TYPE_CODES[value_type], values)
+    return values
+
+
+class ColumnStore(object):
+    """ Columnar storage of sheet rows. Behaves like list of
+    :py:class:`ColumnarRow`.
+
+    .. py:attribute:: columns
+
+        List of per column containers (:py:class:`array.array` or
+        :py:class:`list`).
+
+    """
+
+    def __init__(self, sheet, width=0):
+
+        self.sheet = sheet
+        self.columns = [[] for i in range(width)]
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        sheet = self.sheet
+        for i in xrange(self.length):
+            yield ColumnarRow(sheet, i)
+
+    def normalize_index(self, index):
+        """ Converts negative index to positive and checks bounds.
+        """
+
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError(u'Row index out of range.')
+        return index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [ColumnarRow(self.sheet, i)
+                    for i in xrange(*index.indices(self.length))]
+        else:
+            return ColumnarRow(self.sheet, self.normalize_index(index))
+
+    def __setitem__(self, index, row):
+        index = self.normalize_index(index)
+        for column_index, value in enumerate(row):
+            self.set_field(index, column_index, value)
+
+    def __delitem__(self, index):
+        if not isinstance(index, slice):
+            index = self.normalize_index(index)
+        for column in self.columns:
+            del column[index]
+        self.length = len(self.columns[0]) if self.columns else 0
+
+    def set_field(self, index, column_index, value):
+        """ Sets value of single field.
+        """
+
+        column = self.columns[column_index]
+        if (isinstance(column, array.array) and
+                TYPE_CODES.get(type(value)) != column.typecode):
+            # Column is not homogeneous anymore.
+            column = self.columns[column_index] = list(column)
+        column[index] = value
+
+    def append(self, row):
+        """ Appends row (iterable of fields) to the end of storage.
+        """
+
+        empty = not self.length
+        columns = self.columns
+        for column_index, value in enumerate(row):
+            column = columns[column_index]
+            if isinstance(column, array.array):
+                if TYPE_CODES.get(type(value)) != column.typecode:
+                    column = columns[column_index] = list(column)
+            elif empty and type(value) in TYPE_CODES:
+                column = columns[column_index] = array.array(
+                        TYPE_CODES[type(value)])
+            column.append(value)
+        self.length += 1
+
+    def add_column(self, values):
+        """ Appends column to the right side of storage.
+        """
+
+        self.columns.append(create_column_container(values))
+
+    def remove_column(self, index):
+        """ Removes column from storage.
+        """
+
+        del self.columns[index]
+
+    def permute(self, order):
+        """ Reorders rows: ``order`` is a list of old rows indexes.
+        """
+
+        for column_index, column in enumerate(self.columns):
+            if isinstance(column, array.array):
+                self.columns[column_index] = array.array(
+                        column.typecode, (column[i] for i in order))
+            else:
+                self.columns[column_index] = [column[i] for i in order]
+
+    def sort(self, cmp=None, key=None, reverse=False):
+        """ Sorts rows. Arguments have the same meaning as of
+        :py:meth:`list.sort`, ``cmp`` and ``key`` get
+        :py:class:`ColumnarRow` objects.
+        """
+
+        rows = list(self)
+        rows.sort(cmp=cmp, key=key, reverse=reverse)
+        self.permute([row.index for row in rows])
+
+    def sort_by_columns(self, indexes, reverse=False):
+        """ Sorts rows by values of columns with given indexes.
+        """
+
+        keys = zip(*[self.columns[i] for i in indexes])
+        self.permute(sorted(
+            xrange(self.length), key=keys.__getitem__, reverse=reverse))
+
+
 class Column(object):
     """ Class represinting single sheet column.
 
@@ -80,14 +307,24 @@ class Column(object):
         self.index = index
 
     def __iter__(self):
-        for row in self.sheet.rows:
-            yield row.fields[self.index]
+        if self.sheet.columnar:
+            return iter(self.sheet.rows.columns[self.index])
+        else:
+            return (row.fields[self.index] for row in self.sheet.rows)
 
     def __getitem__(self, index):
-        return self.sheet.rows[index].fields[self.index]
+        if self.sheet.columnar:
+            return self.sheet.rows.columns[self.index][index]
+        else:
+            return self.sheet.rows[index].fields[self.index]
 
     def __setitem__(self, index, value):
-        self.sheet.rows[index].fields[self.index] = value
+        if self.sheet.columnar:
+            self.sheet.rows.set_field(
+                    self.sheet.rows.normalize_index(index), self.index,
+                    value)
+        else:
+            self.sheet.rows[index].fields[self.index] = value
 
     @property
     def caption(self):
@@ -96,6 +333,16 @@ class Column(object):
 
         return self.sheet.captions[self.index]
 
+    def as_array(self, dtype=None, copy=True):
+        """ Returns column values as NumPy array. If ``dtype`` is
+        ``None``, then it is inferred from values.
+
+        For details look at :py:func:`pysheets.arrays.column_to_array`.
+        """
+
+        from pysheets.arrays import column_to_array
+        return column_to_array(self, dtype, copy)
+
 
 class Sheet(object):
     """ Class representing simple sheet.
@@ -109,11 +356,35 @@ class Sheet(object):
         >>> print u', '.join(sheet.captions)
         a, b
 
+    .. py:attribute:: columnar
+
+        ``True`` if sheet data is stored in :py:class:`ColumnStore`.
+
+    .. py:attribute:: immutable_rows
+
+        ``True`` if rows fields are stored in tuples, so they cannot
+        be modified in place (rows can be only replaced).
+
+    .. py:attribute:: indexes
+
+        Dict of column caption and index (:py:class:`hash
+        <pysheets.indexes.HashIndex>` or :py:class:`sorted
+        <pysheets.indexes.SortedIndex>`) of that column pairs.
+        (Created by :py:meth:`create_index`.)
+
+    .. py:attribute:: schema
+
+        Dict of column caption and value type pairs. Readers convert
+        read fields of these columns to declared types (look at
+        :py:mod:`pysheets.schema`). Columns, which are not mentioned,
+        are read as strings.
+
     """
 
     def __init__(
             self, file=None, reader_name=None, reader=None,
-            rows=None, captions=None, reader_args=None):
+            rows=None, captions=None, reader_args=None, columnar=False,
+            immutable_rows=False, schema=None):
         """ Creates sheet.
 
         #.  If ``rows`` is not ``None``, then sheet is created from
@@ -131,12 +402,24 @@ class Sheet(object):
         :type reader_name: None or unicode.
         :param reader: Callable to use for reading file.
         :type reader: None or callable.
+        :param columnar: If ``True``, then data is stored by columns.
+        :type columnar: bool
+        :param immutable_rows: If ``True``, then row fields are stored
+            in tuples. (Ignored for columnar sheet.)
+        :type immutable_rows: bool
+        :param schema: Dict of column caption and value type pairs
+            (:py:attr:`schema`).
+        :type schema: dict
 
         """
 
         self.captions = []
         self.captions_index = {}        # Caption to field index mapping.
-        self.rows = []
+        self.columnar = columnar
+        self.immutable_rows = immutable_rows and not columnar
+        self.rows = ColumnStore(self) if columnar else []
+        self.indexes = {}
+        self.schema = dict(schema or {})
         self.insert_validators = []
         self.delete_validators = []
         self.replace_validators = []
@@ -176,44 +459,108 @@ class Sheet(object):
 
     def __setitem__(self, index, row):
 
+        if isinstance(index, slice):
+            # Rows are replaced one by one, so that validators and
+            # indexes get single rows.
+            positions = xrange(*index.indices(len(self.rows)))
+            rows = list(row)
+            if len(rows) != len(positions):
+                raise ValueError((
+                    u'Rows number mismatch. Expected {0}. Is {1}.'
+                    ).format(len(positions), len(rows)))
+            for position, row in zip(positions, rows):
+                self[position] = row
+            return
+
         replaced_row = self.rows[index]
         for validator in self.replace_validators:
             row = validator(self, row, replaced_row)
         if self.name:
             row = self.spreadsheet.validate_row_replacement(
                     self, row, replaced_row)
-        self.rows[index] = Row(
-                self, [row[caption] for caption in self.captions])
+        # Replaced row could be a view, so old values are taken before
+        # replacement.
+        old_values = [
+                (value_index, replaced_row[caption])
+                for caption, value_index in self.indexes.items()]
+        self.rows[index] = self.create_row(
+                [row[caption] for caption in self.captions])
+
+        position = index % len(self.rows)
+        for value_index, old_value in old_values:
+            value_index.replace(
+                    position, old_value, row[value_index.caption])
 
     def __delitem__(self, index):
 
+        if isinstance(index, slice):
+            for row in self.rows[index]:
+                for validator in self.delete_validators:
+                    validator(self, row)
+                if self.name:
+                    self.spreadsheet.validate_row_deletion(self, row)
+            del self.rows[index]
+            # Positions of following rows are shifted.
+            for value_index in self.indexes.values():
+                value_index.invalidate()
+            return
+
         row = self.rows[index]
         for validator in self.delete_validators:
             validator(self, row)
         if self.name:
             row = self.spreadsheet.validate_row_deletion(self, row)
+        position = index % len(self.rows)
+        old_values = [
+                (value_index, self.rows[position][caption])
+                for caption, value_index in self.indexes.items()]
         del self.rows[index]
 
+        last = position == len(self.rows)
+        for value_index, old_value in old_values:
+            value_index.delete(position, old_value, last)
+
     def read(
             self, file, create_columns=False, reader_name=None,
-            reader=None, reader_args=None, reader_constructor_args=None):
+            reader=None, reader_args=None, reader_constructor_args=None,
+            stream=False, query=None):
         """ Reads data from file into sheet.
 
         :param file: File from which to read data.
         :type file: unicode or file like object.
-        :param reader_name: Name of the reader to use.
+        :param reader_name: Name of the reader to use. If neither it,
+            nor ``reader`` is given, then reader is guessed from file
+            name extension, or, if ``file`` is file like object, from
+            its content.
         :type reader_name: None or unicode.
         :param reader: Callable to use for reading file.
         :type reader: None or callable.
+        :param stream: If ``True``, then rows are not appended to
+            sheet, instead iterator through validated rows is
+            returned. Reader must have ``iterate`` method.
+        :type stream: bool
+        :param query: :py:class:`pysheets.query.Query`, which is passed
+            to reader, so that only selected columns and matching rows
+            are read.
         """
 
         if reader is None:
             if reader_name:
                 reader = SheetReader.plugins[reader_name](
                         **(reader_constructor_args or {}))
-            else:
+            elif isinstance(file, basestring):
                 reader = SheetReader.plugins.get_by_file(file)(
                         **(reader_constructor_args or {}))
+            else:
+                reader_class, file, options = (
+                        SheetReader.plugins.get_by_content(file))
+                reader = reader_class(**(reader_constructor_args or {}))
+                reader_args = dict(options, **(reader_args or {}))
+        if query is not None:
+            reader_args = dict(reader_args or {}, query=query)
+        if stream:
+            return reader.iterate(
+                    self, file, create_columns, **(reader_args or {}))
         reader(self, file, create_columns, **(reader_args or {}))
 
     def write(
@@ -243,8 +590,14 @@ class Sheet(object):
         self.captions_index[caption] = len(self.captions)
         self.captions.append(caption)
 
-        for row, value in zip(self.rows, values):
-            row.append(value)
+        if self.columnar:
+            self.rows.add_column(values)
+        elif self.immutable_rows:
+            for row, value in zip(self.rows, values):
+                row.fields += (value,)
+        else:
+            for row, value in zip(self.rows, values):
+                row.append(value)
 
     def add_columns(self, captions):
         """ Appends columns to the right side of sheet.
@@ -259,6 +612,16 @@ class Sheet(object):
         :type row: dict-like
         """
 
+        self.rows.append(self.validate_row(row))
+        self.index_rows(len(self.rows) - 1)
+
+    def validate_row(self, row):
+        """ Runs insert validators on row and returns validated
+        :py:class:`Row`. Returned row is not appended to sheet.
+
+        :type row: dict-like
+        """
+
         if not self.captions:
             raise IntegrityError(
                     u'Adding data to sheet with zero columns.')
@@ -269,8 +632,41 @@ class Sheet(object):
             # If sheet is assigned to spreadsheet.
             row = self.spreadsheet.validate_row_insertion(self, row)
 
-        self.rows.append(
-                Row(self, [row[caption] for caption in self.captions]))
+        return self.create_row([row[caption] for caption in self.captions])
+
+    def validate_rows(self, rows):
+        """ Runs insert validators on list of rows and returns list of
+        validated :py:class:`rows <Row>`. Returned rows are not
+        appended to sheet.
+
+        Validator, which has attribute ``batch``, is called once for
+        all rows: ``validator.batch(sheet, rows)`` have to return list
+        of validated rows. Other validators are called for each row.
+
+        .. note::
+            Each validator processes all rows before the next validator
+            is called.
+
+        :type rows: list of dict-like
+        """
+
+        if not self.captions:
+            raise IntegrityError(
+                    u'Adding data to sheet with zero columns.')
+
+        for validator in self.insert_validators:
+            batch = getattr(validator, 'batch', None)
+            if batch is None:
+                rows = [validator(self, row) for row in rows]
+            else:
+                rows = batch(self, rows)
+        if self.name:
+            # If sheet is assigned to spreadsheet.
+            rows = self.spreadsheet.validate_rows_insertion(self, rows)
+
+        captions = self.captions
+        return [self.create_row([row[caption] for caption in captions])
+                for row in rows]
 
     def append_iterable(self, row):
         """ Appends row to the end of sheet.
@@ -282,19 +678,35 @@ class Sheet(object):
             raise IntegrityError(
                     u'Adding data to sheet with zero columns.')
 
+        fields = self.check_fields(row)
+        if self.insert_validators or self.name:
+            # There are some validators. Converting to dict.
+            self.append_dict(dict(zip(self.captions, fields)))
+        else:
+            # There is no validators. Just appending row.
+            self.rows.append(self.create_row(fields))
+            self.index_rows(len(self.rows) - 1)
+
+    def create_row(self, fields):
+        """ Creates :py:class:`Row` of this sheet from list of fields.
+        """
+
+        if self.immutable_rows:
+            return Row(self, tuple(fields))
+        else:
+            return Row(self, fields)
+
+    def check_fields(self, row):
+        """ Converts iterable row to list of fields and checks if their
+        amount matches the amount of columns.
+        """
+
         fields = list(row)
         if len(fields) != len(self.captions):
             raise ValueError((
                 u'Columns number mismatch. Expected {0}. Is {1}.'
                 ).format(len(self.captions), len(fields)))
-        elif self.insert_validators or self.name:
-            # There are some validators. Converting to dict.
-            self.append_dict(dict([
-                (caption, value)
-                for caption, value in zip(self.captions, row)]))
-        else:
-            # There is no validators. Just appending row.
-            self.rows.append(Row(self, fields))
+        return fields
 
     def append(self, row):
         """ Appends row to the end of sheet.
@@ -313,14 +725,72 @@ class Sheet(object):
             raise IntegrityError(
                     u'Adding data to sheet with zero columns.')
 
+        if self.is_dict_like(row):
+            self.append_dict(row)
+        else:
+            self.append_iterable(row)
+
+    def is_dict_like(self, row):
+        """ Checks if row is dict-like object (not just an iterable).
+        (Look at :py:meth:`append`.)
+        """
+
+        if isinstance(row, (list, tuple)):
+            return False
         try:
             row[self.captions[0]]
         except TypeError:
-            self.append_iterable(row)
-            return
+            return False
         except KeyError:
             pass
-        self.append_dict(row)
+        return True
+
+    def extend(self, rows, chunk_size=1000):
+        """ Appends rows to the end of sheet. Each row is treated in
+        the same way as in :py:meth:`append`.
+
+        If sheet has no validators, then rows are appended directly,
+        without converting them to dicts. Otherwise rows are validated
+        by :py:meth:`validate_rows` in chunks of ``chunk_size`` rows.
+
+        .. note::
+            If validation fails, then rows of the failed chunk are not
+            appended. Rows of previous chunks stay appended (and are
+            indexed).
+
+        """
+
+        if not self.captions:
+            raise IntegrityError(
+                    u'Adding data to sheet with zero columns.')
+
+        start = len(self.rows)
+        captions = self.captions
+        append = self.rows.append
+        try:
+            if self.insert_validators or self.name:
+                chunk = []
+                for row in rows:
+                    if not self.is_dict_like(row):
+                        row = dict(zip(captions, self.check_fields(row)))
+                    chunk.append(row)
+                    if len(chunk) >= chunk_size:
+                        for validated_row in self.validate_rows(chunk):
+                            append(validated_row)
+                        chunk = []
+                if chunk:
+                    for validated_row in self.validate_rows(chunk):
+                        append(validated_row)
+            else:
+                for row in rows:
+                    if self.is_dict_like(row):
+                        fields = [row[caption] for caption in captions]
+                    else:
+                        fields = self.check_fields(row)
+                    append(self.create_row(fields))
+        finally:
+            # Rows appended before failure are indexed too.
+            self.index_rows(start)
 
     @property
     def columns(self):
@@ -352,25 +822,84 @@ class Sheet(object):
 
         if len(captions) == 1:
             return Column(self, self.captions_index[captions[0]])
+        elif self.columnar:
+            return (list(fields) for fields in izip(*[
+                self.rows.columns[self.captions_index[caption]]
+                for caption in captions]))
         else:
             return ([row[caption] for caption in captions]
                     for row in self.rows)
 
+    def to_arrays(self, captions=None, dtypes=None):
+        """ Returns dict of column caption and NumPy array with column
+        values pairs.
+
+        :param captions: Captions of columns to convert. ``None`` means
+            all.
+        :param dtypes: Dict of column caption and dtype pairs. Dtypes
+            of not mentioned columns are inferred.
+        """
+
+        dtypes = dtypes or {}
+        return dict([
+            (caption, self.get(caption).as_array(dtypes.get(caption)))
+            for caption in (self.captions if captions is None else captions)
+            ])
+
+    @classmethod
+    def from_arrays(cls, arrays, captions=None, columnar=False):
+        """ Creates sheet from NumPy arrays (or other sequences) of the
+        same length. Validators are not run.
+
+        :param arrays: Dict of column caption and array pairs.
+        :param captions: Order of columns. ``None`` means
+            ``arrays.keys()``.
+        """
+
+        import numpy
+        from pysheets.arrays import array_to_container
+
+        if captions is None:
+            captions = arrays.keys()
+        columns = [numpy.asarray(arrays[caption]) for caption in captions]
+        lengths = set(len(column) for column in columns)
+        if len(lengths) > 1:
+            raise ValueError(u'Arrays lengths mismatch.')
+
+        sheet = cls(captions=captions, columnar=columnar)
+        if columnar:
+            sheet.rows.columns = [
+                    array_to_container(column) for column in columns]
+            sheet.rows.length = lengths.pop() if lengths else 0
+        else:
+            sheet.rows = [
+                    sheet.create_row(list(fields)) for fields in izip(
+                        *[column.tolist() for column in columns])]
+        return sheet
+
     def remove(self, caption):
         """ Removes column from sheet.
         """
 
+        self.indexes.pop(caption, None)
         if len(self.captions) == 1:
             # Deleting last column, so just delete all rows.
-            self.rows = []
+            self.rows = ColumnStore(self) if self.columnar else []
             self.captions = []
             self.captions_index = {}
+            self.indexes = {}
         else:
             index = self.captions_index[caption]
             del self.captions[index]
 
-            for row in self.rows:
-                del row.fields[index]
+            if self.columnar:
+                self.rows.remove_column(index)
+            elif self.immutable_rows:
+                for row in self.rows:
+                    row.fields = row.fields[:index] + row.fields[index + 1:]
+            else:
+                for row in self.rows:
+                    del row.fields[index]
 
             # Regenerate caption index.
             self.captions_index = dict([
@@ -385,6 +914,47 @@ class Sheet(object):
             if func(row):
                 yield row
 
+    def query(self, query):
+        """ Returns new sheet with columns and rows of this sheet,
+        selected by :py:class:`pysheets.query.Query`.
+        """
+
+        if self.columnar:
+            fields = izip(*self.rows.columns)
+        else:
+            fields = (row.fields for row in self.rows)
+        return Sheet(
+                captions=query.get_captions(self.captions),
+                rows=query.execute(fields, self.captions),
+                columnar=self.columnar,
+                immutable_rows=self.immutable_rows)
+
+    def group_by(self, *captions):
+        """ Returns :py:class:`pysheets.grouping.GroupBy` -- rows
+        grouped by values of columns with given captions.
+
+        >>> totals = sheet.group_by(u'Customer').aggregate(
+        ...         (u'Total', u'sum', u'Amount'))
+        """
+
+        for caption in captions:
+            if caption not in self.captions_index:
+                raise ValueError(u'No column "{0}".'.format(caption))
+        return GroupBy(self, captions)
+
+    def join(self, other, on, how=u'inner', suffixes=None):
+        """ Returns new sheet, which is relational join of this (left)
+        and ``other`` (right) sheets on key columns ``on``. If
+        ``other`` has hash index (:py:meth:`create_index`) of the key
+        column, then it is reused.
+
+        For details look at :py:func:`pysheets.joining.join_sheets`.
+
+        >>> orders.join(customers, on=u'Customer', how=u'left')
+        """
+
+        return join_sheets(self, other, on, how, suffixes)
+
     def sort(self, columns=None, cmp=None, key=None, **kwargs):
         """ Sorts rows of the sheet.
 
@@ -396,8 +966,18 @@ class Sheet(object):
 
         """
 
+        for value_index in self.indexes.values():
+            value_index.invalidate()
+
         if cmp or key:
             self.rows.sort(cmp=cmp, key=key, **kwargs)
+        elif self.columnar:
+            if columns is None:
+                indexes = range(len(self.captions))
+            else:
+                indexes = [self.captions_index[caption]
+                           for caption in columns]
+            self.rows.sort_by_columns(indexes, **kwargs)
         elif columns is None:
             self.rows.sort(key=lambda x: x.fields)
         else:
@@ -408,6 +988,132 @@ class Sheet(object):
                         for caption in columns]
             self.rows.sort(key=field_key, **kwargs)
 
+    def create_index(self, caption, ordered=False):
+        """ Creates index of column with given caption, which is used by
+        :py:meth:`lookup`. If ``ordered`` is ``True``, then
+        :py:class:`sorted index <pysheets.indexes.SortedIndex>` is
+        created, which is also used by :py:meth:`range` and
+        :py:meth:`top`, otherwise -- :py:class:`hash index
+        <pysheets.indexes.HashIndex>`.
+
+        Index is kept consistent, when rows are added, replaced,
+        deleted or sorted by sheet methods.
+
+        .. note::
+            Modifying fields in place (through :py:class:`Row` or
+            :py:class:`Column`) is not tracked, so after that
+            :py:meth:`reindex` have to be called.
+
+        :returns: Created index.
+        """
+
+        value_index = (SortedIndex if ordered else HashIndex)(self, caption)
+        value_index.build()
+        self.indexes[caption] = value_index
+        return value_index
+
+    def drop_index(self, caption):
+        """ Removes index of column with given caption.
+        """
+
+        del self.indexes[caption]
+
+    def reindex(self):
+        """ Rebuilds all indexes.
+        """
+
+        for value_index in self.indexes.values():
+            value_index.build()
+
+    def index_rows(self, start):
+        """ Adds rows from ``start`` position to the end of sheet to
+        indexes.
+        """
+
+        if self.indexes:
+            indexes = self.indexes.items()
+            for position in xrange(start, len(self.rows)):
+                row = self.rows[position]
+                for caption, value_index in indexes:
+                    value_index.insert(position, row[caption])
+
+    def lookup(self, caption, value):
+        """ Returns list of rows, which field in column ``caption`` is
+        equal to ``value``.
+
+        If column has index, then it is used, otherwise all rows are
+        scanned.
+        """
+
+        try:
+            value_index = self.indexes[caption]
+        except KeyError:
+            return list(self.filter(lambda row: row[caption] == value))
+        else:
+            return [self.rows[position]
+                    for position in value_index.lookup(value)]
+
+    def get_sorted_index(self, caption):
+        """ Returns sorted index of column, or ``None`` if column has no
+        such index.
+        """
+
+        value_index = self.indexes.get(caption)
+        if isinstance(value_index, SortedIndex):
+            return value_index
+        else:
+            return None
+
+    def range(self, caption, low=None, high=None, include_high=True):
+        """ Returns list of rows, which field in column ``caption`` is
+        between ``low`` (inclusive) and ``high``, ordered by that field.
+        ``None`` means that range is not bounded from that side.
+
+        If column has sorted index, then it is used, otherwise all
+        rows are scanned.
+        """
+
+        value_index = self.get_sorted_index(caption)
+        if value_index is not None:
+            return [self.rows[position] for position in value_index.range(
+                low, high, include_high)]
+
+        def in_range(row):
+            """ Checks if row field is in range.
+            """
+            value = row[caption]
+            if low is not None and value < low:
+                return False
+            if high is not None and (
+                    value > high or (not include_high and value == high)):
+                return False
+            return True
+        return sorted(
+                self.filter(in_range), key=lambda row: row[caption])
+
+    def top(self, caption, count, largest=False):
+        """ Returns list of ``count`` rows with the smallest (or the
+        largest, if ``largest`` is ``True``) fields in column
+        ``caption``.
+
+        If column has sorted index, then it is used, otherwise all
+        rows are scanned.
+        """
+
+        value_index = self.get_sorted_index(caption)
+        if value_index is not None:
+            if largest:
+                positions = value_index.last(count)
+            else:
+                positions = value_index.first(count)
+            return [self.rows[position] for position in positions]
+        elif largest:
+            return heapq.nlargest(
+                    count, self.rows, key=lambda row: row[caption])
+        else:
+            return heapq.nsmallest(
+                    count, self.rows, key=lambda row: row[caption])
+
     def add_insert_validator(self, validator):
         """ Adds validator to insert validators queue.
         """
@@ -0,0 +1,165 @@
+#!/usr/bin/python
+
+
+"""
+
+Detection of file type from its content. Used for selecting reader,
+when file like object (which has no name) is given.
+
+Only a small prefix of the stream is read: seekable streams are
+rewound, other streams are wrapped in :py:class:`PeekedFile`, which
+returns the prefix again before the rest of the stream. Zip packages
+(for example, ODF documents) cannot be read sequentially, so not
+seekable zip stream is copied to temporary file (:py:func:`spool`).
+
+"""
+
+
+import csv
+import shutil
+import struct
+import tempfile
+
+
+PEEK_SIZE = 4096
+"""Amount of bytes, which are read for detecting file type."""
+
+SPOOL_SIZE = 1 << 24
+"""Size of not seekable stream, which is kept in memory by
+:py:func:`spool`. Larger streams are written to disk."""
+
+ZIP_MAGIC = 'PK\x03\x04'
+ZIP_HEADER = struct.Struct('<4sHHHHHIIIHH')
+
+CSV_DELIMITERS = ';,\t|'
+
+
+class PeekedFile(object):
+    """ Read only file like object, which returns peeked ``prefix``
+    and then the rest of ``file``.
+    """
+
+    def __init__(self, prefix, file):
+
+        self.prefix = prefix
+        self.file = file
+
+    def read(self, size=-1):
+        """ Reads at most ``size`` bytes (all, if ``size`` is negative).
+        """
+
+        if size < 0:
+            data = self.prefix + self.file.read()
+            self.prefix = ''
+            return data
+        data = self.prefix[:size]
+        self.prefix = self.prefix[size:]
+        if len(data) < size:
+            data += self.file.read(size - len(data))
+        return data
+
+    def readline(self):
+        """ Reads one line.
+        """
+
+        if not self.prefix:
+            return self.file.readline()
+        end = self.prefix.find('\n') + 1
+        if end:
+            line = self.prefix[:end]
+            self.prefix = self.prefix[end:]
+        else:
+            line = self.prefix + self.file.readline()
+            self.prefix = ''
+        return line
+
+    def __iter__(self):
+        return iter(self.readline, '')
+
+
+def peek(file, size=PEEK_SIZE):
+    """ Returns tuple ``(prefix, file)``, where ``prefix`` is the first
+    ``size`` bytes of stream and ``file`` is stream, which should be
+    used for reading instead of given one (it is the same stream, if
+    it is seekable).
+    """
+
+    try:
+        position = file.tell()
+    except (AttributeError, IOError):
+        position = None
+    prefix = file.read(size)
+    if position is not None:
+        try:
+            file.seek(position)
+            return prefix, file
+        except (AttributeError, IOError):
+            pass
+    return prefix, PeekedFile(prefix, file)
+
+
+def spool(file):
+    """ Copies the rest of ``file`` into
+    :py:class:`tempfile.SpooledTemporaryFile` and returns it rewound.
+    """
+
+    spooled = tempfile.SpooledTemporaryFile(SPOOL_SIZE)
+    shutil.copyfileobj(file, spooled)
+    spooled.seek(0)
+    return spooled
+
+
+def sniff_zip(prefix):
+    """ Returns mime type of zip package from its ``mimetype`` entry
+    (used by Open Document Format), or ``'application/zip'`` if the
+    first entry is not stored ``mimetype`` file.
+    """
+
+    if len(prefix) < ZIP_HEADER.size:
+        return 'application/zip'
+    (signature, version, flags, compression, time, date, crc32,
+     compressed_size, size, name_length, extra_length) = ZIP_HEADER.unpack(
+             prefix[:ZIP_HEADER.size])
+    start = ZIP_HEADER.size + name_length + extra_length
+    if (prefix[ZIP_HEADER.size:ZIP_HEADER.size + name_length] !=
+            'mimetype' or compression != 0):
+        return 'application/zip'
+    return prefix[start:start + compressed_size] or 'application/zip'
+
+
+def sniff_csv(prefix):
+    """ Returns dict with ``delimiter`` and ``quotechar`` of CSV file,
+    or ``None`` if ``prefix`` does not look like CSV.
+    """
+
+    if '\x00' in prefix:
+        return None
+    # Incomplete last line confuses sniffer.
+    end = prefix.rfind('\n') + 1
+    sample = prefix[:end] if end else prefix
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=CSV_DELIMITERS)
+    except csv.Error:
+        # For example, single column file. Treat any UTF-8 text as CSV
+        # with default options.
+        try:
+            sample.decode('utf-8')
+        except UnicodeDecodeError:
+            return None
+        return {}
+    return {'delimiter': dialect.delimiter, 'quotechar': dialect.quotechar}
+
+
+def sniff(prefix):
+    """ Returns tuple ``(mime_type, options)``, where ``options`` is a
+    dict of reader arguments detected together with type (for example,
+    CSV delimiter). ``mime_type`` is ``None``, if type is not
+    recognized.
+    """
+
+    if prefix.startswith(ZIP_MAGIC):
+        return sniff_zip(prefix), {}
+    options = sniff_csv(prefix)
+    if options is not None:
+        return 'text/csv', options
+    return None, {}
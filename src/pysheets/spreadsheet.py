@@ -8,11 +8,37 @@
 
 
 from pysheets.exceptions import IntegrityError
+from pysheets.joining import create_getter, iterate_fields
 from pysheets.sheet import Sheet
 from pysheets.readers import SpreadSheetReader
 from pysheets.writers import SpreadSheetWriter
 
 
+class JoinedSheet(object):
+    """ Read only view of all spreadsheet sheets concatenated into one
+    (:py:meth:`SpreadSheet.join` with ``lazy=True``). Rows are lists
+    of fields, which are created when iterating.
+
+    .. note::
+        View reflects changes of spreadsheet sheets, but not of the
+        list of sheets (it is fixed, when view is created).
+
+    """
+
+    def __init__(self, spreadsheet, captions, caption):
+
+        self.spreadsheet = spreadsheet
+        self.sheet_captions = captions
+        self.captions = captions + [caption]
+        self.names = list(spreadsheet.names)
+
+    def __len__(self):
+        return sum(len(self.spreadsheet[name]) for name in self.names)
+
+    def __iter__(self):
+        return self.spreadsheet.join_rows(self.sheet_captions, self.names)
+
+
 class SpreadSheet(object):
     """ Class representing a dict of sheets.
 
@@ -101,7 +127,10 @@ class SpreadSheet(object):
 
         :param file: File from which to read data.
         :type file: unicode or file like object.
-        :param reader_name: Name of the reader to use.
+        :param reader_name: Name of the reader to use. If neither it,
+            nor ``reader`` is given, then reader is guessed from file
+            name extension, or, if ``file`` is file like object, from
+            its content.
         :type reader_name: None or unicode.
         :param reader: Callable to use for reading file.
         :type reader: None or callable.
@@ -110,8 +139,13 @@ class SpreadSheet(object):
         if reader is None:
             if reader_name:
                 reader = SpreadSheetReader.plugins[reader_name]()
-            else:
+            elif isinstance(file, basestring):
                 reader = SpreadSheetReader.plugins.get_by_file(file)()
+            else:
+                reader_class, file, options = (
+                        SpreadSheetReader.plugins.get_by_content(file))
+                reader = reader_class()
+                reader_args = dict(options, **(reader_args or {}))
         reader(self, file, **(reader_args or {}))
 
     def write(
@@ -230,6 +264,22 @@ class SpreadSheet(object):
             row = validator(self, sheet, row)
         return row
 
+    def validate_rows_insertion(self, sheet, rows):
+        """ Executes ``insert_row`` validators on list of rows.
+
+        Validator, which has attribute ``batch``, is called once for
+        all rows: ``validator.batch(spreadsheet, sheet, rows)`` have to
+        return list of validated rows.
+        """
+
+        for validator in self.validators['insert_row']:
+            batch = getattr(validator, 'batch', None)
+            if batch is None:
+                rows = [validator(self, sheet, row) for row in rows]
+            else:
+                rows = batch(self, sheet, rows)
+        return rows
+
     def validate_row_deletion(self, sheet, row):
         """ Executes ``delete_row`` validators.
         """
@@ -277,24 +327,54 @@ class SpreadSheet(object):
                         key, captions=sheet.captions)
             sheets[key].append_iterable(row)
 
-    def join(self, caption):
-        """ Joins all sheets into one. Sheets names are stored in
-        column with given ``caption``.
+    def join_rows(self, captions, names):
+        """ Generates rows (lists of fields) of sheets with given
+        ``names`` (in that order), which fields are ordered by
+        ``captions``, followed by sheet name.
+
+        Positions of columns are mapped once per sheet.
+        """
+
+        for name in names:
+            sheet = self.sheets[name]
+            try:
+                positions = [
+                        sheet.captions_index[caption] for caption in captions]
+            except KeyError as e:
+                raise ValueError(
+                        u'Sheet "{0}" has no column "{1}".'.format(
+                            name, e.args[0]))
+            tail = [name]
+            if positions == range(len(sheet.captions)):
+                for fields in iterate_fields(sheet):
+                    yield list(fields) + tail
+            else:
+                get = create_getter(positions)
+                for fields in iterate_fields(sheet):
+                    yield list(get(fields)) + tail
+
+    def join(self, caption, lazy=False):
+        """ Joins all sheets into one (in the order of
+        :py:attr:`names`). Sheets names are stored in column with given
+        ``caption``.
+
+        :param lazy: If ``True``, then instead of copying rows into
+            new sheet, :py:class:`JoinedSheet` view is returned.
 
         .. warning::
-            An assumption is made, that all sheets have the same columns.
+            An assumption is made, that all sheets have the same columns
+            (their order can differ; the order of the first sheet is
+            used).
         """
 
         if not self.names:
             # No sheets in spreadsheet, return empty sheet.
-            return Sheet(captions=[caption])
-
-        assigned_sheet = self.sheets[self.names[0]]
-        sheet = Sheet(captions=assigned_sheet.captions + [caption])
-
-        for assigned_sheet in self.sheets.values():
-            for row in assigned_sheet.row_dicts:
-                row[caption] = assigned_sheet.name
-                sheet.append_dict(row)
+            captions = []
+        else:
+            captions = list(self.sheets[self.names[0]].captions)
 
+        if lazy:
+            return JoinedSheet(self, captions, caption)
+        sheet = Sheet(captions=captions + [caption])
+        sheet.extend(self.join_rows(captions, self.names))
         return sheet
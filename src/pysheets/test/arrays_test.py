@@ -0,0 +1,94 @@
+#!/usr/bin/python
+
+
+import unittest
+import array
+
+import numpy
+
+from pysheets.sheet import Sheet
+
+
+class ArraysTest(unittest.TestCase):
+    """ Tests for :py:mod:`pysheets.arrays`.
+    """
+
+    def create_sheet(self, columnar):
+
+        return Sheet(
+                captions=[u'Number', u'Half', u'Text', u'Mixed'],
+                rows=[(i, i / 2.0, unicode(i), i if i % 2 else u'x')
+                      for i in range(4)],
+                columnar=columnar)
+
+    def check_to_arrays(self, columnar):
+
+        sheet = self.create_sheet(columnar)
+        arrays = sheet.to_arrays()
+        self.assertEqual(
+                sorted(arrays.keys()),
+                [u'Half', u'Mixed', u'Number', u'Text'])
+        self.assertEqual(arrays[u'Number'].dtype, numpy.dtype(int))
+        self.assertEqual(arrays[u'Number'].sum(), 6)
+        self.assertEqual(arrays[u'Half'].dtype, numpy.dtype(float))
+        self.assertEqual(list(arrays[u'Half']), [0.0, 0.5, 1.0, 1.5])
+        self.assertEqual(arrays[u'Text'].dtype.kind, 'U')
+        self.assertEqual(arrays[u'Mixed'].dtype, numpy.dtype(object))
+        self.assertEqual(list(arrays[u'Mixed']), [u'x', 1, u'x', 3])
+
+        arrays = sheet.to_arrays(
+                captions=[u'Number'], dtypes={u'Number': float})
+        self.assertEqual(arrays.keys(), [u'Number'])
+        self.assertEqual(arrays[u'Number'].dtype, numpy.dtype(float))
+
+    def test_01(self):
+        self.check_to_arrays(False)
+
+    def test_02(self):
+        self.check_to_arrays(True)
+
+    def test_03(self):
+        """ Zero copy path.
+        """
+
+        sheet = self.create_sheet(True)
+        column = sheet.get(u'Half')
+        shared = column.as_array(copy=False)
+        copied = column.as_array()
+        column[0] = 7.0
+        self.assertEqual(shared[0], 7.0)
+        self.assertEqual(copied[0], 0.0)
+
+    def check_from_arrays(self, columnar):
+
+        sheet = Sheet.from_arrays(
+                {
+                    u'a': numpy.arange(3),
+                    u'b': numpy.array([0.5, 1.5, 2.5]),
+                    u'c': [u'x', u'y', u'z'],
+                    },
+                captions=[u'c', u'a', u'b'],
+                columnar=columnar)
+        self.assertEqual(sheet.captions, [u'c', u'a', u'b'])
+        self.assertEqual(len(sheet), 3)
+        self.assertEqual(
+                [list(row) for row in sheet],
+                [[u'x', 0, 0.5], [u'y', 1, 1.5], [u'z', 2, 2.5]])
+        self.assertIs(type(sheet[0][u'a']), int)
+        self.assertIs(type(sheet[0][u'c']), unicode)
+        sheet.append([u'w', 3, 3.5])
+        self.assertEqual(list(sheet.get(u'a')), [0, 1, 2, 3])
+        return sheet
+
+    def test_04(self):
+        self.check_from_arrays(False)
+
+    def test_05(self):
+        sheet = self.check_from_arrays(True)
+        self.assertTrue(isinstance(sheet.rows.columns[1], array.array))
+        self.assertTrue(isinstance(sheet.rows.columns[2], array.array))
+
+    def test_06(self):
+        self.assertRaises(
+                ValueError, Sheet.from_arrays,
+                {u'a': numpy.arange(3), u'b': numpy.arange(2)})
@@ -0,0 +1,135 @@
+#!/usr/bin/python
+
+
+import unittest
+
+from pysheets.sheet import Sheet
+
+
+class GroupByTest(unittest.TestCase):
+    """ Tests for :py:class:`pysheets.grouping.GroupBy`.
+    """
+
+    def setUp(self):
+
+        self.captions = [u'Customer', u'Country', u'Amount', u'Price']
+        self.rows = [
+                (u'a', u'LT', 3, 1.5),
+                (u'b', u'LV', 5, 2.0),
+                (u'a', u'LT', 1, 0.5),
+                (u'c', u'LT', 7, 3.0),
+                (u'a', u'LV', 2, 1.0),
+                (u'b', u'LV', 4, 4.0),
+                ]
+
+    def check(self, columnar):
+
+        sheet = Sheet(
+                captions=self.captions, rows=self.rows, columnar=columnar)
+        result = sheet.group_by(u'Customer').aggregate(
+                (u'Total', u'sum', u'Amount'),
+                (u'Orders', u'count', None),
+                (u'Min', u'min', u'Price'),
+                (u'Max', u'max', u'Amount'),
+                (u'Mean', u'mean', u'Amount'),
+                (u'First', u'first', u'Price'),
+                (u'Last', u'last', u'Country'),
+                (u'Countries', lambda values: len(set(values)), u'Country'),
+                )
+        self.assertEqual(result.columnar, columnar)
+        self.assertEqual(
+                result.captions,
+                [u'Customer', u'Total', u'Orders', u'Min', u'Max', u'Mean',
+                 u'First', u'Last', u'Countries'])
+        self.assertEqual(
+                [list(row) for row in result],
+                [
+                    [u'a', 6, 3, 0.5, 3, 2.0, 1.5, u'LV', 2],
+                    [u'b', 9, 2, 2.0, 5, 4.5, 2.0, u'LV', 1],
+                    [u'c', 7, 1, 3.0, 7, 7.0, 3.0, u'LT', 1],
+                    ])
+        self.assertTrue(all(
+            isinstance(row[u'Total'], (int, long)) for row in result))
+
+        result = sheet.group_by(u'Country', u'Customer').aggregate(
+                (u'Total', u'sum', u'Price'))
+        self.assertEqual(
+                [list(row) for row in result],
+                [
+                    [u'LT', u'a', 2.0],
+                    [u'LV', u'b', 6.0],
+                    [u'LT', u'c', 3.0],
+                    [u'LV', u'a', 1.0],
+                    ])
+        self.assertEqual(len(sheet.group_by(u'Country')), 2)
+
+        self.assertRaises(ValueError, sheet.group_by, u'Missing')
+        self.assertRaises(
+                ValueError, sheet.group_by(u'Country').aggregate,
+                (u'X', u'median', u'Amount'))
+        self.assertRaises(
+                ValueError, sheet.group_by(u'Country').aggregate,
+                (u'X', u'sum', None))
+
+        empty = Sheet(captions=self.captions, columnar=columnar)
+        result = empty.group_by(u'Customer').aggregate(
+                (u'Total', u'sum', u'Amount'))
+        self.assertEqual(result.captions, [u'Customer', u'Total'])
+        self.assertEqual(len(result), 0)
+
+    def test_01(self):
+        self.check(False)
+
+    def test_02(self):
+        self.check(True)
+
+    def test_03(self):
+        """ Missing values.
+        """
+
+        for columnar in (False, True):
+            sheet = Sheet(
+                    captions=[u'Customer', u'Amount'],
+                    rows=[
+                        (u'a', None), (u'a', 4), (u'b', None),
+                        (u'a', 2), (u'a', None)],
+                    columnar=columnar)
+            result = sheet.group_by(u'Customer').aggregate(
+                    (u'Total', u'sum', u'Amount'),
+                    (u'Count', u'count', u'Amount'),
+                    (u'Min', u'min', u'Amount'),
+                    (u'Max', u'max', u'Amount'),
+                    (u'Mean', u'mean', u'Amount'),
+                    (u'First', u'first', u'Amount'),
+                    (u'Last', u'last', u'Amount'),
+                    )
+            self.assertEqual(
+                    [list(row) for row in result],
+                    [
+                        [u'a', 6, 2, 2, 4, 3.0, 4, 2],
+                        [u'b', 0, 0, None, None, None, None, None],
+                        ])
+
+    def test_04(self):
+        """ Sums, which do not fit into NumPy integers, are computed by
+        Python.
+        """
+
+        big = 2 ** 62
+        for columnar in (False, True):
+            sheet = Sheet(
+                    captions=[u'Customer', u'Amount'],
+                    rows=[(u'a', big), (u'a', big), (u'b', -big)],
+                    columnar=columnar)
+            result = sheet.group_by(u'Customer').aggregate(
+                    (u'Total', u'sum', u'Amount'),
+                    (u'Mean', u'mean', u'Amount'),
+                    (u'Max', u'max', u'Amount'))
+            self.assertEqual(
+                    [list(row) for row in result],
+                    [[u'a', 2 * big, float(big), big],
+                     [u'b', -big, float(-big), -big]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/python
+
+
+import unittest
+
+from pysheets.sheet import Sheet
+
+
+class JoinTest(unittest.TestCase):
+    """ Tests for :py:func:`pysheets.joining.join_sheets`.
+    """
+
+    def create_sheets(self, columnar):
+
+        orders = Sheet(
+                captions=[u'Order', u'Customer', u'Name'],
+                rows=[
+                    (1, u'a', u'Pen'),
+                    (2, u'b', u'Book'),
+                    (3, u'a', u'Ink'),
+                    (4, u'x', u'Cup'),
+                    ],
+                columnar=columnar)
+        customers = Sheet(
+                captions=[u'Customer', u'Name'],
+                rows=[
+                    (u'a', u'Alice'),
+                    (u'b', u'Bob'),
+                    (u'c', u'Carol'),
+                    (u'b', u'Bob 2'),
+                    ],
+                columnar=columnar)
+        return orders, customers
+
+    def check(self, columnar):
+
+        orders, customers = self.create_sheets(columnar)
+
+        result = orders.join(customers, on=u'Customer')
+        self.assertEqual(result.columnar, columnar)
+        self.assertEqual(
+                result.captions,
+                [u'Customer', u'Order', u'Name (left)', u'Name (right)'])
+        inner = [
+                [u'a', 1, u'Pen', u'Alice'],
+                [u'b', 2, u'Book', u'Bob'],
+                [u'b', 2, u'Book', u'Bob 2'],
+                [u'a', 3, u'Ink', u'Alice'],
+                ]
+        self.assertEqual([list(row) for row in result], inner)
+        self.assertEqual(
+                [list(row) for row in orders.join(customers, on='Customer')],
+                inner)
+
+        result = orders.join(customers, on=[u'Customer'], how=u'left')
+        self.assertEqual(
+                [list(row) for row in result],
+                inner + [[u'x', 4, u'Cup', None]])
+
+        customers.create_index(u'Customer')
+        result = orders.join(
+                customers, on=u'Customer', how=u'outer',
+                suffixes=(u'', u' 2'))
+        self.assertEqual(
+                result.captions, [u'Customer', u'Order', u'Name', u'Name 2'])
+        self.assertEqual(
+                [list(row) for row in result],
+                inner + [[u'x', 4, u'Cup', None], [u'c', None, None, u'Carol']])
+
+        result = orders.join(
+                orders, on=[u'Order', u'Customer'], how=u'inner')
+        self.assertEqual(
+                [list(row) for row in result][0], [1, u'a', u'Pen', u'Pen'])
+
+        self.assertRaises(
+                ValueError, orders.join, customers, u'Customer', u'cross')
+        self.assertRaises(ValueError, orders.join, customers, u'Order')
+
+    def test_01(self):
+        self.check(False)
+
+    def test_02(self):
+        self.check(True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -87,3 +87,57 @@ class MountPointTest(unittest.TestCase):
         self.assertIs(manager.get_by_file(u'fsfd/dff/bla.xyz'), Plugin02)
         self.assertRaises(KeyError, manager.get_by_file, u'bla.tar.xyz')
         self.assertIs(manager.get_by_mime('text/plg'), Plugin02)
+
+
+class LazyPluginTest(unittest.TestCase):
+    """ Tests for :py:meth:`pysheets.plugins.PluginManager.add_lazy`.
+    """
+
+    def test_01(self):
+
+        class Plugin01(object):
+            short_name = u'plugin01'
+            file_extensions = [u'xyz', u'dvq']
+            mime_type = u'text/plg'
+
+        class Plugin02(Plugin01):
+            short_name = u'plugin02'
+
+        manager = PluginManager()
+        manager.add_lazy(
+                u'plugin01', 'pysheets.not_existing', [u'xyz', u'dvq'],
+                u'text/plg')
+        manager.add(Plugin02)
+        self.assertEqual(len(manager), 2)
+        self.assertIs(manager.get_by_extension(u'xyz'), Plugin02)
+
+        # Importing of plugin module registers plugin class in place of
+        # placeholder.
+        manager.add(Plugin01)
+        self.assertIs(manager[u'plugin01'], Plugin01)
+        self.assertEqual(manager.file_extensions[u'dvq'], [
+            Plugin01, Plugin02])
+        self.assertIs(manager.get_by_mime(u'text/plg'), Plugin02)
+
+    def test_02(self):
+
+        manager = PluginManager()
+        manager.add_lazy(
+                u'plugin01', 'pysheets.not_existing', [u'xyz'], u'text/plg')
+        self.assertEqual(len(manager), 1)
+        self.assertRaises(ImportError, manager.get_by_file, u'bla.xyz')
+        self.assertEqual(len(manager), 0)
+        self.assertRaises(KeyError, manager.get_by_file, u'bla.xyz')
+
+        manager.add_lazy(
+                u'plugin01', 'pysheets.exceptions', [u'xyz'], u'text/plg')
+        self.assertRaises(ImportError, manager.__getitem__, u'plugin01')
+        self.assertRaises(KeyError, manager.__getitem__, u'plugin01')
+
+    def test_03(self):
+
+        from pysheets.readers import SheetReader
+        from pysheets.readers.csv import CSVReader
+
+        self.assertIs(SheetReader.plugins[u'CSV'], CSVReader)
+        self.assertIs(SheetReader.plugins.get_by_file(u'a.csv'), CSVReader)
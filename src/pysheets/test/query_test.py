@@ -0,0 +1,58 @@
+#!/usr/bin/python
+
+
+import unittest
+
+from pysheets.query import Query
+from pysheets.sheet import Sheet
+
+
+class QueryTest(unittest.TestCase):
+    """ Tests for :py:class:`pysheets.query.Query`.
+    """
+
+    def setUp(self):
+
+        self.captions = [u'Number', u'Square', u'Cube']
+        self.rows = [(i, i * i, i * i * i) for i in range(10)]
+
+    def test_01(self):
+
+        query = Query(
+                select=[u'Cube', u'Number'],
+                where={u'Square': lambda value: value > 10, u'Cube': 64})
+        self.assertEqual(
+                query.compile(self.captions)[0],
+                [(u'Cube', 2), (u'Number', 0)])
+        self.assertEqual(query.get_positions(self.captions), set([0, 1, 2]))
+        self.assertEqual(
+                list(query.execute(self.rows, self.captions)),
+                [{u'Cube': 64, u'Number': 4}])
+
+        query = Query(where={u'Square': lambda value: value > 10}, limit=2)
+        self.assertEqual(
+                [record[u'Number']
+                 for record in query.execute(self.rows, self.captions)],
+                [4, 5])
+        self.assertEqual(
+                list(Query(limit=0).execute(self.rows, self.captions)), [])
+
+        query = Query(select=[u'Missing'])
+        self.assertRaises(ValueError, query.compile, self.captions)
+
+    def test_02(self):
+
+        for columnar in (False, True):
+            sheet = Sheet(
+                    captions=self.captions, rows=self.rows,
+                    columnar=columnar)
+            result = sheet.query(Query(
+                select=[u'Cube'], where={u'Number': lambda x: x % 3 == 0}))
+            self.assertEqual(result.captions, [u'Cube'])
+            self.assertEqual(
+                    [list(row) for row in result], [[0], [27], [216], [729]])
+            self.assertEqual(result.columnar, columnar)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,17 @@
 #!/usr/bin/python
 
 
+import datetime
+import decimal
 import unittest
 import os
+import shutil
+import tempfile
 from cStringIO import StringIO
 
 from pysheets.exceptions import IntegrityError, InvalidFileError
-from pysheets.readers.csv import CSVReader
+from pysheets.readers.csv import CSVReader, iterate_lines, split_records
+from pysheets.query import Query
 from pysheets.sheet import Sheet
 
 
@@ -112,3 +117,303 @@ class CSVReaderTest(unittest.TestCase):
 
         self.assertRaises(
                 InvalidFileError, reader, sheet, data, create_columns=False)
+
+    def test_07(self):
+
+        data = StringIO('''\
+"Name";"E-Mail";"Phone numbers"
+"Foo Bar";"foo@example.com";"+37060000000;+37061111111"
+"Fooer Barer";"bar@example.com";"+37062222222"\
+''')
+        reader = CSVReader()
+        sheet = Sheet()
+
+        def validator(sheet, row):
+            row[u'Name'] = row[u'Name'].upper()
+            return row
+        sheet.add_insert_validator(validator)
+
+        rows = reader.iterate(sheet, data)
+        self.assertEqual(sheet.captions, [])
+        self.assertEqual(
+                [list(row) for row in rows],
+                [
+                    [
+                        u'FOO BAR',
+                        u'foo@example.com',
+                        u'+37060000000;+37061111111'],
+                    [
+                        u'FOOER BARER',
+                        u'bar@example.com',
+                        u'+37062222222']])
+        self.assertEqual(
+                sheet.captions, [u'Name', u'E-Mail', u'Phone numbers'])
+        self.assertEqual(len(sheet), 0)
+
+    def test_08(self):
+
+        file = os.path.join(os.path.dirname(__file__), 'files', 'sheet.csv')
+
+        reader = CSVReader()
+        sheet = Sheet()
+        rows = reader.iterate(sheet, file.decode('utf-8'))
+        self.assertEqual(
+                [row[u'Name'] for row in rows], [u'Foo Bar', u'Fooer Barer'])
+        self.assertEqual(len(sheet), 0)
+
+        self.assertRaises(
+                InvalidFileError, list,
+                reader.iterate(sheet, StringIO('')))
+
+    def test_09(self):
+
+        data = StringIO('''\
+"Name";"E-Mail";"Status"
+"Foo Bar";"foo@example.com";"paid"
+"Fooer Barer";"bar@example.com";"new"
+"Foo";"\xc4\x85@example.com";"paid"
+"Bar";"bar";"paid"
+''')
+        reader = CSVReader()
+        sheet = Sheet()
+        query = Query(
+                select=[u'E-Mail', u'Name'], where={u'Status': u'paid'},
+                limit=2)
+        reader(sheet, data, query=query)
+        self.assertEqual(sheet.captions, [u'E-Mail', u'Name'])
+        self.assertEqual(
+                [list(row) for row in sheet],
+                [[u'foo@example.com', u'Foo Bar'],
+                 [u'\u0105@example.com', u'Foo']])
+
+        data.seek(0)
+        sheet = Sheet()
+        self.assertRaises(
+                ValueError, reader, sheet, data,
+                query=Query(where={u'Missing': u''}))
+
+    def test_10(self):
+        """ Parallel reading.
+        """
+
+        directory = tempfile.mkdtemp()
+        try:
+            file = os.path.join(directory, 'data.csv').decode('utf-8')
+            with open(file, 'wb') as fp:
+                fp.write('"Name";"Comment"\r\n')
+                for i in range(100):
+                    fp.write(
+                        '"Name{0}";"Line\n""quoted"";\r\n\xc4\x85"\r\n'
+                        .format(i))
+
+            with open(file, 'rb') as fp:
+                data = fp.read()
+            boundaries = split_records(data, 10)
+            self.assertEqual(len(boundaries), 102)
+            for boundary in boundaries[1:]:
+                self.assertEqual(data[boundary - 2:boundary], '\r\n')
+                self.assertEqual(data[:boundary].count('"') % 2, 0)
+
+            reader = CSVReader()
+            expected = Sheet()
+            reader(expected, file)
+            self.assertEqual(len(expected), 100)
+            self.assertEqual(
+                    list(expected[0]),
+                    [u'Name0', u'Line\n"quoted";\r\n\u0105'])
+
+            sheet = Sheet()
+            names = []
+
+            def validator(sheet, row):
+                names.append(row[u'Name'])
+                return row
+            sheet.add_insert_validator(validator)
+
+            reader(sheet, file, processes=2, chunk_size=200)
+            self.assertEqual(sheet.captions, expected.captions)
+            self.assertEqual(
+                    [list(row) for row in sheet],
+                    [list(row) for row in expected])
+            self.assertEqual(names, [row[u'Name'] for row in expected])
+
+            with open(file, 'wb') as fp:
+                pass
+            self.assertRaises(
+                    InvalidFileError, reader, Sheet(), file, processes=2)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_11(self):
+        """ Encodings and columns order.
+        """
+
+        text = (
+                u'"Name";"E-Mail"\r\n'
+                u'"Foo \u0105";"foo@example.com"\r\n'
+                u'"Bar";"bar@example.com"\r\n')
+        reader = CSVReader()
+
+        sheet = Sheet()
+        reader(sheet, StringIO(text.encode('utf-16')), encoding='utf-16')
+        self.assertEqual(sheet.captions, [u'Name', u'E-Mail'])
+        self.assertEqual(
+                [list(row) for row in sheet],
+                [[u'Foo \u0105', u'foo@example.com'],
+                 [u'Bar', u'bar@example.com']])
+
+        sheet = Sheet()
+        reader(sheet, StringIO(text.encode('cp1257')), encoding='cp1257')
+        self.assertEqual(sheet[0][u'Name'], u'Foo \u0105')
+
+        sheet = Sheet()
+        reader(sheet, StringIO(text.encode('utf-8')), encoding=None)
+        self.assertEqual(sheet.captions, ['Name', 'E-Mail'])
+        self.assertEqual(sheet[0]['Name'], 'Foo \xc4\x85')
+        self.assertEqual(type(sheet[1]['Name']), str)
+
+        sheet = Sheet(captions=[u'E-Mail', u'Name'])
+        reader(sheet, StringIO(text.encode('utf-8')), create_columns=False)
+        self.assertEqual(
+                [list(row) for row in sheet],
+                [[u'foo@example.com', u'Foo \u0105'],
+                 [u'bar@example.com', u'Bar']])
+
+        self.assertRaises(
+                UnicodeDecodeError, reader, Sheet(),
+                StringIO(text.encode('cp1257')))
+
+    def test_12(self):
+        """ Typed column schema.
+        """
+
+        data = (
+                '"Number";"Amount";"Date";"Paid";"Name"\r\n'
+                '"1";"0.10";"2011-08-11";"true";"Foo"\r\n'
+                '"2";"";"2011-08-12";"false";"Bar"\r\n')
+        schema = {
+                u'Number': int,
+                u'Amount': decimal.Decimal,
+                u'Date': datetime.date,
+                u'Paid': bool,
+                }
+        expected = [
+                [1, decimal.Decimal(u'0.10'), datetime.date(2011, 8, 11),
+                 True, u'Foo'],
+                [2, None, datetime.date(2011, 8, 12), False, u'Bar']]
+        reader = CSVReader()
+
+        sheet = Sheet(schema=schema, columnar=True)
+        reader(sheet, StringIO(data))
+        self.assertEqual([list(row) for row in sheet], expected)
+        self.assertEqual(sheet.rows.columns[0].typecode, 'l')
+
+        sheet = Sheet(schema=schema)
+        rows = reader.iterate(sheet, StringIO(data))
+        self.assertEqual([list(row) for row in rows], expected)
+
+        sheet = Sheet(schema=schema)
+        reader(sheet, StringIO(data), query=Query(
+            select=[u'Number', u'Paid'], where={u'Name': u'Bar'}))
+        self.assertEqual([list(row) for row in sheet], [[2, False]])
+
+        directory = tempfile.mkdtemp()
+        try:
+            file = os.path.join(directory, 'data.csv').decode('utf-8')
+            with open(file, 'wb') as fp:
+                fp.write(data)
+            sheet = Sheet(schema=schema)
+            reader(sheet, file, processes=2, chunk_size=1)
+            self.assertEqual([list(row) for row in sheet], expected)
+        finally:
+            shutil.rmtree(directory)
+
+        self.assertRaises(
+                ValueError, reader, Sheet(schema={u'Name': int}),
+                StringIO(data))
+
+    def test_13(self):
+        """ Parallel reading of file with quote characters inside not
+        quoted fields.
+        """
+
+        directory = tempfile.mkdtemp()
+        try:
+            file = os.path.join(directory, 'data.csv').decode('utf-8')
+            with open(file, 'wb') as fp:
+                fp.write('"Name";"Comment"\n')
+                for i in range(50):
+                    if i == 10:
+                        fp.write('TV;55" screen\n')
+                    else:
+                        fp.write('"Name{0}";"multi\nline"\n'.format(i))
+
+            reader = CSVReader()
+            expected = Sheet()
+            reader(expected, file)
+            self.assertEqual(len(expected), 50)
+            self.assertEqual(list(expected[10]), [u'TV', u'55" screen'])
+
+            for chunk_size in (1, 20, 100):
+                sheet = Sheet()
+                reader(sheet, file, processes=2, chunk_size=chunk_size)
+                self.assertEqual(
+                        [list(row) for row in sheet],
+                        [list(row) for row in expected])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_14(self):
+        """ Splitting data into lines and reading by file name.
+        """
+
+        data = 'a\nbb\n\nlong line\nc'
+        for start, end in ((0, None), (2, None), (2, 15), (5, 6)):
+            for block_size in (1, 4, 100):
+                self.assertEqual(
+                        list(iterate_lines(data, start, end, block_size)),
+                        list(StringIO(data[start:end])))
+
+        data = (
+                u'"Name";"Comment"\n'
+                u'"Foo";"multi\nline \u0105"\n'
+                u'"Bar";"b"\n')
+        directory = tempfile.mkdtemp()
+        try:
+            file = os.path.join(directory, 'data.csv').decode('utf-8')
+            reader = CSVReader()
+            for encoding in ('utf-8', 'utf-16'):
+                with open(file, 'wb') as fp:
+                    fp.write(data.encode(encoding))
+                sheet = Sheet()
+                reader(sheet, file, encoding=encoding)
+                self.assertEqual(
+                        [list(row) for row in sheet],
+                        [[u'Foo', u'multi\nline \u0105'], [u'Bar', u'b']])
+
+            open(file, 'wb').close()
+            self.assertRaises(InvalidFileError, reader, Sheet(), file)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_15(self):
+        """ Query over empty and short records.
+        """
+
+        reader = CSVReader()
+        for data in ('a;b\n1;2\n\n3;4\n', 'a;b\n1;2\n3\n'):
+            for encoding in ('utf-8', None):
+                expected = Sheet()
+                reader(expected, StringIO(data), encoding=encoding)
+                sheet = Sheet()
+                reader(sheet, StringIO(data), encoding=encoding,
+                       query=Query(select=[u'a', u'b']))
+                self.assertEqual(
+                        [list(row) for row in sheet],
+                        [list(row) for row in expected])
+                self.assertEqual(len(sheet), 2)
+
+        sheet = Sheet()
+        reader(sheet, StringIO('a;b\n1;2\n3\n'),
+               query=Query(where={u'b': None}))
+        self.assertEqual([list(row) for row in sheet], [[u'3', None]])
@@ -3,9 +3,12 @@
 
 import unittest
 import os
+import zipfile
 
 from pysheets.exceptions import IntegrityError, InvalidFileError
-from pysheets.readers.ods import ODFSheetReader, ODFSpreadSheetReader
+from pysheets.readers.ods import (
+        ODFSheetReader, ODFSpreadSheetReader, extract_tables, scan_tables)
+from pysheets.query import Query
 from pysheets.sheet import Sheet
 from pysheets.spreadsheet import SpreadSheet
 
@@ -100,6 +103,11 @@ class ODFSheetReaderTest02(unittest.TestCase):
         """
 
         self.assertRaises(ValueError, self.reader, self.sheet, self.file)
+        self.assertEqual(self.sheet.captions, [])
+        self.assertEqual(len(self.sheet), 0)
+        with open(self.file, 'rb') as fp:
+            self.assertRaises(ValueError, self.reader, self.sheet, fp)
+        self.assertEqual(len(self.sheet), 0)
 
     def test_02(self):
 
@@ -162,6 +170,28 @@ class ODFSheetReaderTest02(unittest.TestCase):
                 InvalidFileError, self.reader, self.sheet, self.file,
                 sheet_name=u'Empty')
 
+    def test_06(self):
+
+        query = Query(
+                select=[u'Participants', u'Event4'],
+                where={u'Event1': u'1'}, limit=2)
+        self.reader(
+                self.sheet, self.file, sheet_name=u'Participants',
+                query=query)
+        self.assertEqual(self.sheet.captions, [u'Participants', u'Event4'])
+        self.assertEqual(
+                [list(row) for row in self.sheet],
+                [[u'Foo Bar1', u'1'], [u'Foo Bar5', None]])
+
+        sheet = Sheet()
+        query = Query(
+                select=[u'Cube', u'Value'],
+                where={u'Square': lambda value: int(value) > 50})
+        self.reader(sheet, self.file, sheet_name=u'Formulas', query=query)
+        self.assertEqual(
+                [list(row) for row in sheet],
+                [[u'512', u'8'], [u'729', u'9'], [u'1000', u'10']])
+
 
 class ODFSpreadSheetReaderTest(unittest.TestCase):
     """ Tests for :py:class:`pysheets.readers.ods.ODFSpreadSheetReader`.
@@ -215,3 +245,74 @@ class ODFSpreadSheetReaderTest(unittest.TestCase):
         self.assertEqual(len(self.ss), 2)
         self.assertEqual(
                 self.ss.names, [u'List', u'Participants'])
+
+    def test_04(self):
+        """ Reading from file like object.
+        """
+
+        with open(self.file, 'rb') as fp:
+            self.reader(self.ss, fp, read_sheets=[u'Formulas'])
+        self.assertEqual(self.ss.names, [u'Formulas'])
+        self.assertEqual(len(self.ss[u'Formulas']), 11)
+        self.assertEqual(
+                list(self.ss[u'Formulas'][-1]),
+                [u'10', u'3628800', u'100', u'1000'])
+
+    def test_05(self):
+        """ Reading sheets in worker processes.
+        """
+
+        expected = SpreadSheet()
+        self.reader(expected, self.file, ignore_sheets=[u'Empty'])
+        self.reader(
+                self.ss, self.file, ignore_sheets=[u'Empty'], processes=2)
+        self.assertEqual(self.ss.names, expected.names)
+        for name in expected.names:
+            self.assertEqual(
+                    self.ss[name].captions, expected[name].captions)
+            self.assertEqual(
+                    [list(row) for row in self.ss[name]],
+                    [list(row) for row in expected[name]])
+
+    def test_06(self):
+        """ Sheets filtered before reading in worker processes.
+        """
+
+        self.reader(self.ss, self.file,
+                read_sheets=[u'Participants', u'Empty'],
+                ignore_sheets=[u'Empty'],
+                query=Query(select=[u'Participants'], limit=2),
+                processes=2)
+        self.assertEqual(self.ss.names, [u'Participants'])
+        self.assertEqual(
+                [list(row) for row in self.ss[u'Participants']],
+                [[u'Foo Bar1'], [u'Foo Bar2']])
+
+    def test_07(self):
+        """ Typed column schema.
+        """
+
+        schemas = {u'Formulas': {
+            u'Value': int, u'Factorial': int, u'Square': float}}
+        for processes in (1, 2):
+            ss = SpreadSheet()
+            self.reader(
+                    ss, self.file, read_sheets=[u'Formulas'],
+                    schemas=schemas, processes=processes)
+            sheet = ss[u'Formulas']
+            self.assertEqual(sheet.schema, schemas[u'Formulas'])
+            self.assertEqual(
+                    list(sheet[-1]), [10, 3628800, 100.0, u'1000'])
+            self.assertEqual(type(sheet[-1][u'Square']), float)
+
+    def test_08(self):
+        """ Extracting data of scanned tables.
+        """
+
+        root_start, root_end, tables = scan_tables(self.file)
+        with zipfile.ZipFile(self.file) as archive:
+            content = archive.read('content.xml')
+        for selected in (tables, tables[1:], tables[::2]):
+            self.assertEqual(
+                    list(extract_tables(self.file, selected)),
+                    [content[start:end] for name, start, end in selected])
@@ -0,0 +1,85 @@
+#!/usr/bin/python
+
+
+import datetime
+import decimal
+import unittest
+
+from pysheets.schema import (
+        convert_column, convert_dicts, convert_records, parse_bool,
+        parse_date, parse_datetime)
+
+
+class SchemaTest(unittest.TestCase):
+    """ Tests for :py:mod:`pysheets.schema`.
+    """
+
+    def test_01(self):
+
+        self.assertEqual(
+                parse_date(u'2011-08-11'), datetime.date(2011, 8, 11))
+        self.assertEqual(
+                parse_date(u'2011-08-11T10:30:00'),
+                datetime.date(2011, 8, 11))
+        self.assertEqual(
+                parse_datetime(u'2011-08-11 10:30:15'),
+                datetime.datetime(2011, 8, 11, 10, 30, 15))
+        self.assertEqual(
+                parse_datetime(u'2011-08-11T10:30:15.25'),
+                datetime.datetime(2011, 8, 11, 10, 30, 15, 250000))
+        self.assertEqual(
+                parse_datetime(u'2011-08-11'),
+                datetime.datetime(2011, 8, 11))
+        self.assertRaises(ValueError, parse_date, u'11/08/2011')
+        self.assertRaises(ValueError, parse_date, u'2011-08-11xyz')
+        self.assertRaises(ValueError, parse_date, u'2011-08-111')
+        self.assertRaises(ValueError, parse_date, u'2011-08-11T10:30x')
+        self.assertRaises(ValueError, parse_datetime, u'2011-08-11 10')
+        self.assertEqual(parse_bool(u'True'), True)
+        self.assertEqual(parse_bool(u'0'), False)
+        self.assertRaises(ValueError, parse_bool, u'maybe')
+
+    def test_02(self):
+
+        self.assertEqual(convert_column([u'1', u'2'], int), [1, 2])
+        self.assertEqual(
+                convert_column([u'1.5', u'', None, 2.5], float),
+                [1.5, None, None, 2.5])
+        self.assertEqual(
+                convert_column([u'0.10', u''], decimal.Decimal),
+                [decimal.Decimal(u'0.10'), None])
+        self.assertEqual(
+                convert_column([u'a', None], unicode), [u'a', None])
+        self.assertRaises(
+                ValueError, convert_column, [u'1', u'x'], int, u'Number')
+        self.assertRaises(ValueError, convert_column, [u'1'], list)
+
+        self.assertEqual(
+                convert_column([u'1', 2, 3.0, 4L, None], int),
+                [1, 2, 3, 4, None])
+        self.assertEqual(convert_column([u'1', 2.0], long), [1L, 2L])
+        for values in ([1.9], [u'1', 1.9], [u'1.9'], [u'1', u'1.9']):
+            self.assertRaises(ValueError, convert_column, values, int)
+        self.assertRaises(ValueError, convert_column, [1.5], long)
+        self.assertRaises(
+                ValueError, convert_column,
+                [u'2011-08-11', u'2011-08-12xyz'], datetime.date)
+
+    def test_03(self):
+
+        captions = [u'Number', u'Name', u'Paid']
+        schema = {u'Number': int, u'Paid': bool}
+        records = [[unicode(i), u'Name', u'yes'] for i in range(5)]
+        records[3][2] = u''
+        self.assertEqual(
+                list(convert_records(records, captions, schema, 2)),
+                [(0, u'Name', True), (1, u'Name', True),
+                 (2, u'Name', True), (3, u'Name', None),
+                 (4, u'Name', True)])
+        self.assertEqual(
+                list(convert_records(records, captions, {})), records)
+        self.assertEqual(
+                list(convert_dicts(
+                    [{u'Number': u'1', u'Paid': u'no'}],
+                    [u'Number', u'Paid'], schema)),
+                [{u'Number': 1, u'Paid': False}])
@@ -3,10 +3,13 @@
 
 import unittest
 import os
+import array
+import cPickle
+import pickle
 from cStringIO import StringIO
 
 from pysheets.exceptions import IntegrityError
-from pysheets.sheet import Row, Sheet, Column
+from pysheets.sheet import Row, Sheet, Column, ColumnarRow
 from pysheets.readers.csv import CSVReader
 from validators import (
         ValidationError,
@@ -39,6 +42,27 @@ class RowTest(unittest.TestCase):
         self.assertEqual(row[u'b'], 2)
         row[u'b'] = 3
         self.assertEqual(row[u'b'], 3)
+        self.assertFalse(hasattr(row, '__dict__'))
+
+    def test_02(self):
+        """ Pickling.
+        """
+
+        for options in (
+                {}, {'immutable_rows': True}, {'columnar': True}):
+            sheet = Sheet(
+                    captions=[u'a', u'b'], rows=[[1, u'x'], [2, u'y']],
+                    **options)
+            for module in (pickle, cPickle):
+                for protocol in (0, 1, 2):
+                    copy = module.loads(module.dumps(sheet, protocol))
+                    self.assertEqual(
+                            [list(row) for row in copy],
+                            [[1, u'x'], [2, u'y']])
+                    row = module.loads(module.dumps(sheet[1], protocol))
+                    self.assertEqual(type(row), type(sheet[1]))
+                    self.assertEqual(list(row), [2, u'y'])
+                    self.assertEqual(row[u'b'], u'y')
 
 
 class ColumnTest(unittest.TestCase):
@@ -447,3 +471,393 @@ class SheetTest(unittest.TestCase):
 "4";"16";"64"
 """
                 )
+
+    def test_15(self):
+
+        data = StringIO('''\
+`Name`&`E-Mail`&`Phone numbers`
+`Foo Bar`&`foo@example.com`&`+37060000000;+37061111111`
+`Fooer Barer`&`bar@example.com`&`+37062222222`\
+''')
+        sheet = Sheet(captions=[u'Name'])
+        rows = sheet.read(
+                data, reader_name='CSV', stream=True,
+                reader_args={'delimiter': '&', 'quotechar': '`'})
+        self.assertEqual(
+                [list(row) for row in rows],
+                [[u'Foo Bar',], [u'Fooer Barer',]])
+        self.assertEqual(len(sheet), 0)
+
+    def test_16(self):
+        """ Slices.
+        """
+
+        for columnar in (False, True):
+            sheet = Sheet(
+                    captions=[u'a', u'b'],
+                    rows=[[i, i * i] for i in range(5)], columnar=columnar)
+            sheet.create_index(u'a')
+            sheet.create_index(u'b', ordered=True)
+            deleted = []
+            sheet.add_delete_validator(
+                    lambda sheet, row: deleted.append(row[u'a']))
+
+            del sheet[0:2]
+            self.assertEqual(deleted, [0, 1])
+            self.assertEqual(
+                    [list(row) for row in sheet], [[2, 4], [3, 9], [4, 16]])
+            self.assertEqual(
+                    [row[u'b'] for row in sheet.lookup(u'a', 3)], [9])
+            self.assertEqual(
+                    [row[u'a'] for row in sheet.top(u'b', 1)], [2])
+
+            sheet[1:] = [{u'a': 5, u'b': 25}, {u'a': 6, u'b': 36}]
+            self.assertEqual(
+                    [list(row) for row in sheet], [[2, 4], [5, 25], [6, 36]])
+            self.assertEqual(sheet.lookup(u'a', 3), [])
+            self.assertEqual(
+                    [row[u'b'] for row in sheet.lookup(u'a', 6)], [36])
+            self.assertRaises(ValueError, sheet.__setitem__, slice(0, 2), [])
+
+
+class ColumnarSheetTest(unittest.TestCase):
+    """ Tests for :py:class:`pysheets.sheet.Sheet` with columnar
+    storage.
+    """
+
+    def test_01(self):
+        """ Ok scenario.
+        """
+
+        sheet = Sheet(
+                captions=[u'a', u'b', u'c'],
+                rows=[
+                    {u'a': 4, u'b': 5, u'c': 6},
+                    [4, 2, 3],
+                    [2, 4, 5],
+                    {u'c': u'haha', u'a': u'caca', u'b': u'dada'},
+                    [1, 7, 5],
+                    [3, 2, 5],
+                    ],
+                columnar=True)
+        self.assertTrue(sheet.columnar)
+        self.assertEqual(len(sheet), 6)
+        self.assertTrue(isinstance(sheet[0], ColumnarRow))
+        self.assertEqual(list(sheet[4]), [1, 7, 5])
+        self.assertEqual(list(sheet[-2]), [1, 7, 5])
+        self.assertEqual(sheet[-2].index, 4)
+        self.assertEqual(
+                [list(row) for row in sheet[1::2]],
+                [[4, 2, 3], [u'caca', u'dada', u'haha'], [3, 2, 5]])
+        self.assertEqual(
+                [list(row)
+                 for row in sheet.filter(func=lambda x: x[u'c'] == 5)],
+                [[2, 4, 5], [1, 7, 5], [3, 2, 5]])
+        self.assertEqual(
+                list(sheet.get(u'c', u'a')),
+                [[6, 4], [3, 4], [5, 2], [u'haha', u'caca'], [5, 1], [5, 3]]
+                )
+        self.assertRaises(IndexError, sheet.__getitem__, 6)
+
+        sheet.add_column('d', [1, 2, 3, 4, 5, 6])
+        self.assertTrue(isinstance(sheet.rows.columns[3], array.array))
+        self.assertEqual(list(sheet.get(u'd')), [1, 2, 3, 4, 5, 6])
+
+        sheet[3] = {u'a': 1, u'b': 2, u'c': 3, u'd': 4}
+        self.assertEqual(list(sheet[3]), [1, 2, 3, 4])
+        del sheet[3]
+        self.assertEqual(
+                [list(row) for row in sheet],
+                [[4, 5, 6, 1], [4, 2, 3, 2], [2, 4, 5, 3], [1, 7, 5, 5],
+                 [3, 2, 5, 6]])
+
+        sheet.sort()
+        self.assertEqual(list(sheet.get(u'a')), [1, 2, 3, 4, 4])
+        self.assertEqual(list(sheet.get(u'b')), [7, 4, 2, 2, 5])
+        sheet.sort(columns=[u'c', u'a'])
+        self.assertEqual(list(sheet.get(u'd')), [2, 5, 3, 6, 1])
+        sheet.sort(
+                columns=[u'd', u'b'],
+                key=lambda x: x[u'b'] + x[u'c'],
+                reverse=True)
+        self.assertEqual(list(sheet.get(u'd')), [5, 1, 3, 6, 2])
+
+        sheet.remove(u'b')
+        self.assertEqual(
+                [list(row) for row in sheet],
+                [[1, 5, 5], [4, 6, 1], [2, 5, 3], [3, 5, 6], [4, 3, 2]])
+        sheet.remove(u'a')
+        sheet.remove(u'c')
+        sheet.remove(u'd')
+        self.assertEqual(sheet.captions, [])
+        self.assertEqual(len(sheet), 0)
+
+    def test_02(self):
+        """ Test typed columns and views.
+        """
+
+        sheet = Sheet(
+                captions=[u'int', u'float', u'text'],
+                rows=[(i, i / 2.0, unicode(i)) for i in range(5)],
+                columnar=True)
+        int_column, float_column, text_column = sheet.rows.columns
+        self.assertEqual(int_column.typecode, 'l')
+        self.assertEqual(float_column.typecode, 'd')
+        self.assertEqual(text_column, [u'0', u'1', u'2', u'3', u'4'])
+
+        row = sheet[2]
+        self.assertEqual(row.fields, [2, 1.0, u'2'])
+        self.assertEqual(row.keys(), [u'int', u'float', u'text'])
+        row[u'int'] = 20
+        self.assertEqual(sheet.get(u'int')[2], 20)
+        self.assertRaises(TypeError, row.append, 1)
+
+        # Non homogeneous value converts column to list.
+        column = sheet.get(u'int')
+        column[-1] = u'four'
+        self.assertEqual(
+                sheet.rows.columns[0], [0, 1, 20, 3, u'four'])
+        self.assertEqual(row[u'int'], 20)
+        sheet.append([5L, 5, None])
+        self.assertEqual(
+                list(sheet.get(u'float')), [0.0, 0.5, 1.0, 1.5, 2.0, 5])
+        self.assertTrue(isinstance(sheet.rows.columns[1], list))
+
+
+class SheetIndexTest(unittest.TestCase):
+    """ Tests for :py:meth:`pysheets.sheet.Sheet.create_index` and
+    :py:meth:`pysheets.sheet.Sheet.lookup`.
+    """
+
+    def check(self, columnar):
+
+        sheet = Sheet(
+                captions=[u'ID', u'Name'],
+                rows=[[1, u'a'], [2, u'b'], [1, u'c']],
+                columnar=columnar)
+        index = sheet.create_index(u'ID')
+        self.assertIs(sheet.indexes[u'ID'], index)
+        lookup = lambda value: [
+                row[u'Name'] for row in sheet.lookup(u'ID', value)]
+        self.assertEqual(lookup(1), [u'a', u'c'])
+        self.assertEqual(lookup(3), [])
+
+        sheet.append([3, u'd'])
+        sheet.append({u'ID': 1, u'Name': u'e'})
+        self.assertEqual(lookup(1), [u'a', u'c', u'e'])
+        self.assertEqual(lookup(3), [u'd'])
+
+        sheet[0] = {u'ID': 3, u'Name': u'f'}
+        self.assertEqual(lookup(1), [u'c', u'e'])
+        self.assertEqual(lookup(3), [u'f', u'd'])
+
+        del sheet[-1]
+        self.assertTrue(index.valid)
+        self.assertEqual(lookup(1), [u'c'])
+        del sheet[0]
+        self.assertFalse(index.valid)
+        self.assertEqual(lookup(3), [u'd'])
+        self.assertEqual(lookup(2), [u'b'])
+
+        sheet.sort(columns=[u'Name'], reverse=True)
+        self.assertEqual([row[u'Name'] for row in sheet], [u'd', u'c', u'b'])
+        self.assertEqual(lookup(2), [u'b'])
+        self.assertEqual(index.lookup(2), [2])
+
+        # Lookups without index scan all rows.
+        self.assertEqual(
+                [row[u'ID'] for row in sheet.lookup(u'Name', u'c')], [1])
+
+        sheet.get(u'ID')[0] = 4
+        self.assertEqual(lookup(4), [])
+        sheet.reindex()
+        self.assertEqual(lookup(4), [u'd'])
+
+        sheet.remove(u'ID')
+        self.assertEqual(sheet.indexes, {})
+
+    def test_01(self):
+        self.check(False)
+
+    def test_02(self):
+        self.check(True)
+
+    def check_ordered(self, columnar):
+
+        sheet = Sheet(
+                captions=[u'Amount', u'Name'],
+                rows=[[5, u'a'], [1, u'b'], [3, u'c'], [3, u'd']],
+                columnar=columnar)
+        names = lambda rows: [row[u'Name'] for row in rows]
+
+        # Without index.
+        self.assertEqual(
+                names(sheet.range(u'Amount', 2, 5)), [u'c', u'd', u'a'])
+        self.assertEqual(
+                names(sheet.range(u'Amount', 2, 5, include_high=False)),
+                [u'c', u'd'])
+        self.assertEqual(names(sheet.top(u'Amount', 2)), [u'b', u'c'])
+        self.assertEqual(
+                names(sheet.top(u'Amount', 2, largest=True)), [u'a', u'c'])
+
+        index = sheet.create_index(u'Amount', ordered=True)
+        self.assertEqual(index.min(), 1)
+        self.assertEqual(index.max(), 5)
+        self.assertEqual(
+                names(sheet.range(u'Amount', 2, 5)), [u'c', u'd', u'a'])
+        self.assertEqual(
+                names(sheet.range(u'Amount', 2, 5, include_high=False)),
+                [u'c', u'd'])
+        self.assertEqual(names(sheet.range(u'Amount', high=3)),
+                         [u'b', u'c', u'd'])
+        self.assertEqual(names(sheet.top(u'Amount', 2)), [u'b', u'c'])
+        self.assertEqual(
+                names(sheet.top(u'Amount', 2, largest=True)), [u'a', u'c'])
+        self.assertEqual(names(sheet.lookup(u'Amount', 3)), [u'c', u'd'])
+
+        sheet.append([0, u'e'])
+        sheet[0] = {u'Amount': 2, u'Name': u'f'}
+        self.assertEqual(index.max(), 3)
+        self.assertEqual(
+                names(sheet.range(u'Amount')), [u'e', u'b', u'f', u'c', u'd'])
+        del sheet[1]
+        self.assertTrue(index.valid)
+        self.assertEqual(index.entries, [(0, 3), (2, 0), (3, 1), (3, 2)])
+        self.assertEqual(names(sheet.top(u'Amount', 1)), [u'e'])
+        self.assertEqual(names(sheet), [u'f', u'c', u'd', u'e'])
+        self.assertEqual(
+                names(sheet.top(u'Amount', 3, largest=True)),
+                [u'c', u'd', u'f'])
+
+    def test_03(self):
+        self.check_ordered(False)
+
+    def test_04(self):
+        self.check_ordered(True)
+
+    def test_05(self):
+        """ Sorted index, which is out of sync, is invalidated.
+        """
+
+        sheet = Sheet(captions=[u'a'], rows=[[2], [1], [3]])
+        index = sheet.create_index(u'a', ordered=True)
+        index.get_entries()
+        index.discard(1, 2)
+        self.assertFalse(index.valid)
+        self.assertEqual(index.get_entries(), [(1, 1), (2, 0), (3, 2)])
+        index.discard(0, 2)
+        self.assertTrue(index.valid)
+        self.assertEqual(index.entries, [(1, 1), (3, 2)])
+
+
+class SheetExtendTest(unittest.TestCase):
+    """ Tests for :py:meth:`pysheets.sheet.Sheet.extend`.
+    """
+
+    def test_01(self):
+        """ Without validators.
+        """
+
+        sheet = Sheet(captions=[u'a', u'b'])
+        self.assertRaises(IntegrityError, Sheet().extend, [[1, 2]])
+        sheet.create_index(u'a')
+        sheet.extend(iter([[1, 2], (3, 4), {u'b': 6, u'a': 5}]))
+        self.assertEqual(
+                [list(row) for row in sheet], [[1, 2], [3, 4], [5, 6]])
+        self.assertEqual(
+                [row[u'b'] for row in sheet.lookup(u'a', 5)], [6])
+        self.assertRaises(ValueError, sheet.extend, [[1, 2], [3]])
+        self.assertEqual(len(sheet), 4)
+
+    def test_03(self):
+        """ Rows appended before failure are indexed.
+        """
+
+        for ordered in (False, True):
+            sheet = Sheet(captions=[u'a', u'b'], rows=[[0, 0]])
+            index = sheet.create_index(u'a', ordered=ordered)
+            self.assertRaises(ValueError, sheet.extend, [[1, 2], [3]])
+            self.assertEqual(len(sheet), 2)
+            self.assertEqual(
+                    [row[u'b'] for row in sheet.lookup(u'a', 1)], [2])
+            sheet.append([4, 5])
+            del sheet[1]
+            self.assertEqual(
+                    [row[u'b'] for row in sheet.lookup(u'a', 4)], [5])
+            self.assertEqual(sheet.lookup(u'a', 1), [])
+            index.build()
+            self.assertEqual(
+                    [row[u'b'] for row in sheet.lookup(u'a', 4)], [5])
+
+    def test_02(self):
+        """ With row and batch validators.
+        """
+
+        calls = []
+
+        def double(sheet, row):
+            calls.append(u'double')
+            row[u'b'] = row[u'b'] * 2
+            return row
+
+        def batch(sheet, rows):
+            calls.append(u'batch {0}'.format(len(rows)))
+            for row in rows:
+                row[u'a'] = int(row[u'a'])
+            return rows
+
+        def per_row(sheet, row):
+            raise AssertionError(u'Batch interface should be used.')
+        per_row.batch = batch
+
+        sheet = Sheet(captions=[u'a', u'b'], columnar=True)
+        sheet.add_insert_validator(double)
+        sheet.add_insert_validator(per_row)
+        sheet.extend(
+                ([unicode(i), i] for i in range(5)), chunk_size=2)
+        self.assertEqual(
+                [list(row) for row in sheet],
+                [[0, 0], [1, 2], [2, 4], [3, 6], [4, 8]])
+        self.assertEqual(
+                calls,
+                [u'double', u'double', u'batch 2',
+                 u'double', u'double', u'batch 2',
+                 u'double', u'batch 1'])
+
+        validator = UniqueIntegerValidator(u'a')
+        sheet.add_insert_validator(validator.insert)
+        self.assertRaises(
+                ValidationError, sheet.extend, [[u'5', 1], [u'5', 2]])
+        self.assertEqual(len(sheet), 5)
+
+
+class ImmutableRowsSheetTest(unittest.TestCase):
+    """ Tests for :py:class:`pysheets.sheet.Sheet` with immutable rows.
+    """
+
+    def test_01(self):
+
+        sheet = Sheet(
+                captions=[u'a', u'b'],
+                rows=[[2, u'x'], {u'a': 1, u'b': u'y'}],
+                immutable_rows=True)
+        self.assertTrue(sheet.immutable_rows)
+        self.assertEqual(sheet[0].fields, (2, u'x'))
+        self.assertEqual(sheet[1].keys(), [u'a', u'b'])
+        self.assertRaises(TypeError, sheet[0].__setitem__, u'a', 3)
+
+        sheet.extend([[3, u'z']])
+        sheet[0] = {u'a': 0, u'b': u'w'}
+        self.assertEqual(sheet[0].fields, (0, u'w'))
+        sheet.sort()
+        self.assertEqual(list(sheet.get(u'a')), [0, 1, 3])
+
+        sheet.add_column(u'c', [True, False, True])
+        self.assertEqual(sheet[2].fields, (3, u'z', True))
+        sheet.remove(u'b')
+        self.assertEqual(
+                [row.fields for row in sheet],
+                [(0, True), (1, False), (3, True)])
+
+        self.assertFalse(
+                Sheet(columnar=True, immutable_rows=True).immutable_rows)
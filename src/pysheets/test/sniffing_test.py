@@ -0,0 +1,126 @@
+#!/usr/bin/python
+
+
+import unittest
+import os
+import zipfile
+from cStringIO import StringIO
+
+from pysheets.sniffing import peek, sniff, spool, PeekedFile
+from pysheets.sheet import Sheet
+from pysheets.spreadsheet import SpreadSheet
+
+
+ODS_FILE = os.path.join(
+        os.path.dirname(__file__), 'readers_test', 'files',
+        'spreadsheet.ods')
+
+CSV_DATA = 'a,b\n"1",2\n"x, y",3\n'
+
+
+class Stream(object):
+    """ Not seekable stream.
+    """
+
+    def __init__(self, data):
+        self.file = StringIO(data)
+
+    def read(self, size=-1):
+        return self.file.read(size)
+
+    def readline(self):
+        return self.file.readline()
+
+
+class SniffingTest(unittest.TestCase):
+    """ Tests for :py:mod:`pysheets.sniffing`.
+    """
+
+    def test_01(self):
+
+        file = StringIO(CSV_DATA)
+        file.read(2)
+        prefix, peeked = peek(file, 4)
+        self.assertEqual(prefix, 'b\n"1')
+        self.assertIs(peeked, file)
+        self.assertEqual(file.read(), CSV_DATA[2:])
+
+        prefix, peeked = peek(Stream(CSV_DATA), 6)
+        self.assertEqual(prefix, 'a,b\n"1')
+        self.assertTrue(isinstance(peeked, PeekedFile))
+        self.assertEqual(peeked.readline(), 'a,b\n')
+        self.assertEqual(peeked.read(1), '"')
+        self.assertEqual(list(peeked), ['1",2\n', '"x, y",3\n'])
+
+        prefix, peeked = peek(Stream(CSV_DATA), 2)
+        self.assertEqual(peeked.read(), CSV_DATA)
+
+    def test_02(self):
+
+        with open(ODS_FILE, 'rb') as fp:
+            self.assertEqual(
+                    sniff(fp.read(4096)),
+                    ('application/vnd.oasis.opendocument.spreadsheet', {}))
+
+        file = StringIO()
+        package = zipfile.ZipFile(file, 'w')
+        package.writestr('data.txt', 'data')
+        package.close()
+        self.assertEqual(sniff(file.getvalue()), ('application/zip', {}))
+
+        self.assertEqual(
+                sniff(CSV_DATA),
+                ('text/csv', {'delimiter': ',', 'quotechar': '"'}))
+        self.assertEqual(sniff('a\n1\n2\n'), ('text/csv', {}))
+        self.assertEqual(sniff('\x89PNG\r\n\x1a\n\x00\x00'), (None, {}))
+
+    def test_03(self):
+
+        sheet = Sheet()
+        sheet.read(Stream(CSV_DATA), create_columns=True)
+        self.assertEqual(sheet.captions, [u'a', u'b'])
+        self.assertEqual(
+                [list(row) for row in sheet],
+                [[u'1', u'2'], [u'x, y', u'3']])
+
+        spreadsheet = SpreadSheet()
+        with open(ODS_FILE, 'rb') as fp:
+            spreadsheet.read(fp, reader_args={'read_sheets': [u'List']})
+        self.assertEqual(spreadsheet.names, [u'List'])
+
+        self.assertRaises(KeyError, Sheet().read, StringIO('\x00\x01'))
+
+    def test_04(self):
+        """ Reading zip package from not seekable stream.
+        """
+
+        prefix, peeked = peek(Stream(CSV_DATA), 2)
+        spooled = spool(peeked)
+        self.assertEqual(spooled.read(), CSV_DATA)
+        spooled.seek(1)
+        self.assertEqual(spooled.read(2), CSV_DATA[1:3])
+
+        with open(ODS_FILE, 'rb') as fp:
+            data = fp.read()
+        reader_args = {'read_sheets': [u'List', u'Formulas']}
+        expected = SpreadSheet()
+        expected.read(StringIO(data), reader_args=reader_args)
+        spreadsheet = SpreadSheet()
+        spreadsheet.read(Stream(data), reader_args=reader_args)
+        self.assertEqual(spreadsheet.names, expected.names)
+        for name in expected.names:
+            self.assertEqual(
+                    [list(row) for row in spreadsheet[name]],
+                    [list(row) for row in expected[name]])
+
+        with open(ODS_FILE.replace('spreadsheet.ods', 'sheet.ods'),
+                  'rb') as fp:
+            sheet = Sheet()
+            sheet.read(Stream(fp.read()), create_columns=True)
+        self.assertEqual(
+                sheet.captions, [u'Name', u'E-Mail', u'Phone numbers'])
+        self.assertEqual(len(sheet), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,6 +9,7 @@ from pysheets.exceptions import IntegrityError
 from pysheets.sheet import Sheet
 from pysheets.spreadsheet import SpreadSheet
 from pysheets.readers.ods import ODFSpreadSheetReader
+from pysheets.writers.csv import CSVWriter
 from validators import (
         ValidationError,
         UniqueIntegerValidator, SheetOrder,
@@ -206,3 +207,76 @@ class SpreadSheetTest(unittest.TestCase):
 
         self.assertEqual(
                 ss.names, [u'List', u'Formulas', u'Participants'])
+
+
+class SpreadSheetBatchValidationTest(unittest.TestCase):
+    """ Tests for batch validation of rows inserted by
+    :py:meth:`pysheets.sheet.Sheet.extend` into sheet assigned to
+    :py:class:`pysheets.spreadsheet.SpreadSheet`.
+    """
+
+    def test_01(self):
+
+        def validator(spreadsheet, sheet, row):
+            raise AssertionError(u'Batch interface should be used.')
+
+        def batch(spreadsheet, sheet, rows):
+            return [dict(row, GID=int(row[u'GID'])) for row in rows]
+        validator.batch = batch
+
+        ss = SpreadSheet()
+        ss.add_validator(validator, 'insert_row')
+        ss.add_validator(UniqueIntegerValidator2(u'GID').insert, 'insert_row')
+        sheet = ss.create_sheet(u'sheet', captions=[u'GID'])
+        sheet.extend([[u'1'], [u'2']])
+        self.assertEqual(list(sheet.get(u'GID')), [1, 2])
+        self.assertRaises(ValidationError, sheet.extend, [[u'2']])
+        self.assertEqual(len(sheet), 2)
+
+
+class SpreadSheetJoinTest(unittest.TestCase):
+    """ Tests for :py:meth:`pysheets.spreadsheet.SpreadSheet.join`.
+    """
+
+    def setUp(self):
+
+        self.ss = SpreadSheet()
+        for name in (u'c', u'a', u'b'):
+            self.ss.create_sheet(
+                    name, captions=[u'X', u'Y'],
+                    rows=[(name, 1), (name, 2)])
+        self.ss.create_sheet(
+                u'd', captions=[u'Y', u'X'], rows=[(3, u'd')],
+                columnar=True)
+        self.rows = [
+                [u'c', 1, u'c'], [u'c', 2, u'c'],
+                [u'a', 1, u'a'], [u'a', 2, u'a'],
+                [u'b', 1, u'b'], [u'b', 2, u'b'],
+                [u'd', 3, u'd']]
+
+    def test_01(self):
+
+        sheet = self.ss.join(u'Sheet')
+        self.assertEqual(sheet.captions, [u'X', u'Y', u'Sheet'])
+        self.assertEqual([list(row) for row in sheet], self.rows)
+
+        self.ss.create_sheet(u'e', captions=[u'X'])
+        self.assertRaises(ValueError, self.ss.join, u'Sheet')
+
+        self.assertEqual(SpreadSheet().join(u'Sheet').captions, [u'Sheet'])
+
+    def test_02(self):
+
+        view = self.ss.join(u'Sheet', lazy=True)
+        self.assertEqual(view.captions, [u'X', u'Y', u'Sheet'])
+        self.assertEqual(len(view), 7)
+        self.assertEqual(list(view), self.rows)
+
+        self.ss[u'a'].append([u'a', 3])
+        self.assertEqual(list(view)[4], [u'a', 3, u'a'])
+
+        file = StringIO()
+        CSVWriter()(view, file)
+        self.assertEqual(
+                file.getvalue().splitlines()[:2],
+                ['"X";"Y";"Sheet"', '"c";"1";"c"'])
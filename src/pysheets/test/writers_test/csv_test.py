@@ -2,6 +2,7 @@
 
 
 import unittest
+import codecs
 import os
 import datetime
 import tempfile
@@ -93,5 +94,59 @@ class CSVWriterTest(unittest.TestCase):
 "2";"4";"8"
 "3";"9";"27"
 "4";"16";"64"
+"""
+                )
+
+    def test_05(self):
+
+        writer = CSVWriter(encoding='utf-16', buffer_size=10)
+        self.sheet.add_column(u'Text', [u'\u0105'] * 5)
+        writer(self.sheet, self.file)
+        contents = self.file.getvalue()
+        self.assertEqual(contents.count(codecs.BOM_UTF16), 1)
+        self.assertEqual(
+                contents.decode('utf-16').splitlines()[:2],
+                [u'"Number";"Square";"Cube";"Text"', u'"0";"0";"0";"\u0105"'])
+
+    def test_06(self):
+
+        writer = CSVWriter()
+        rows = ([i, i * i] for i in range(3))
+        writer(rows, self.file, captions=[u'Number', u'Square'])
+        self.assertEqual(
+                self.file.getvalue(),
+                """\
+"Number";"Square"
+"0";"0"
+"1";"1"
+"2";"4"
+"""
+                )
+
+        file = StringIO()
+        writer(self.sheet.filter(lambda row: row[u'Number'] > 2), file)
+        self.assertEqual(
+                file.getvalue(),
+                """\
+"3";"9";"27"
+"4";"16";"64"
+"""
+                )
+
+    def test_07(self):
+
+        writer = CSVWriter()
+        sheet = Sheet(
+                captions=[u'Mixed', u'Declared'],
+                rows=[('\xc4\x85', 1), (datetime.date(2011, 8, 30), 2),
+                      (u'\u0105', 3)])
+        writer(sheet, self.file, types={u'Declared': float})
+        self.assertEqual(
+                self.file.getvalue(),
+                """\
+"Mixed";"Declared"
+"\xc4\x85";"1"
+"2011-08-30";"2"
+"\xc4\x85";"3"
 """
                 )
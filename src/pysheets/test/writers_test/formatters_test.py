@@ -0,0 +1,87 @@
+#!/usr/bin/python
+
+
+import unittest
+import datetime
+
+from pysheets.writers.formatters import (
+        SAMPLE_SIZE, infer_types, create_formatters, format_field,
+        format_date, format_datetime)
+from pysheets.sheet import Sheet
+
+
+class FormattersTest(unittest.TestCase):
+    """ Tests for :py:mod:`pysheets.writers.formatters`.
+    """
+
+    def setUp(self):
+
+        self.captions = [u'Number', u'Float', u'Date', u'Mixed']
+        self.rows = [
+                (1, 1.5, datetime.date(2011, 8, 30), u'a'),
+                (2, 2.5, datetime.date(2011, 8, 31), 3),
+                ]
+
+    def test_01(self):
+
+        for columnar in (False, True):
+            sheet = Sheet(
+                    captions=self.captions, rows=self.rows,
+                    columnar=columnar)
+            self.assertEqual(
+                    infer_types(sheet),
+                    [int, float, datetime.date, None])
+            self.assertEqual(
+                    infer_types(sheet, {u'Mixed': unicode}),
+                    [int, float, datetime.date, unicode])
+
+        self.assertEqual(infer_types(Sheet(captions=self.captions)),
+                         [None, None, None, None])
+        self.assertEqual(infer_types(iter(self.rows)), None)
+
+    def test_02(self):
+
+        sheet = Sheet(captions=self.captions, rows=self.rows)
+        formatters = create_formatters(sheet)
+        self.assertEqual(formatters, [
+            unicode, unicode, format_date, format_field])
+        self.assertEqual(
+                [[format(field) for format, field in zip(formatters, row)]
+                 for row in sheet],
+                [[u'1', u'1.5', u'2011-08-30', u'a'],
+                 [u'2', u'2.5', u'2011-08-31', u'3']])
+
+        self.assertEqual(create_formatters(iter(self.rows)), None)
+        self.assertEqual(
+                create_formatters(
+                    iter(self.rows), {u'Date': datetime.datetime},
+                    [u'Date', u'Other']),
+                [format_datetime, format_field])
+
+    def test_03(self):
+        """ Types inferred from sample of rows.
+        """
+
+        rows = [
+                (i, datetime.date(2011, 8, 30), i * 0.5)
+                for i in range(SAMPLE_SIZE + 10)]
+        rows[-1] = (u'x', None, 1.5)
+        for columnar in (False, True):
+            sheet = Sheet(
+                    captions=[u'Number', u'Date', u'Float'], rows=rows,
+                    columnar=columnar)
+            self.assertEqual(
+                    infer_types(sheet), [int, datetime.date, float])
+            formatters = create_formatters(sheet)
+            self.assertEqual(
+                    [format(field)
+                     for format, field in zip(formatters, sheet[-1])],
+                    [u'x', u'None', u'1.5'])
+            self.assertEqual(
+                    [format(field)
+                     for format, field in zip(formatters, sheet[0])],
+                    [u'0', u'2011-08-30', u'0.0'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/python
+
+
+import unittest
+import os
+import datetime
+import tempfile
+import zipfile
+
+from pysheets.writers.ods import ODFSpreadSheetWriter
+from pysheets.spreadsheet import SpreadSheet
+
+
+class ODFSpreadSheetWriterTest(unittest.TestCase):
+    """ Tests for :py:class:`pysheets.writers.ods.ODFSpreadSheetWriter`.
+    """
+
+    def setUp(self):
+
+        self.spreadsheet = SpreadSheet()
+        self.spreadsheet.create_sheet(
+                u'Powers', captions=[u'Number', u'Square', u'Cube'],
+                rows=[(i, i * i, i * i * i) for i in range(5)])
+        self.spreadsheet.create_sheet(
+                u'Text <&> "quoted"', captions=[u'Text', u'Date'],
+                rows=[
+                    (u'<b>Foo & Bar</b>', datetime.date(2011, 8, 30)),
+                    (u'\u0105\u010d\u0119', datetime.datetime(
+                        2011, 8, 30, 12, 58, 53)),
+                    ])
+        file_descriptor, self.file_path = tempfile.mkstemp(suffix='.ods')
+        os.close(file_descriptor)
+        self.file_path = self.file_path.decode('utf-8')
+
+    def tearDown(self):
+        os.remove(self.file_path)
+
+    def assertSpreadSheet(self, spreadsheet):
+        self.assertEqual(
+                spreadsheet.names, [u'Powers', u'Text <&> "quoted"'])
+        self.assertEqual(
+                [list(row) for row in spreadsheet[u'Powers']],
+                [[unicode(i), unicode(i * i), unicode(i * i * i)]
+                 for i in range(5)])
+        self.assertEqual(
+                [list(row) for row in spreadsheet[u'Text <&> "quoted"']],
+                [
+                    [u'<b>Foo & Bar</b>', u'2011-08-30'],
+                    [u'\u0105\u010d\u0119', u'2011-08-30 12:58:53']])
+
+    def test_01(self):
+
+        writer = ODFSpreadSheetWriter()
+        writer(self.spreadsheet, self.file_path)
+        spreadsheet = SpreadSheet(self.file_path)
+        self.assertSpreadSheet(spreadsheet)
+
+    def test_02(self):
+
+        writer = ODFSpreadSheetWriter(stream=True)
+        writer(self.spreadsheet, self.file_path)
+        spreadsheet = SpreadSheet(self.file_path)
+        self.assertSpreadSheet(spreadsheet)
+
+        package = zipfile.ZipFile(self.file_path)
+        mimetype = package.infolist()[0]
+        self.assertEqual(mimetype.filename, 'mimetype')
+        self.assertEqual(mimetype.compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(
+                package.read('mimetype'),
+                'application/vnd.oasis.opendocument.spreadsheet')
+        package.close()
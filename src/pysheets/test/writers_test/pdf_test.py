@@ -0,0 +1,165 @@
+#!/usr/bin/python
+
+
+import sys
+import types
+import unittest
+from cStringIO import StringIO
+
+from pysheets.sheet import Sheet
+
+try:
+    from pysheets.writers import pdf
+except ImportError:
+    pdf = None
+
+
+PAGE_SEPARATOR = '\f'
+
+
+class FakeDocument(object):
+    """ Result of :py:func:`fake_pisa_document`.
+    """
+
+    def __init__(self, err):
+        self.err = err
+
+
+def fake_pisa_document(src, dest, encoding, default_css):
+    """ Writes HTML source instead of rendering it.
+    """
+
+    dest.write(src)
+    return FakeDocument(0)
+
+
+def failing_pisa_document(src, dest, encoding, default_css):
+    """ Reports rendering error.
+    """
+
+    return FakeDocument(1)
+
+
+class FakePdfFileReader(object):
+    """ Reads document written by :py:func:`fake_pisa_document` as
+    single page.
+    """
+
+    def __init__(self, stream):
+        self.document = stream.read()
+
+    def getNumPages(self):
+        return 1
+
+    def getPage(self, page):
+        return self.document
+
+
+class FakePdfFileWriter(object):
+    """ Writes pages separated by :py:data:`PAGE_SEPARATOR`.
+    """
+
+    def __init__(self):
+        self.pages = []
+
+    def addPage(self, page):
+        self.pages.append(page)
+
+    def write(self, stream):
+        stream.write(PAGE_SEPARATOR.join(self.pages))
+
+
+@unittest.skipIf(pdf is None, u'xhtml2pdf is not installed.')
+class PDFWriterTest(unittest.TestCase):
+    """ Tests for :py:class:`pysheets.writers.pdf.PDFWriter`.
+    """
+
+    def setUp(self):
+
+        self.pisa_document = pdf.pisaDocument
+        pdf.pisaDocument = fake_pisa_document
+        self.pypdf = sys.modules.get('PyPDF2')
+        fake_pypdf = types.ModuleType('PyPDF2')
+        fake_pypdf.PdfFileReader = FakePdfFileReader
+        fake_pypdf.PdfFileWriter = FakePdfFileWriter
+        sys.modules['PyPDF2'] = fake_pypdf
+
+        self.sheet = Sheet(
+                captions=[u'Number', u'Square'],
+                rows=[(i, i * i) for i in range(10)])
+
+    def tearDown(self):
+
+        pdf.pisaDocument = self.pisa_document
+        if self.pypdf is None:
+            del sys.modules['PyPDF2']
+        else:
+            sys.modules['PyPDF2'] = self.pypdf
+
+    def check_chunks(self, processes):
+
+        progress = []
+        file = StringIO()
+        writer = pdf.PDFWriter(chunk_rows=3, processes=processes)
+        writer(self.sheet, file,
+               progress=lambda done, total: progress.append((done, total)))
+
+        pages = file.getvalue().split(PAGE_SEPARATOR)
+        self.assertEqual(len(pages), 4)
+        for number, page in enumerate(pages):
+            self.assertIn('<th class="col0">Number</th>', page)
+            cells = [
+                    '<td class="col0">{0}</td>'.format(i)
+                    for i in range(10)]
+            for i, cell in enumerate(cells):
+                if number * 3 <= i < number * 3 + 3:
+                    self.assertIn(cell, page)
+                else:
+                    self.assertNotIn(cell, page)
+        self.assertEqual(progress, [(1, 4), (2, 4), (3, 4), (4, 4)])
+
+    def test_01(self):
+        """ Chunks rendered in current process.
+        """
+
+        self.check_chunks(1)
+
+    def test_02(self):
+        """ Chunks rendered in worker processes.
+        """
+
+        self.check_chunks(2)
+
+    def test_03(self):
+        """ Sheet not larger than chunk is rendered as single document.
+        """
+
+        progress = []
+        file = StringIO()
+        writer = pdf.PDFWriter(chunk_rows=10)
+        writer(self.sheet, file,
+               progress=lambda done, total: progress.append((done, total)))
+        self.assertNotIn(PAGE_SEPARATOR, file.getvalue())
+        self.assertIn('<td class="col0">9</td>', file.getvalue())
+        self.assertEqual(progress, [(1, 1)])
+
+    def test_04(self):
+        """ Rendering errors.
+        """
+
+        pdf.pisaDocument = failing_pisa_document
+        writer = pdf.PDFWriter()
+        self.assertRaises(IOError, writer, self.sheet, StringIO())
+        writer = pdf.PDFWriter(chunk_rows=3, processes=1)
+        self.assertRaises(IOError, writer, self.sheet, StringIO())
+
+    def test_05(self):
+        """ Positional arguments are passed to XHTML writer.
+        """
+
+        writer = pdf.PDFWriter(
+                u'Title', u'', u'', pdf.DEFAULT_CSS, {'class': 'grey'},
+                chunk_rows=3, processes=1)
+        self.assertEqual(writer.xhtml_writer.table_attrs, {'class': 'grey'})
+        self.assertEqual(writer.chunk_rows, 3)
+        self.assertEqual(writer.processes, 1)
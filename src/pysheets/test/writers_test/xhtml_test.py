@@ -63,3 +63,29 @@ class XHTMLWriterTest(unittest.TestCase):
 </table>
 """
                 )
+
+    def test_03(self):
+
+        sheet = Sheet(
+                captions=[u'<Text>', u'Mixed'],
+                rows=[(u'a & b', 1), (u'<i>{0}</i>', u'<b>')])
+        writer = XHTMLWriter(td_attrs={'title': u'{x}'}, chunk_size=1)
+        writer(sheet, self.file)
+        self.assertEqual(
+                self.file.getvalue(),
+                """\
+<table >
+  <tr ><th class="col0" title="{x}">&lt;Text&gt;</th><th class="col1" title="{x}">Mixed</th></tr>
+  <tr ><td class="col0" title="{x}">a &amp; b</td><td class="col1" title="{x}">1</td></tr>
+  <tr ><td class="col0" title="{x}">&lt;i&gt;{0}&lt;/i&gt;</td><td class="col1" title="{x}">&lt;b&gt;</td></tr>
+</table>
+"""
+                )
+
+        file = StringIO()
+        writer = XHTMLWriter(escape_fields=False)
+        writer(sheet, file)
+        self.assertEqual(
+                file.getvalue().splitlines()[3],
+                '  <tr ><td class="col0"><i>{0}</i></td>'
+                '<td class="col1"><b></td></tr>')
@@ -59,9 +59,14 @@ class SpreadSheetWriter(object):
 __all__ = ['csv', 'ods', 'xhtml', 'pdf']
 
 
-# Init built-in writers. (Silently.)
-for writer_module in __all__:
-    try:
-        __import__('pysheets.writers', fromlist=[writer_module], level=0)
-    except ImportError:
-        pass
+# Register built-in writers. Their modules are imported on first use.
+SheetWriter.plugins.add_lazy(
+        u'CSV', 'pysheets.writers.csv', [u'csv'], 'text/csv')
+SheetWriter.plugins.add_lazy(
+        u'XHTML', 'pysheets.writers.xhtml', [u'html', u'xhtml'],
+        'application/xhtml+xml')
+SheetWriter.plugins.add_lazy(
+        u'PDF', 'pysheets.writers.pdf', [u'pdf'], 'application/pdf')
+SpreadSheetWriter.plugins.add_lazy(
+        u'ODS', 'pysheets.writers.ods', [u'ods'],
+        'application/vnd.oasis.opendocument.spreadsheet')
@@ -6,12 +6,15 @@
 
 
 from __future__ import absolute_import
+import codecs
 import cStringIO
 import csv
 import functools
-import datetime
+from itertools import izip
 
 from pysheets.writers import SheetWriter
+from pysheets.writers.formatters import (
+        create_formatters, format_field, get_formatter)
 
 
 class CSVWriter(SheetWriter):
@@ -25,7 +28,14 @@ class CSVWriter(SheetWriter):
 
     def __init__(
             self, dialect='excel', delimiter=';', quotechar='\"',
-            lineterminator='\n', quoting=csv.QUOTE_ALL, encoding='utf-8'):
+            lineterminator='\n', quoting=csv.QUOTE_ALL, encoding='utf-8',
+            buffer_size=65536):
+        """
+
+        :param buffer_size: Amount of bytes, which are buffered before
+            writing them to file.
+
+        """
         super(CSVWriter, self).__init__()
 
         self.dialect = dialect
@@ -34,36 +44,94 @@ class CSVWriter(SheetWriter):
         self.lineterminator = lineterminator
         self.quoting = quoting
         self.encoding = encoding
+        self.buffer_size = buffer_size
+
+    def encode_field(self, field):
+        """ Converts field of any type into UTF-8 byte string.
+        """
+
+        if isinstance(field, str):
+            return field
+        else:
+            return format_field(field).encode('utf-8')
+
+    def get_encoder(self, value_type):
+        """ Returns function, which converts field of ``value_type``
+        into UTF-8 byte string.
+        """
 
-    def write_row(self, row, writer):
+        if value_type is None:
+            return self.encode_field
+        elif value_type is str:
+            return str
+        elif value_type is unicode:
+            return lambda field: field.encode('utf-8')
+        else:
+            format = get_formatter(value_type)
+            return lambda field: format(field).encode('utf-8')
+
+    def write_row(self, row, writer, encoders=None):
         """ Converts each field into byte string, and passes to
         ``writer.writerow``.
+
+        :param encoders: List of per column functions, created by
+            :py:meth:`get_encoder`. If ``None``, then type of each field
+            is checked.
         """
 
-        encoded_row = []
-        for field in row:
-            if isinstance(field, datetime.datetime):
-                field = field.strftime('%Y-%m-%d %H:%M:%S')
-            elif isinstance(field, datetime.date):
-                field = field.strftime('%Y-%m-%d')
-            elif not isinstance(field, str):
-                field = unicode(field).encode('utf-8')
-            encoded_row.append(field)
-        writer.writerow(encoded_row)
-
-    def write(self, sheet, file):
+        if encoders is None:
+            writer.writerow([self.encode_field(field) for field in row])
+        else:
+            writer.writerow([
+                encode(field) for encode, field in izip(encoders, row)])
+
+    def write(self, sheet, file, captions=None, types=None):
         """ Writes data from sheet into file.
+
+        Rows are written in chunks of :py:attr:`buffer_size` bytes,
+        which are encoded by incremental encoder, so writing starts
+        immediately and memory usage does not depend on the amount of
+        data.
+
+        :param sheet: :py:class:`pysheets.sheet.Sheet` or any iterable
+            of rows.
+        :param captions: Captions to write as the first row. If
+            ``None``, then ``sheet.captions`` are used (if ``sheet`` has
+            them).
+        :param types: Dict of column caption and type pairs. Types of
+            not mentioned columns are inferred from ``sheet`` data
+            (if ``sheet`` is :py:class:`pysheets.sheet.Sheet`).
         """
 
+        if captions is None:
+            captions = getattr(sheet, 'captions', None)
+        encoders = create_formatters(
+                sheet, types, captions, get=self.get_encoder)
+
         buffer = cStringIO.StringIO()
         writer = self.create_writer(buffer)
-
-        write = lambda row: self.write_row(row, writer)
-
-        write(sheet.captions)
+        if codecs.lookup(self.encoding).name == 'utf-8':
+            encode = None
+        else:
+            encode = codecs.getincrementalencoder(self.encoding)().encode
+
+        def flush():
+            """ Writes buffered data into file.
+            """
+            data = buffer.getvalue()
+            if encode is not None:
+                data = encode(data.decode('utf-8'))
+            file.write(data)
+            buffer.seek(0)
+            buffer.truncate()
+
+        if captions is not None:
+            self.write_row(captions, writer)
         for row in sheet:
-            write(row)
-        file.write(buffer.getvalue().decode('utf-8').encode(self.encoding))
+            self.write_row(row, writer, encoders)
+            if buffer.tell() >= self.buffer_size:
+                flush()
+        flush()
 
     def create_writer(self, file):
         """ Constructs CSV writer.
@@ -77,13 +145,13 @@ class CSVWriter(SheetWriter):
                 )
 
     @functools.wraps(write)
-    def __call__(self, sheet, file):
+    def __call__(self, sheet, file, *args, **kwargs):
         """ Wrapper function, which ensures that ``file`` is file like
         object.
         """
 
         if isinstance(file, unicode):
             with open(file, 'wb') as fp:
-                self.write(sheet, fp)
+                self.write(sheet, fp, *args, **kwargs)
         else:
-            self.write(sheet, file)
+            self.write(sheet, file, *args, **kwargs)
@@ -0,0 +1,170 @@
+#!/usr/bin/python
+
+
+"""
+
+Field formatters shared by writers.
+
+Instead of checking the type of every written field, writers infer
+type of each column once per sheet (or take declared types) and build
+a table of formatters -- one callable per column, which converts field
+value to unicode. Types are inferred from the first
+:py:data:`SAMPLE_SIZE` rows (or from type codes of typed columnar
+arrays), so writing starts without a pass through all data.
+
+"""
+
+
+import array
+import datetime
+import operator
+from itertools import imap
+
+
+SAMPLE_SIZE = 100
+"""Number of rows, from which column types are inferred."""
+
+def format_datetime(value):
+    """ Formats :py:class:`datetime.datetime` value.
+    """
+
+    return unicode(value.strftime('%Y-%m-%d %H:%M:%S'))
+
+
+def format_date(value):
+    """ Formats :py:class:`datetime.date` value.
+    """
+
+    return unicode(value.strftime('%Y-%m-%d'))
+
+
+def format_field(value):
+    """ Formats value of any type. Used for columns, which type is
+    unknown or not homogeneous.
+    """
+
+    if isinstance(value, datetime.datetime):
+        return format_datetime(value)
+    elif isinstance(value, datetime.date):
+        return format_date(value)
+    else:
+        return unicode(value)
+
+
+FORMATTERS = {
+        datetime.datetime: format_datetime,
+        datetime.date: format_date,
+        unicode: unicode,
+        int: unicode,
+        long: unicode,
+        float: unicode,
+        bool: unicode,
+        }
+
+
+def get_formatter(value_type):
+    """ Returns formatter for values of ``value_type``. If
+    ``value_type`` is ``None`` (unknown), then :py:func:`format_field`
+    is returned.
+    """
+
+    return FORMATTERS.get(value_type, format_field)
+
+
+def check_type(format, value_type, fallback):
+    """ Returns formatter, which uses ``format`` for values of
+    ``value_type`` and ``fallback`` for other values. Used for columns,
+    which type is inferred from sample of rows.
+    """
+
+    return lambda value: (
+            format(value) if type(value) is value_type else fallback(value))
+
+
+def infer_types(sheet, types=None, sample_size=SAMPLE_SIZE):
+    """ Returns list of column value types. Column type is ``None``, if
+    column is empty or contains values of different types. Types of
+    columns, which are not stored in typed arrays, are inferred from
+    the first ``sample_size`` rows.
+
+    :param sheet: :py:class:`pysheets.sheet.Sheet` or any iterable of
+        rows; in the latter case only declared types are known.
+    :param types: Dict of column caption and type pairs. Types of not
+        mentioned columns are inferred.
+    """
+
+    from pysheets.sheet import TYPE_CODES
+
+    types = types or {}
+    captions = getattr(sheet, 'captions', None)
+    if captions is None:
+        return None
+    if not hasattr(sheet, 'rows'):
+        # Not a sheet, but a view with captions.
+        return [types.get(caption) for caption in captions]
+
+    array_types = dict(
+            (typecode, value_type)
+            for value_type, typecode in TYPE_CODES.items())
+    if sheet.columnar:
+        columns = [
+                column if isinstance(column, array.array) else
+                column[:sample_size]
+                for column in sheet.rows.columns]
+    else:
+        fields = [row.fields for row in sheet.rows[:sample_size]]
+        columns = [
+                imap(operator.itemgetter(index), fields)
+                for index in range(len(captions))]
+
+    result = []
+    for caption, column in zip(captions, columns):
+        if caption in types:
+            result.append(types[caption])
+        elif isinstance(column, array.array):
+            result.append(array_types[column.typecode])
+        else:
+            column_types = set(imap(type, column))
+            if len(column_types) == 1:
+                result.append(column_types.pop())
+            else:
+                result.append(None)
+    return result
+
+
+def create_formatters(sheet, types=None, captions=None, get=get_formatter):
+    """ Returns list of formatters -- one for each column, or ``None``
+    if the number of columns is not known.
+
+    :param sheet: :py:class:`pysheets.sheet.Sheet` or any iterable of
+        rows.
+    :param types: Dict of column caption and type pairs. Types of not
+        mentioned columns are inferred.
+    :param captions: Captions of ``sheet`` columns, if ``sheet`` is
+        not :py:class:`pysheets.sheet.Sheet`.
+    :param get: Function, which returns formatter for given type.
+
+    If column type is inferred from sample of rows, then formatter
+    falls back to ``get(None)`` for values of other types.
+    """
+
+    types = types or {}
+    column_types = infer_types(sheet, types)
+    if column_types is None:
+        if captions is None:
+            return None
+        column_types = [types.get(caption) for caption in captions]
+        return [get(value_type) for value_type in column_types]
+
+    formatters = [get(value_type) for value_type in column_types]
+    if hasattr(sheet, 'rows') and len(sheet.rows) > SAMPLE_SIZE:
+        fallback = get(None)
+        for index, (caption, value_type) in enumerate(
+                zip(sheet.captions, column_types)):
+            if (value_type is None or caption in types or (
+                    sheet.columnar and isinstance(
+                        sheet.rows.columns[index], array.array))):
+                continue
+            formatters[index] = check_type(
+                    formatters[index], value_type, fallback)
+    return formatters
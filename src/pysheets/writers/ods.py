@@ -8,7 +8,11 @@ Writer for ODF Spreadsheet files.
 """
 
 
-import datetime
+import os
+import tempfile
+import zipfile
+from itertools import izip
+from xml.sax.saxutils import escape, quoteattr
 
 from odf.opendocument import OpenDocumentSpreadsheet
 from odf.table import Table, TableRow, TableCell
@@ -16,6 +20,36 @@ from odf.text import P
 
 
 from pysheets.writers import SpreadSheetWriter
+from pysheets.writers.formatters import create_formatters, format_field
+
+
+CONTENT_HEADER = u"""\
+<?xml version="1.0" encoding="UTF-8"?>
+<office:document-content \
+xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" \
+xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" \
+xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" \
+office:version="1.2"><office:body><office:spreadsheet>"""
+
+CONTENT_FOOTER = u"""\
+</office:spreadsheet></office:body></office:document-content>"""
+
+STYLES = u"""\
+<?xml version="1.0" encoding="UTF-8"?>
+<office:document-styles \
+xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" \
+office:version="1.2"/>"""
+
+MANIFEST = u"""\
+<?xml version="1.0" encoding="UTF-8"?>
+<manifest:manifest \
+xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0">
+ <manifest:file-entry manifest:media-type="{0}" manifest:full-path="/"/>
+ <manifest:file-entry manifest:media-type="text/xml" \
+manifest:full-path="content.xml"/>
+ <manifest:file-entry manifest:media-type="text/xml" \
+manifest:full-path="styles.xml"/>
+</manifest:manifest>"""
 
 
 class ODFSpreadSheetWriter(SpreadSheetWriter):
@@ -27,6 +61,34 @@ class ODFSpreadSheetWriter(SpreadSheetWriter):
     file_extensions = [u'ods']
     mime_type = 'application/vnd.oasis.opendocument.spreadsheet'
 
+    def __init__(self, stream=False):
+        """
+
+        :param stream: If ``True``, then ``content.xml`` is serialized
+            row by row into temporary file and packed into zip archive
+            without building odfpy document tree, so memory usage does
+            not depend on the amount of data.
+        :type stream: bool
+
+        """
+
+        self.stream = stream
+
+    def convert_fields(self, fields, formatters=None):
+        """ Converts field values to unicode.
+
+        :param formatters: List of per column formatters, created by
+            :py:func:`pysheets.writers.formatters.create_formatters`.
+            If ``None``, then type of each field is checked.
+        """
+
+        if formatters is None:
+            return [format_field(field) for field in fields]
+        else:
+            return [
+                    format(field)
+                    for format, field in izip(formatters, fields)]
+
     def write_captions(self, sheet, table):
         """ Writes sheet's caption row to table.
         """
@@ -38,41 +100,95 @@ class ODFSpreadSheetWriter(SpreadSheetWriter):
             row.addElement(cell)
         table.addElement(row)
 
-    def write_row(self, sheet_row, table):
+    def write_row(self, sheet_row, table, formatters=None):
         """ Appends ``sheet_row`` data into table.
         """
 
         row = TableRow()
-        for field in sheet_row:
-            if isinstance(field, datetime.datetime):
-                field = unicode(field.strftime('%Y-%m-%d %H:%M:%S'))
-            elif isinstance(field, datetime.date):
-                field = unicode(field.strftime('%Y-%m-%d'))
-            elif not isinstance(field, unicode):
-                field = unicode(field)
+        for field in self.convert_fields(sheet_row, formatters):
             cell = TableCell()
             cell.addElement(P(text=field))
             row.addElement(cell)
 
         table.addElement(row)
 
-    def write_sheet(self, sheet, table):
+    def write_sheet(self, sheet, table, types=None):
         """ Writes sheet data into table.
         """
 
         self.write_captions(sheet, table)
+        formatters = create_formatters(sheet, types)
         for row in sheet:
-            self.write_row(row, table)
+            self.write_row(row, table, formatters)
 
-    def __call__(self, spreadsheet, file):
+    def serialize_row(self, fields, formatters=None):
+        """ Returns ``fields`` serialized as ``table:table-row``
+        element.
+        """
+
+        return u''.join([u'<table:table-row>'] + [
+            u'<table:table-cell><text:p>{0}</text:p></table:table-cell>'
+            .format(escape(field))
+            for field in self.convert_fields(fields, formatters)] + [
+                u'</table:table-row>'])
+
+    def write_sheet_stream(self, sheet, write, types=None):
+        """ Writes sheet data as ``table:table`` element, using
+        ``write``.
+        """
+
+        write(u'<table:table table:name={0}>'.format(quoteattr(sheet.name)))
+        write(self.serialize_row(sheet.captions))
+        formatters = create_formatters(sheet, types)
+        for row in sheet:
+            write(self.serialize_row(row, formatters))
+        write(u'</table:table>')
+
+    def write_stream(self, spreadsheet, file, types=None):
+        """ Writes all data from spreadsheet into file without building
+        document tree.
+        """
+
+        file_descriptor, content_path = tempfile.mkstemp(suffix='.xml')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as content:
+                write = lambda text: content.write(text.encode('utf-8'))
+                write(CONTENT_HEADER)
+                for sheet in spreadsheet:
+                    self.write_sheet_stream(sheet, write, types)
+                write(CONTENT_FOOTER)
+
+            package = zipfile.ZipFile(file, 'w', zipfile.ZIP_DEFLATED)
+            try:
+                # Mimetype have to be the first and not compressed.
+                package.writestr(zipfile.ZipInfo('mimetype'), self.mime_type)
+                package.writestr(
+                        'META-INF/manifest.xml',
+                        MANIFEST.format(self.mime_type).encode('utf-8'))
+                package.writestr('styles.xml', STYLES.encode('utf-8'))
+                package.write(content_path, 'content.xml')
+            finally:
+                package.close()
+        finally:
+            os.remove(content_path)
+
+    def __call__(self, spreadsheet, file, types=None):
         """ Writes all data from spreadsheet into file.
+
+        :param types: Dict of column caption and type pairs, which is
+            used for all sheets. Types of not mentioned columns are
+            inferred from sheet data.
         """
 
+        if self.stream:
+            self.write_stream(spreadsheet, file, types)
+            return
+
         doc = OpenDocumentSpreadsheet()
 
         for sheet in spreadsheet:
             table = Table(name=sheet.name)
-            self.write_sheet(sheet, table)
+            self.write_sheet(sheet, table, types)
             doc.spreadsheet.addElement(table)
 
         doc.write(file)
@@ -7,6 +7,8 @@
 
 import functools
 import cStringIO
+import multiprocessing
+from itertools import imap, islice
 
 from xhtml2pdf.document import pisaDocument
 
@@ -76,6 +78,31 @@ html {
 """
 
 
+def render_chunk(task):
+    """ Renders chunk of sheet rows into PDF document and returns it as
+    byte string. Used as :py:mod:`multiprocessing` worker function.
+
+    :param task: Tuple ``(writer, captions, rows, types)``.
+    """
+
+    # Imported here, because pysheets.sheet imports this module.
+    from pysheets.sheet import Sheet
+
+    writer, captions, rows, types = task
+    file = cStringIO.StringIO()
+    writer.render(Sheet(captions=captions, rows=rows), file, types)
+    return file.getvalue()
+
+
+def report_progress(documents, total, progress):
+    """ Calls ``progress(done, total)`` after each rendered document.
+    """
+
+    for done, document in enumerate(documents, 1):
+        progress(done, total)
+        yield document
+
+
 class PDFWriter(SheetWriter):
     """ PDF file writer.
     """
@@ -88,18 +115,47 @@ class PDFWriter(SheetWriter):
     def __init__(
             self, title=u'', header=u'', footer=u'', css=DEFAULT_CSS,
             *args, **kwargs):
+        """
+
+        Keyword only arguments:
+
+        :param chunk_rows: If not ``None``, then sheet is split into
+            chunks of ``chunk_rows`` rows, which are rendered into
+            separate PDF documents (each with caption row) and
+            concatenated. This requires `PyPDF2
+            <https://pypi.python.org/pypi/PyPDF2>`_ or `pyPdf
+            <https://pypi.python.org/pypi/pyPdf>`_.
+        :param processes: Number of worker processes, which render
+            chunks. ``None`` means the number of CPUs; ``1`` -- render
+            in current process.
+
+        Other arguments are passed to
+        :py:class:`pysheets.writers.xhtml.XHTMLWriter`.
+
+        .. note::
+            Chunking bounds memory used by rendering (HTML parsing and
+            layout), which is the largest part. Rendered documents are
+            concatenated in memory, because PyPDF2 writes document
+            only when all pages are added, so memory used by merging
+            grows with the size of resulting PDF file.
+
+        """
+        self.chunk_rows = kwargs.pop('chunk_rows', None)
+        self.processes = kwargs.pop('processes', None)
         self.xhtml_writer = XHTMLWriter(*args, **kwargs)
         self.title = title
         self.header = header
         self.footer = footer
         self.css = css
 
-    def write(self, sheet, file):
-        """ Writes data from sheet into file.
+    def render(self, sheet, file, types=None):
+        """ Renders sheet into single PDF document.
+
+        :raises IOError: If :py:mod:`xhtml2pdf` reports errors.
         """
 
         table = cStringIO.StringIO()
-        self.xhtml_writer(sheet, table)
+        self.xhtml_writer(sheet, table, types)
         html_source = DOCUMENT_TEMPLATE.format(
                 title=self.title,
                 header=self.header,
@@ -108,15 +164,87 @@ class PDFWriter(SheetWriter):
         pdf = pisaDocument(
                 html_source.encode('utf-8'), file, encoding='utf-8',
                 default_css=self.css)
+        if pdf.err:
+            raise IOError(
+                    u'Failed to render PDF document: {0} errors.'.format(
+                        pdf.err))
+
+    def split(self, sheet):
+        """ Yields lists of :py:attr:`chunk_rows` rows of sheet.
+        """
+
+        rows = iter(sheet)
+        while True:
+            chunk = [list(row) for row in islice(rows, self.chunk_rows)]
+            if not chunk:
+                break
+            yield chunk
+
+    def merge(self, documents, file):
+        """ Concatenates PDF documents (byte strings) into file. All
+        documents are kept in memory until file is written.
+        """
+
+        try:
+            from PyPDF2 import PdfFileReader, PdfFileWriter
+        except ImportError:
+            from pyPdf import PdfFileReader, PdfFileWriter
+
+        output = PdfFileWriter()
+        for document in documents:
+            reader = PdfFileReader(cStringIO.StringIO(document))
+            for page in xrange(reader.getNumPages()):
+                output.addPage(reader.getPage(page))
+        output.write(file)
+
+    def write(self, sheet, file, types=None, progress=None):
+        """ Writes data from sheet into file.
+
+        :param types: Dict of column caption and type pairs. Types of
+            not mentioned columns are inferred from ``sheet`` data.
+        :param progress: Function, which is called as ``progress(done,
+            total)`` after each rendered chunk.
+        """
+
+        if self.chunk_rows is None or len(sheet) <= self.chunk_rows:
+            self.render(sheet, file, types)
+            if progress is not None:
+                progress(1, 1)
+            return
+
+        total = (len(sheet) + self.chunk_rows - 1) // self.chunk_rows
+        tasks = (
+                (self, sheet.captions, rows, types)
+                for rows in self.split(sheet))
+        if self.processes == 1:
+            documents = imap(render_chunk, tasks)
+            pool = None
+        else:
+            pool = multiprocessing.Pool(self.processes)
+            documents = pool.imap(render_chunk, tasks)
+        try:
+            if progress is not None:
+                documents = report_progress(documents, total, progress)
+            self.merge(documents, file)
+        except:
+            if pool is not None:
+                pool.terminate()
+            raise
+        else:
+            if pool is not None:
+                pool.close()
+        finally:
+            if pool is not None:
+                pool.join()
 
     @functools.wraps(write)
-    def __call__(self, sheet, file):
+    def __call__(self, sheet, file, *args, **kwargs):
         """ Wrapper function, which ensures that ``file`` is file like
         object.
         """
 
         if isinstance(file, unicode):
             with open(file, 'wb') as fp:
-                self.write(sheet, fp)
+                self.write(sheet, fp, *args, **kwargs)
         else:
-            self.write(sheet, file)
+            self.write(sheet, file, *args, **kwargs)
@@ -6,8 +6,32 @@
 
 
 import datetime
+from itertools import izip
 
 from pysheets.writers import SheetWriter
+from pysheets.writers.formatters import (
+        create_formatters, format_field, get_formatter)
+
+
+# Types, which unicode representation contains no HTML special
+# characters.
+SAFE_TYPES = (int, long, float, bool, datetime.datetime, datetime.date)
+
+
+def escape_html(text):
+    """ Escapes ``&``, ``<`` and ``>`` in ``text``.
+    """
+
+    return text.replace(u'&', u'&amp;').replace(
+            u'<', u'&lt;').replace(u'>', u'&gt;')
+
+
+def escape_braces(text):
+    """ Escapes braces in ``text``, so that it could be used in format
+    string.
+    """
+
+    return text.replace(u'{', u'{{').replace(u'}', u'}}')
 
 
 class XHTMLWriter(SheetWriter):
@@ -19,10 +43,22 @@ class XHTMLWriter(SheetWriter):
     file_extensions = [u'html', u'xhtml',]
     mime_type = 'application/xhtml+xml'
 
-    def __init__(self, table_attrs=None, tr_attrs=None, td_attrs=None):
+    def __init__(
+            self, table_attrs=None, tr_attrs=None, td_attrs=None,
+            escape_fields=True, chunk_size=1000):
+        """
+
+        :param escape_fields: If ``True``, then HTML special characters
+            in field values and captions are escaped.
+        :param chunk_size: Amount of rows, which are buffered before
+            writing them to file.
+
+        """
         self.table_attrs = table_attrs or {}
         self.tr_attrs = tr_attrs or {}
         self.td_attrs = td_attrs or {}
+        self.escape_fields = escape_fields
+        self.chunk_size = chunk_size
 
     def merge_attributes(self, attrs, attrs2):
         """ Merges attrs2 into attrs.
@@ -33,8 +69,7 @@ class XHTMLWriter(SheetWriter):
                     if isinstance(attrs[key], list):
                         attrs[key].extend(value)
                     else:
-                        value.append(attrs[key])
-                        attrs[key] = value
+                        attrs[key] = value + [attrs[key]]
                 else:
                     if isinstance(attrs[key], list):
                         attrs[key].append(value)
@@ -55,44 +90,99 @@ class XHTMLWriter(SheetWriter):
                 result.append(u'{0}=\"{1}\"'.format(key, value))
         return u' '.join(result)
 
-    def write_row(self, row, write):
+    def create_row_template(self, tag, width):
+        """ Returns format string of table row, which has ``width``
+        cells of ``tag`` (``u'td'`` or ``u'th'``). Cell attributes are
+        merged and converted to string once, so formatting the row is
+        just :py:meth:`unicode.format` call with field values.
+        """
+
+        cells = [
+                u'<{0} {1}>{{{2}}}</{0}>'.format(
+                    tag,
+                    escape_braces(self.attributes_as_string(
+                        self.merge_attributes(
+                            {'class': u'col{0}'.format(i)},
+                            self.td_attrs))),
+                    i)
+                for i in range(width)]
+        return u''.join(
+                [u'  <tr {0}>'.format(escape_braces(
+                    self.attributes_as_string(self.tr_attrs)))] +
+                cells + [u'</tr>\n'])
+
+    def convert_field(self, field):
+        """ Converts field of any type to unicode and (if
+        :py:attr:`escape_fields` is ``True``) escapes it.
+        """
+
+        if self.escape_fields:
+            return escape_html(format_field(field))
+        else:
+            return format_field(field)
+
+    def get_converter(self, value_type):
+        """ Returns function, which converts field of ``value_type`` to
+        unicode and (if :py:attr:`escape_fields` is ``True``) escapes
+        it.
+        """
+
+        if value_type is None:
+            return self.convert_field
+        format = get_formatter(value_type)
+        if not self.escape_fields or value_type in SAFE_TYPES:
+            return format
+        else:
+            return lambda field: escape_html(format(field))
+
+    def write_row(self, row, write, formatters=None, template=None):
         """ Writes row, using ``write``.
+
+        :param formatters: List of per column converters, created by
+            :py:meth:`get_converter`. If ``None``, then type of each
+            field is checked.
+        :param template: Row template, created by
+            :py:meth:`create_row_template`.
         """
 
-        write(u'  <tr {0}>'.format(
-            self.attributes_as_string(self.tr_attrs)))
-        for i, field in enumerate(row):
-            if isinstance(field, datetime.datetime):
-                field = unicode(field.strftime('%Y-%m-%d %H:%M:%S'))
-            elif isinstance(field, datetime.date):
-                field = unicode(field.strftime('%Y-%m-%d'))
-            elif not isinstance(field, unicode):
-                field = unicode(field)
-            write(u'<td {0}>{1}</td>'.format(
-                self.attributes_as_string(
-                    self.merge_attributes({'class': u'col{0}'.format(i)},
-                        self.td_attrs)),
-                field
-                ))
-        write(u'</tr>\n')
-
-    def __call__(self, sheet, file):
+        if formatters is None:
+            fields = [self.convert_field(field) for field in row]
+        else:
+            fields = [format(field) for format, field in izip(formatters, row)]
+        if template is None:
+            template = self.create_row_template(u'td', len(fields))
+        write(template.format(*fields))
+
+    def __call__(self, sheet, file, types=None):
         """ Writes data from sheet into file.
+
+        Rows are written in chunks of :py:attr:`chunk_size` rows.
+
+        :param types: Dict of column caption and type pairs. Types of
+            not mentioned columns are inferred from ``sheet`` data.
         """
 
-        write = lambda text: file.write(text.encode('utf-8'))
+        buffer = []
+
+        def flush():
+            """ Writes buffered rows into file.
+            """
+            file.write(u''.join(buffer).encode('utf-8'))
+            del buffer[:]
+
+        write = buffer.append
         write(u'<table {0}>\n'.format(
             self.attributes_as_string(self.table_attrs)))
-        write(u'  <tr {0}>'.format(
-            self.attributes_as_string(self.tr_attrs)))
-        for i, caption in enumerate(sheet.captions):
-            write(u'<th {0}>{1}</th>'.format(
-                self.attributes_as_string(
-                    self.merge_attributes({'class': u'col{0}'.format(i)},
-                        self.td_attrs)),
-                caption
-                ))
-        write(u'</tr>\n')
+        width = len(sheet.captions)
+        self.write_row(
+                sheet.captions, write,
+                [self.get_converter(unicode)] * width,
+                self.create_row_template(u'th', width))
+        formatters = create_formatters(sheet, types, get=self.get_converter)
+        template = self.create_row_template(u'td', width)
         for row in sheet:
-            self.write_row(row, write)
+            self.write_row(row, write, formatters, template)
+            if len(buffer) >= self.chunk_size:
+                flush()
         write(u'</table>\n')
+        flush()